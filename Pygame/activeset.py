@@ -0,0 +1,129 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Active sets for event-driven simulation.
+
+An event-driven (rejection-free, or kinetic Monte Carlo) simulation only
+picks among the cells which can change, rather than picking any cell and
+mostly finding that nothing happens:
+
+IndexedSet class - a set which can also return a random member, in O(1).
+ActiveSet class - a set of items with small whole-number weights, which can
+                  return a random item chosen in proportion to its weight.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+import random
+
+
+class IndexedSet:
+    """
+    A set of items, which can return a random member in constant time.
+
+    The members are held in a list, with a dictionary of the position of
+    each member in the list. A removed member is replaced by the last one.
+    """
+
+    def __init__(self):
+        """Create an empty set."""
+        self.items = []
+        self.positions = {}
+
+    def __len__(self):
+        """Return the number of members."""
+        return len(self.items)
+
+    def __contains__(self, item):
+        """Return True if item is a member."""
+        return item in self.positions
+
+    def add(self, item):
+        """Add an item, if it is not already a member."""
+        if item not in self.positions:
+            self.positions[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        """Remove an item, if it is a member."""
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+
+    def choice(self, uniform=random.random):
+        """
+        Return a random member.
+
+        uniform returns a random float from 0 up to 1, by default from the
+        random module.
+        """
+        return self.items[int(uniform() * len(self.items))]
+
+
+class ActiveSet:
+    """
+    A set of items with weights, chosen at random in proportion to them.
+
+    The weights are small whole numbers, such as a count of neighbors. The
+    items of each weight are held in their own IndexedSet, so changing a
+    weight and choosing an item both take time in proportion to the number
+    of different weights, not the number of items. Items with a weight of 0
+    are not held at all.
+    """
+
+    def __init__(self):
+        """Create an empty set."""
+        self.buckets = {}
+        self.weights = {}
+        # The sum of the weights of every item
+        self.total = 0
+
+    def __len__(self):
+        """Return the number of items with a non-zero weight."""
+        return len(self.weights)
+
+    def __contains__(self, item):
+        """Return True if item has a non-zero weight."""
+        return item in self.weights
+
+    def weight(self, item):
+        """Return the weight of an item."""
+        return self.weights.get(item, 0)
+
+    def set_weight(self, item, weight):
+        """Set the weight of an item, adding or removing it as needed."""
+        old_weight = self.weights.get(item, 0)
+        if weight == old_weight:
+            return
+        if old_weight:
+            self.buckets[old_weight].discard(item)
+        if weight:
+            self.weights[item] = weight
+            bucket = self.buckets.get(weight)
+            if bucket is None:
+                bucket = self.buckets[weight] = IndexedSet()
+            bucket.add(item)
+        else:
+            del self.weights[item]
+        self.total += weight - old_weight
+
+    def choose(self, uniform=random.random):
+        """
+        Return an item chosen at random, in proportion to its weight.
+
+        The set must not be empty. uniform is as for IndexedSet.choice().
+        """
+        target = uniform() * self.total
+        for weight, bucket in self.buckets.items():
+            bucket_total = weight * len(bucket)
+            if target < bucket_total:
+                return bucket.items[int(target / weight)]
+            target -= bucket_total
+        # Rounding left the target just past the end.
+        for bucket in reversed(list(self.buckets.values())):
+            if bucket:
+                return bucket.items[-1]
+        raise IndexError("Cannot choose from an empty set")
@@ -0,0 +1,299 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Parameter sweep runner for the voting simulations.
+
+Runs MajorityRule and VotingGame models headless, for every combination of
+grid size, initial density of 1 cells, random seed and update mode, on a
+pool of worker processes using all the CPU cores. Each run stops when the
+model finishes (a consensus or a frozen grid), after a number of
+generations, or after a time limit. For each run it records:
+
+- the generation the model froze at, or None if it did not finish
+- the final populations of 0 and 1 cells
+- the final number of domains (connected blocks of cells of the same
+  value) and the size of the largest one
+- the final interface length: the number of neighboring pairs of cells
+  with different values
+- the generations run, and the seconds taken
+
+Each result is appended as one JSON object per line to the results file as
+soon as its run completes. A run which raises an error is recorded with the
+error in its "error" field, and the rest of the sweep carries on. Runs
+already in the results file without an error are skipped, so an interrupted
+sweep carries on where it stopped when started again with the same options,
+and retries the runs which failed. The generation and time limits are part
+of each run's key, so a sweep started again with larger limits runs again.
+
+Example:
+    python batch.py --sizes 32x32 64x64 --densities 0.3 0.5 --runs 100
+    python batch.py --simulations MajorityRule --mode events --workers 4
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Records the number of domains and the size of
+                           the largest domain.
+                         - A run which fails is recorded with its error,
+                           and retried when the sweep is started again.
+                         - Imports parse_size() from cli.py, so it runs
+                           without Pygame.
+                         - The generation and time limits are part of the
+                           key of each run.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import random
+import time
+
+import cellstore
+import cli
+import models
+
+# Simulations which can be swept: name and model class
+SIMULATIONS = {
+    "MajorityRule": models.MajorityRuleModel,
+    "VotingGame": models.VotingModel,
+}
+
+# Update modes: one cell per generation, rejection-free events, or
+# vectorized sweeps (see models.VotingModel)
+CELL = "cell"
+EVENTS = "events"
+SWEEP = "sweep"
+MODES = [CELL, EVENTS, SWEEP]
+
+# Generations run between the first checks of the time limit. The batches
+# double in size while each takes less than BATCH_SECONDS.
+BATCH = 10000
+BATCH_SECONDS = 0.1
+
+# Parameters which identify a run in the results file. Results from older
+# sweeps without the limits are not matched, so those runs are run again.
+KEY = (
+    "simulation",
+    "cols",
+    "rows",
+    "density",
+    "seed",
+    "mode",
+    "generation_limit",
+    "time_limit",
+)
+
+
+def run_trial(params):
+    """
+    Run one model to completion, or to its generation or time limit.
+
+    params holds the KEY values. Returns the result record. Runs in a
+    worker process.
+    """
+    random.seed(params["seed"])
+    model_class = SIMULATIONS[params["simulation"]]
+    mode = params["mode"]
+    if mode == SWEEP:
+        model = model_class(
+            params["cols"], params["rows"], cellstore.ARRAY, sweep=True
+        )
+    else:
+        model = model_class(
+            params["cols"], params["rows"], events=mode == EVENTS
+        )
+    model.fill_random(params["density"])
+    # Catch a grid which starts frozen.
+    model.check_finished()
+
+    start = time.perf_counter()
+    deadline = start + params["time_limit"]
+    done = 0
+    batch = BATCH
+    now = start
+    while (
+        done < params["generation_limit"]
+        and not model.finished
+        and now < deadline
+    ):
+        done += model.run(min(batch, params["generation_limit"] - done))
+        last = now
+        now = time.perf_counter()
+        if now - last < BATCH_SECONDS:
+            batch *= 2
+    elapsed = now - start
+
+    result = {name: params[name] for name in KEY}
+    result.update(
+        {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "generations": done,
+            "seconds": round(elapsed, 6),
+            "finished": model.finished,
+            "timed_out": not model.finished
+            and done < params["generation_limit"],
+            "frozen_generation": model.frozen_generation,
+            "populations": list(model.populations),
+        }
+    )
+    result.update(model.domain_stats())
+    return result
+
+
+def run_key(result):
+    """Return the key used to match a run with its result."""
+    return tuple(result[name] for name in KEY)
+
+
+def completed_runs(path):
+    """
+    Return the keys of the runs already in a results file.
+
+    Runs recorded with an error are left out, so that they are run again.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+                if "error" not in result:
+                    done.add(run_key(result))
+            except (ValueError, KeyError):
+                # Skip a line cut short when a sweep was interrupted.
+                continue
+    return done
+
+
+def error_record(params, error):
+    """Return the result record of a run which raised an error."""
+    result = {name: params[name] for name in KEY}
+    result.update(
+        {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "error": "{}: {}".format(type(error).__name__, error),
+        }
+    )
+    return result
+
+
+def plan_runs(options):
+    """Return the parameters of every run in the sweep, in order."""
+    return [
+        {
+            "simulation": name,
+            "cols": cols,
+            "rows": rows,
+            "density": density,
+            "seed": seed,
+            "mode": options.mode,
+            "generation_limit": options.generations,
+            "time_limit": options.time_limit,
+        }
+        for name in options.simulations
+        for cols, rows in options.sizes
+        for density in options.densities
+        for seed in options.seeds
+    ]
+
+
+def outcome(result):
+    """Return a short description of how a run ended."""
+    if "error" in result:
+        return "error " + result["error"]
+    if result["finished"]:
+        return "frozen at {}".format(result["frozen_generation"])
+    return "not finished"
+
+
+def sweep(options):
+    """
+    Run every run of the sweep not already in the results file.
+
+    Returns the number of runs recorded, including any which failed.
+    """
+    done = completed_runs(options.output)
+    planned = plan_runs(options)
+    runs = [params for params in planned if run_key(params) not in done]
+    print(
+        "{} runs, {} already complete".format(
+            len(planned), len(planned) - len(runs)
+        )
+    )
+    count = 0
+    with open(options.output, "a") as output:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=options.workers
+        ) as executor:
+            futures = {
+                executor.submit(run_trial, params): params for params in runs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    # Record the failure, and carry on with the other runs.
+                    result = error_record(futures[future], error)
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                count += 1
+                print(
+                    "{}/{} {} {}x{} density {} seed {}: {}".format(
+                        count,
+                        len(runs),
+                        result["simulation"],
+                        result["cols"],
+                        result["rows"],
+                        result["density"],
+                        result["seed"],
+                        outcome(result),
+                    )
+                )
+    return count
+
+
+def main():
+    """Run a parameter sweep."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--simulations",
+        nargs="+",
+        choices=list(SIMULATIONS),
+        default=list(SIMULATIONS),
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=cli.parse_size, default=[(32, 32)]
+    )
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        type=float,
+        default=[0.5],
+        help="initial chance of each cell being 1",
+    )
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3])
+    parser.add_argument(
+        "--runs", type=int, help="use seeds 1 to RUNS, instead of --seeds"
+    )
+    parser.add_argument("--mode", choices=MODES, default=EVENTS)
+    parser.add_argument(
+        "--generations",
+        type=int,
+        default=10 ** 9,
+        help="most generations per run",
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=60, help="seconds per run"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes; by default one per core"
+    )
+    parser.add_argument("--output", default="batch_results.jsonl")
+    options = parser.parse_args()
+    if options.runs:
+        options.seeds = list(range(1, options.runs + 1))
+    sweep(options)
+
+
+if __name__ == "__main__":
+    main()
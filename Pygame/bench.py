@@ -0,0 +1,353 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the grid simulations.
+
+Runs each simulation (Grid, Langton, MajorityRule and VotingGame) headless
+under the SDL dummy video driver, for several grid sizes and random seeds,
+both with rendering on (through the sim.Grid view) and off (stepping the
+model only). For each run it measures:
+
+- generations per second
+- frame time percentiles, when rendering
+- peak Python memory use (tracemalloc) while creating the simulation and
+  running its first generations
+
+Each run is appended as one JSON object per line to the results file, so
+results from different runs can be compared over time. Use --compare to
+check new results against an earlier results file, and flag regressions.
+
+Example:
+    python bench.py --sizes 16x16 64x64 --seeds 1 2 --output results.jsonl
+    python bench.py --output new.jsonl --compare results.jsonl
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - The window size and cell size are set separately
+                           from the grid size, which can be larger than the
+                           window.
+                         - Added --sweep, to run MajorityRule and VotingGame
+                           in sweep mode.
+                         - By default each simulation runs on its fastest
+                           cell store, on larger grids, and --sweep is
+                           rejected with a store it cannot use.
+                         - parse_size() moved to cli.py.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Run Pygame without opening a window. This must be set before Pygame is
+# imported.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+import cellstore
+import cli
+import langton
+import majorityrule
+import models
+import renderers
+import sim
+import voting
+
+# Simulations to benchmark: name, view class and model class
+SIMULATIONS = {
+    "Grid": (sim.Grid, models.Model),
+    "Langton": (langton.Langton, models.LangtonModel),
+    "MajorityRule": (majorityrule.MajorityRule, models.MajorityRuleModel),
+    "VotingGame": (voting.VotingGame, models.VotingModel),
+}
+
+# The cell store each simulation runs on when --store is not given. Langton's
+# ant runs indefinitely on an unbounded store, jumping ahead along its
+# highway, rather than leaving a bounded grid within a few thousand
+# generations. The others default to DEFAULT_STORE.
+SIMULATION_STORES = {"Langton": cellstore.CHUNKED}
+# The array store is needed for sweep mode, and is only fast with NumPy.
+DEFAULT_STORE = cellstore.ARRAY if models.NUMPY else cellstore.LIST
+
+# Simulations which can run in sweep mode
+SWEEP_SIMULATIONS = {"MajorityRule", "VotingGame"}
+
+# Number of generations run while measuring peak memory
+MEMORY_GENERATIONS = 1000
+
+# A result is reported as a regression if it is this much slower than the
+# matching result in the comparison file.
+REGRESSION_THRESHOLD = 0.2
+
+
+def percentile(samples, pct):
+    """Return the nearest-rank percentile of a list of samples."""
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, len(samples) * pct // 100)]
+
+
+def simulation_store(name, options):
+    """Return the cell store a simulation runs on."""
+    if options.sweep and name in SWEEP_SIMULATIONS:
+        return cellstore.ARRAY
+    if options.store:
+        return options.store
+    return SIMULATION_STORES.get(name, DEFAULT_STORE)
+
+
+def create_simulation(name, cols, rows, seed, options, render):
+    """
+    Create a seeded simulation.
+
+    Returns the model, and the sim.Grid view of it if render is True.
+    """
+    view_class, model_class = SIMULATIONS[name]
+    random.seed(seed)
+    store = simulation_store(name, options)
+    if options.sweep and name in SWEEP_SIMULATIONS:
+        model = model_class(cols, rows, store, sweep=True)
+    else:
+        model = model_class(cols, rows, store)
+    if not render:
+        return model, None
+    win = pygame.display.set_mode(options.window)
+    view = view_class(
+        win,
+        name,
+        model=model,
+        renderer=options.renderer,
+        cell_size=options.cell_size,
+    )
+    view.draw_buttons()
+    view.update_grid()
+    view.refresh_display(full=True)
+    return model, view
+
+
+def run_once(model, view, generations, time_limit):
+    """
+    Run the simulation for up to generations, or time_limit seconds.
+
+    Returns the generations run, elapsed seconds, and a list of frame times
+    when rendering.
+    """
+    start_generation = model.generation
+    frame_times = []
+    start = time.perf_counter()
+    deadline = start + time_limit
+    if view is None:
+        # Step the model in batches, checking the time between batches.
+        batch = 1000
+        done = 0
+        while done < generations and not model.finished:
+            done += model.run(min(batch, generations - done))
+            if time.perf_counter() >= deadline:
+                break
+    else:
+        while (
+            model.generation - start_generation < generations
+            and not model.finished
+        ):
+            frame_start = time.perf_counter()
+            view.update()
+            view.refresh_display()
+            frame_end = time.perf_counter()
+            frame_times.append(frame_end - frame_start)
+            if frame_end >= deadline:
+                break
+    elapsed = time.perf_counter() - start
+    return model.generation - start_generation, elapsed, frame_times
+
+
+def measure_memory(name, cols, rows, seed, options, render):
+    """Return the peak Python memory in KiB used to create and start a run."""
+    tracemalloc.start()
+    model, view = create_simulation(name, cols, rows, seed, options, render)
+    run_once(model, view, MEMORY_GENERATIONS, time_limit=10)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def benchmark(name, cols, rows, seed, options, render):
+    """Run one benchmark and return its result record."""
+    model, view = create_simulation(name, cols, rows, seed, options, render)
+    generations, elapsed, frame_times = run_once(
+        model, view, options.generations, options.time_limit
+    )
+    result = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "simulation": name,
+        "cols": cols,
+        "rows": rows,
+        "seed": seed,
+        "render": render,
+        "store": simulation_store(name, options),
+        "sweep": options.sweep,
+        "renderer": view.renderer.name if view else None,
+        "generations": generations,
+        "seconds": round(elapsed, 6),
+        "gens_per_sec": round(generations / elapsed, 1) if elapsed else None,
+        "finished": model.finished,
+        "peak_kib": measure_memory(name, cols, rows, seed, options, render),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": sys.platform,
+    }
+    if frame_times:
+        result["frame_ms_p50"] = round(percentile(frame_times, 50) * 1000, 4)
+        result["frame_ms_p95"] = round(percentile(frame_times, 95) * 1000, 4)
+    return result
+
+
+def result_key(result):
+    """Return the key used to match results between benchmark runs."""
+    return (
+        result["simulation"],
+        result["cols"],
+        result["rows"],
+        result["seed"],
+        result["render"],
+        result["store"],
+        result.get("sweep", False),
+    )
+
+
+def compare(results, baseline_file):
+    """
+    Compare results with the latest matching results in baseline_file.
+
+    Prints the speed ratio of each matching result, and returns the number
+    of regressions found.
+    """
+    baseline = {}
+    with open(baseline_file) as file:
+        for line in file:
+            if line.strip():
+                old = json.loads(line)
+                baseline[result_key(old)] = old
+
+    regressions = 0
+    for result in results:
+        old = baseline.get(result_key(result))
+        if not old or not old["gens_per_sec"] or not result["gens_per_sec"]:
+            continue
+        ratio = result["gens_per_sec"] / old["gens_per_sec"]
+        flag = ""
+        if ratio < 1 - REGRESSION_THRESHOLD:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            "{:<12} {:>5}x{:<5} seed {:<4} render {:<5} {:>6.2f}x{}".format(
+                result["simulation"],
+                result["cols"],
+                result["rows"],
+                result["seed"],
+                str(result["render"]),
+                ratio,
+                flag,
+            )
+        )
+    return regressions
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--simulations",
+        nargs="+",
+        choices=list(SIMULATIONS),
+        default=list(SIMULATIONS),
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=cli.parse_size,
+        default=[(64, 64), (256, 256)],
+    )
+    parser.add_argument(
+        "--window",
+        type=cli.parse_size,
+        default=(1024, 768),
+        help="window size in pixels, as WIDTHxHEIGHT",
+    )
+    parser.add_argument(
+        "--cell-size",
+        type=float,
+        default=8,
+        help="cell size in pixels; only the visible cells are drawn",
+    )
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3])
+    parser.add_argument("--generations", type=int, default=20000)
+    parser.add_argument(
+        "--time-limit", type=float, default=10, help="seconds per run"
+    )
+    parser.add_argument(
+        "--store",
+        choices=list(cellstore.STORES),
+        help="cell store for every simulation; by default {} for Langton, "
+        "and {} for the others".format(cellstore.CHUNKED, DEFAULT_STORE),
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="run MajorityRule and VotingGame a sublattice at a time; "
+        "needs the array store",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=[renderers.AUTO, renderers.RECT, renderers.SURFARRAY],
+        default=renderers.AUTO,
+    )
+    parser.add_argument(
+        "--render",
+        choices=["on", "off", "both"],
+        default="both",
+        help="benchmark with rendering on, off or both",
+    )
+    parser.add_argument("--output", default="bench_results.jsonl")
+    parser.add_argument(
+        "--compare", help="earlier results file to check for regressions"
+    )
+    options = parser.parse_args()
+    if options.sweep:
+        if not models.NUMPY:
+            parser.error("--sweep needs NumPy")
+        if options.store not in (None, cellstore.ARRAY):
+            parser.error("--sweep needs --store " + cellstore.ARRAY)
+        if not SWEEP_SIMULATIONS.intersection(options.simulations):
+            parser.error(
+                "--sweep only applies to "
+                + " and ".join(sorted(SWEEP_SIMULATIONS))
+            )
+
+    render_modes = {"on": [True], "off": [False], "both": [False, True]}
+    pygame.init()
+    results = []
+    with open(options.output, "a") as output:
+        for name in options.simulations:
+            for cols, rows in options.sizes:
+                for seed in options.seeds:
+                    for render in render_modes[options.render]:
+                        result = benchmark(
+                            name, cols, rows, seed, options, render
+                        )
+                        print(json.dumps(result))
+                        output.write(json.dumps(result) + "\n")
+                        output.flush()
+                        results.append(result)
+    pygame.quit()
+
+    if options.compare and compare(results, options.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Cell storage for grid simulations.
+
+Each store holds a rectangle of small integer cell values, indexed as
+cells[x, y], so that models can swap between storage backends without any
+change to their update rules:
+
+ListStore class - a Python list of lists. Needs no extra packages, and has the
+                  fastest single cell access.
+ArrayStore class - a contiguous NumPy uint8 array, one byte per cell. The
+                   array attribute can be used directly by vectorized kernels.
+PackedStore class - a bit-packed bytearray, one bit per cell, for two state
+                    simulations on very large grids.
+ChunkedStore class - an unbounded sparse grid of fixed-size tiles, allocated
+                     on demand, so memory use is proportional to the area
+                     actually written to.
+Stripe class - a periodic pattern of cell visits repeated along a line, held
+               lazily by a ChunkedStore.
+hashlife.QuadTreeStore class - an unbounded hash-consed quadtree, which can
+                               be advanced by memoized macro-steps of a
+                               deterministic rule.
+create_store() - create a store by backend name.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Added region(), to read just the cells visible in
+                           a viewport.
+                         - Added the unbounded ChunkedStore. The bounded
+                           attribute of each store shows whether cells
+                           outside cols x rows can be used.
+                         - Added stripes to the ChunkedStore, so that a
+                           long repeating pattern can be written in one call.
+                         - Added the hashlife quadtree store.
+"""
+import hashlife
+
+# NumPy is optional. It is needed by the ArrayStore and by the to_array()
+# and load_array() methods of the other stores.
+try:
+    import numpy
+
+    NUMPY = True
+except ModuleNotFoundError:
+    NUMPY = False
+
+# Storage backend names
+LIST = "list"
+ARRAY = "array"
+PACKED = "packed"
+CHUNKED = "chunked"
+HASHLIFE = "hashlife"
+
+# Number of bits set in each possible byte value, used to count the
+# population of a PackedStore.
+POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+# Each ChunkedStore tile holds TILE_SIZE x TILE_SIZE cells
+TILE_SHIFT = 6
+TILE_SIZE = 1 << TILE_SHIFT
+TILE_MASK = TILE_SIZE - 1
+
+
+class ListStore:
+    """Cell storage as a Python list of columns."""
+
+    # Cells can only be used within cols x rows
+    bounded = True
+
+    def __init__(self, cols, rows, value=0):
+        """Create the store with every cell set to value."""
+        self.cols = cols
+        self.rows = rows
+        self.columns = [[value] * rows for x in range(cols)]
+
+    def __getitem__(self, pos):
+        """Return the value of the cell at pos (x, y)."""
+        return self.columns[pos[0]][pos[1]]
+
+    def __setitem__(self, pos, value):
+        """Set the value of the cell at pos (x, y)."""
+        self.columns[pos[0]][pos[1]] = value
+
+    def fill(self, value):
+        """Set every cell to value."""
+        for column in self.columns:
+            column[:] = [value] * self.rows
+
+    def count(self):
+        """Return the number of non-zero cells."""
+        return sum(map(sum, self.columns))
+
+    def to_array(self):
+        """Return a copy of the cells as a (cols, rows) uint8 NumPy array."""
+        return numpy.array(self.columns, dtype=numpy.uint8).reshape(
+            self.cols, self.rows
+        )
+
+    def load_array(self, array):
+        """Copy the cells from a (cols, rows) NumPy array."""
+        self.columns = array.astype(int).tolist()
+
+    def region(self, x, y, cols, rows):
+        """Return a (cols, rows) uint8 NumPy array of cells from x, y."""
+        return numpy.array(
+            [column[y : y + rows] for column in self.columns[x : x + cols]],
+            dtype=numpy.uint8,
+        ).reshape(cols, rows)
+
+
+class ArrayStore:
+    """Cell storage as a contiguous NumPy uint8 array."""
+
+    # Cells can only be used within cols x rows
+    bounded = True
+
+    def __init__(self, cols, rows, value=0):
+        """Create the store with every cell set to value."""
+        if not NUMPY:
+            raise ModuleNotFoundError("The array cell store needs NumPy")
+        self.cols = cols
+        self.rows = rows
+        self.array = numpy.full((cols, rows), value, dtype=numpy.uint8)
+
+    def __getitem__(self, pos):
+        """Return the value of the cell at pos (x, y)."""
+        return self.array.item(pos)
+
+    def __setitem__(self, pos, value):
+        """Set the value of the cell at pos (x, y)."""
+        self.array[pos] = value
+
+    def fill(self, value):
+        """Set every cell to value."""
+        self.array.fill(value)
+
+    def count(self):
+        """Return the number of non-zero cells."""
+        return int(numpy.count_nonzero(self.array))
+
+    def to_array(self):
+        """Return a copy of the cells as a (cols, rows) uint8 NumPy array."""
+        return self.array.copy()
+
+    def load_array(self, array):
+        """Copy the cells from a (cols, rows) NumPy array."""
+        self.array[:] = array
+
+    def region(self, x, y, cols, rows):
+        """Return a (cols, rows) uint8 NumPy array of cells from x, y."""
+        # This is a view of the store's array, not a copy.
+        return self.array[x : x + cols, y : y + rows]
+
+
+class PackedStore:
+    """
+    Cell storage as a bit-packed bytearray.
+
+    Each cell is stored as a single bit, so cell values can only be 0 or 1.
+    Any true value is stored as 1. Cells are packed column by column, with
+    the lowest bit of each byte first, matching numpy.packbits() with
+    bitorder="little" on a (cols, rows) array.
+    """
+
+    # Cells can only be used within cols x rows
+    bounded = True
+
+    def __init__(self, cols, rows, value=0):
+        """Create the store with every cell set to value."""
+        self.cols = cols
+        self.rows = rows
+        self.bits = bytearray((cols * rows + 7) // 8)
+        if value:
+            self.fill(value)
+
+    def __getitem__(self, pos):
+        """Return the value of the cell at pos (x, y)."""
+        index = pos[0] * self.rows + pos[1]
+        return (self.bits[index >> 3] >> (index & 7)) & 1
+
+    def __setitem__(self, pos, value):
+        """Set the value of the cell at pos (x, y)."""
+        index = pos[0] * self.rows + pos[1]
+        if value:
+            self.bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bits[index >> 3] &= ~(1 << (index & 7))
+
+    def fill(self, value):
+        """Set every cell to value."""
+        self.bits[:] = bytes([0xFF if value else 0]) * len(self.bits)
+        # Clear any unused bits at the end of the last byte, so that count()
+        # stays correct.
+        unused = len(self.bits) * 8 - self.cols * self.rows
+        if value and unused:
+            self.bits[-1] &= 0xFF >> unused
+
+    def count(self):
+        """Return the number of non-zero cells."""
+        return sum(self.bits.translate(POPCOUNT))
+
+    def to_array(self):
+        """Return a copy of the cells as a (cols, rows) uint8 NumPy array."""
+        array = numpy.unpackbits(
+            numpy.frombuffer(self.bits, dtype=numpy.uint8),
+            count=self.cols * self.rows,
+            bitorder="little",
+        )
+        return array.reshape(self.cols, self.rows)
+
+    def load_array(self, array):
+        """Copy the cells from a (cols, rows) NumPy array."""
+        packed = numpy.packbits(
+            numpy.asarray(array, dtype=bool).ravel(), bitorder="little"
+        )
+        self.bits[:] = packed.tobytes()
+
+    def region(self, x, y, cols, rows):
+        """Return a (cols, rows) uint8 NumPy array of cells from x, y."""
+        # Unpack only the whole columns which contain the region.
+        start = x * self.rows
+        end = (x + cols) * self.rows
+        packed = numpy.frombuffer(
+            self.bits,
+            dtype=numpy.uint8,
+            count=(end + 7) // 8 - start // 8,
+            offset=start // 8,
+        )
+        array = numpy.unpackbits(packed, bitorder="little")
+        array = array[start % 8 : start % 8 + end - start]
+        return array.reshape(cols, self.rows)[:, y : y + rows]
+
+
+class ChunkedStore:
+    """
+    Unbounded sparse cell storage, as a dict of fixed-size tiles.
+
+    Any x, y position can be used, including negative ones. Each tile is a
+    bytearray of TILE_SIZE x TILE_SIZE cells, keyed by its tile position
+    (x >> TILE_SHIFT, y >> TILE_SHIFT), and is only allocated when one of
+    its cells is first set to a value other than the background value.
+    cols and rows are the nominal size of the grid, used by to_array() and
+    load_array(), but cells outside it are stored in the same way.
+
+    A long periodic pattern, such as a Langton's ant highway, can be added
+    with add_stripe(). Only the tiles of a stripe inside the current bounds()
+    are written straight away. The rest are filled in when first used.
+    """
+
+    # Cells can be used at any position
+    bounded = False
+
+    def __init__(self, cols, rows, value=0):
+        """Create the store with every cell set to value."""
+        self.cols = cols
+        self.rows = rows
+        self.background = value
+        self.tiles = {}
+        self.stripes = []
+
+    def __getitem__(self, pos):
+        """Return the value of the cell at pos (x, y)."""
+        x, y = pos
+        tile = self.tiles.get((x >> TILE_SHIFT, y >> TILE_SHIFT))
+        if tile is None and self.stripes:
+            tile = self.load_tile((x >> TILE_SHIFT, y >> TILE_SHIFT))
+        if tile is None:
+            return self.background
+        return tile[((x & TILE_MASK) << TILE_SHIFT) | (y & TILE_MASK)]
+
+    def __setitem__(self, pos, value):
+        """Set the value of the cell at pos (x, y)."""
+        x, y = pos
+        key = (x >> TILE_SHIFT, y >> TILE_SHIFT)
+        tile = self.tiles.get(key)
+        if tile is None and self.stripes:
+            tile = self.load_tile(key)
+        if tile is None:
+            if value == self.background:
+                # Leave the tile unallocated.
+                return
+            tile = self.new_tile()
+            self.tiles[key] = tile
+        tile[((x & TILE_MASK) << TILE_SHIFT) | (y & TILE_MASK)] = value
+
+    def new_tile(self):
+        """Return a new tile, with every cell set to the background value."""
+        return bytearray([self.background]) * (TILE_SIZE * TILE_SIZE)
+
+    def load_tile(self, key):
+        """
+        Allocate the tile at key if any stripe covers it, and return it.
+
+        Returns None, and leaves the tile unallocated, if no stripe covers it.
+        """
+        tile = None
+        for stripe in self.stripes:
+            visits = stripe.tile_visits(*key)
+            if visits:
+                if tile is None:
+                    tile = self.new_tile()
+                    self.tiles[key] = tile
+                stripe.apply(tile, visits)
+        return tile
+
+    def add_stripe(self, stripe):
+        """
+        Add a Stripe of visits on top of the current cells.
+
+        The background value must be 0. The stripe must not overlap any
+        cells outside the current bounds() which are not 0.
+        """
+        if self.background:
+            raise ValueError("Stripes need a background value of 0")
+        bounds = self.bounds()
+        self.stripes.append(stripe)
+        if bounds is None:
+            return
+        # Write the stripe into the tiles which may already hold cells.
+        for key in stripe.tile_keys(*bounds):
+            tile = self.tiles.get(key)
+            if tile is None:
+                self.load_tile(key)
+            else:
+                stripe.apply(tile, stripe.tile_visits(*key))
+
+    def fill(self, value):
+        """Set every cell to value."""
+        self.background = value
+        self.tiles.clear()
+        self.stripes.clear()
+
+    def count(self):
+        """
+        Return the number of non-zero cells.
+
+        Cells in unallocated tiles are taken to be the background value, so
+        this is only the total population when the background value is 0.
+        """
+        return sum(
+            TILE_SIZE * TILE_SIZE - tile.count(0)
+            for tile in self.tiles.values()
+        ) + sum(stripe.population for stripe in self.stripes)
+
+    def bounds(self):
+        """
+        Return an (x, y, cols, rows) rectangle covering every cell in use.
+
+        The rectangle covers every allocated tile and every stripe, and is
+        aligned to whole tiles. Returns None if no cells are in use.
+        """
+        if not self.tiles and not self.stripes:
+            return None
+        tile_xs = [key[0] for key in self.tiles]
+        tile_ys = [key[1] for key in self.tiles]
+        for stripe in self.stripes:
+            left, top, right, bottom = stripe.extent()
+            tile_xs += [left >> TILE_SHIFT, right >> TILE_SHIFT]
+            tile_ys += [top >> TILE_SHIFT, bottom >> TILE_SHIFT]
+        x = min(tile_xs) << TILE_SHIFT
+        y = min(tile_ys) << TILE_SHIFT
+        return (
+            x,
+            y,
+            ((max(tile_xs) + 1) << TILE_SHIFT) - x,
+            ((max(tile_ys) + 1) << TILE_SHIFT) - y,
+        )
+
+    def to_array(self):
+        """Return a copy of the cells as a (cols, rows) uint8 NumPy array."""
+        return self.region(0, 0, self.cols, self.rows)
+
+    def load_array(self, array):
+        """Copy the cells from a (cols, rows) NumPy array."""
+        self.fill(0)
+        for x, y in zip(*numpy.nonzero(array)):
+            self[int(x), int(y)] = int(array[x, y])
+
+    def region(self, x, y, cols, rows):
+        """Return a (cols, rows) uint8 NumPy array of cells from x, y."""
+        array = numpy.full((cols, rows), self.background, dtype=numpy.uint8)
+        size = TILE_SIZE
+        tile_cols = range(x >> TILE_SHIFT, ((x + cols - 1) >> TILE_SHIFT) + 1)
+        tile_rows = range(y >> TILE_SHIFT, ((y + rows - 1) >> TILE_SHIFT) + 1)
+        for tile_x in tile_cols:
+            for tile_y in tile_rows:
+                tile = self.tiles.get((tile_x, tile_y))
+                if tile is None and self.stripes:
+                    tile = self.load_tile((tile_x, tile_y))
+                if tile is None:
+                    continue
+                # Copy the part of the tile which overlaps the region.
+                left = max(x, tile_x * size)
+                right = min(x + cols, (tile_x + 1) * size)
+                top = max(y, tile_y * size)
+                bottom = min(y + rows, (tile_y + 1) * size)
+                cells = numpy.frombuffer(tile, dtype=numpy.uint8)
+                cells = cells.reshape(size, size)
+                array[left - x : right - x, top - y : bottom - y] = cells[
+                    left - tile_x * size : right - tile_x * size,
+                    top - tile_y * size : bottom - tile_y * size,
+                ]
+        return array
+
+
+def step_range(start, step, low, high):
+    """
+    Return the range of m for which low <= start + m * step <= high.
+
+    The range may be empty. If step is 0, every m is in range if start is,
+    so the range is only limited by the caller.
+    """
+    if step > 0:
+        return -((start - low) // step), (high - start) // step
+    if step < 0:
+        return -((start - high) // step), (low - start) // step
+    if low <= start <= high:
+        return -float("inf"), float("inf")
+    return 1, 0
+
+
+class Stripe:
+    """
+    A periodic pattern of cell visits, repeated along a line.
+
+    Period m of the stripe, for m from 0 to periods - 1, visits each cell
+    x + ox + m * dx, y + oy + m * dy listed in visits {(ox, oy): count}
+    count times. Each visit adds 1 to the cell value, modulo states. For
+    example, a two state Langton's ant flips a cell on each visit.
+    """
+
+    def __init__(self, x, y, dx, dy, periods, visits, states=2):
+        """Create the stripe."""
+        # pylint: disable=too-many-arguments
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.periods = periods
+        self.visits = {
+            offset: count % states
+            for offset, count in visits.items()
+            if count % states
+        }
+        self.states = states
+        # Number of non-zero cells of the stripe in unallocated tiles
+        self.population = self.total_population()
+
+    def line_visits(self):
+        """
+        Group the visits into lines along dx, dy.
+
+        Returns a list of {i: count} dicts, one per line, where the offset of
+        each entry is base + i * (dx, dy) for the line's base offset.
+        """
+        lines = {}
+        for (ox, oy), count in self.visits.items():
+            if self.dx:
+                i = ox // self.dx
+            else:
+                i = oy // self.dy
+            base = (ox - i * self.dx, oy - i * self.dy)
+            lines.setdefault(base, {})[i] = count
+        return list(lines.values())
+
+    def line_count(self, line, n):
+        """Return the total visits to cell n along a line of line_visits()."""
+        first = max(min(line), n - self.periods + 1)
+        return sum(line.get(i, 0) for i in range(first, min(max(line), n) + 1))
+
+    def total_population(self):
+        """Return the number of cells which the stripe leaves non-zero."""
+        population = 0
+        periods = self.periods
+        for line in self.line_visits():
+            first = min(line)
+            last = max(line)
+            if periods <= 2 * (last - first + 1):
+                # A short stripe. Check every cell.
+                ends = range(first, periods + last)
+            else:
+                # The cells away from the ends of the stripe are visited by
+                # the whole line of the pattern, once per period.
+                ends = list(range(first, last)) + list(
+                    range(periods + first, periods + last)
+                )
+                if sum(line.values()) % self.states:
+                    population += periods + first - last
+            population += sum(
+                1 for n in ends if self.line_count(line, n) % self.states
+            )
+        return population
+
+    def extent(self):
+        """Return the (left, top, right, bottom) cells covered, inclusive."""
+        offsets_x = [ox for ox, oy in self.visits] or [0]
+        offsets_y = [oy for ox, oy in self.visits] or [0]
+        end_x = (self.periods - 1) * self.dx
+        end_y = (self.periods - 1) * self.dy
+        return (
+            self.x + min(offsets_x) + min(0, end_x),
+            self.y + min(offsets_y) + min(0, end_y),
+            self.x + max(offsets_x) + max(0, end_x),
+            self.y + max(offsets_y) + max(0, end_y),
+        )
+
+    def periods_within(self, ox, oy, left, top, right, bottom):
+        """Return the periods in which offset ox, oy is inside a rectangle."""
+        low_x, high_x = step_range(self.x + ox, self.dx, left, right)
+        low_y, high_y = step_range(self.y + oy, self.dy, top, bottom)
+        return range(
+            int(max(0, low_x, low_y)),
+            int(min(self.periods - 1, high_x, high_y)) + 1,
+        )
+
+    def tile_visits(self, tile_x, tile_y):
+        """Return {tile index: visits} for the cells in a ChunkedStore tile."""
+        left = tile_x << TILE_SHIFT
+        top = tile_y << TILE_SHIFT
+        visits = {}
+        for (ox, oy), count in self.visits.items():
+            for m in self.periods_within(
+                ox, oy, left, top, left + TILE_MASK, top + TILE_MASK
+            ):
+                x = self.x + ox + m * self.dx
+                y = self.y + oy + m * self.dy
+                index = ((x & TILE_MASK) << TILE_SHIFT) | (y & TILE_MASK)
+                visits[index] = visits.get(index, 0) + count
+        return visits
+
+    def tile_keys(self, x, y, cols, rows):
+        """Return the keys of the tiles with stripe cells in a rectangle."""
+        keys = set()
+        for ox, oy in self.visits:
+            for m in self.periods_within(
+                ox, oy, x, y, x + cols - 1, y + rows - 1
+            ):
+                keys.add(
+                    (
+                        (self.x + ox + m * self.dx) >> TILE_SHIFT,
+                        (self.y + oy + m * self.dy) >> TILE_SHIFT,
+                    )
+                )
+        return keys
+
+    def apply(self, tile, visits):
+        """Add tile_visits() to a tile, which is then no longer lazy."""
+        for index, count in visits.items():
+            tile[index] = (tile[index] + count) % self.states
+            if count % self.states:
+                self.population -= 1
+
+
+# Available storage backends
+STORES = {
+    LIST: ListStore,
+    ARRAY: ArrayStore,
+    PACKED: PackedStore,
+    CHUNKED: ChunkedStore,
+    HASHLIFE: hashlife.QuadTreeStore,
+}
+
+
+def create_store(backend, cols, rows, value=0):
+    """Create a cell store using the named backend."""
+    try:
+        store_class = STORES[backend]
+    except KeyError:
+        raise ValueError(
+            "Unknown cell store backend: " + str(backend)
+        ) from None
+    return store_class(cols, rows, value)
@@ -0,0 +1,446 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoint and resume of simulation models.
+
+A checkpoint holds the full state of a models.Model: its cells, generation
+count, populations, ant state, random stream and any other attributes, and
+the state of the random module's generator. The file format is:
+
+- MAGIC, then the format VERSION as an unsigned 16 bit big-endian integer.
+- The length of the header as an unsigned 32 bit big-endian integer, then the
+  header as UTF-8 JSON. The header holds the model class, its attributes,
+  the random state and a list of sections.
+- The data of each section in the header list, in order. Cell sections hold
+  one byte per cell, bit-packed when every cell is 0 or 1, or each distinct
+  node of a hashlife quadtree. All section data is zlib compressed.
+
+save() writes a checkpoint and load() reads one. A CheckpointWriter saves
+checkpoints on a background thread. Only a quick copy of the cells is taken
+on the calling thread, so a running simulation does not stall.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Tuple attributes are restored as tuples, and a
+                           checkpoint of an unknown model, or with a
+                           missing part of its header, raises ValueError.
+"""
+import json
+import os
+import random
+import struct
+import threading
+import zlib
+
+import cellstore
+import hashlife
+import models
+import rng
+import turmites
+
+# NumPy is optional. It makes bit-packing much faster, and is needed for
+# models which hold NumPy arrays.
+try:
+    import numpy
+
+    NUMPY = True
+except ModuleNotFoundError:
+    NUMPY = False
+
+MAGIC = b"SIMCKPT\n"
+VERSION = 1
+
+# Model classes which can be restored, by name
+MODELS = {
+    model_class.__name__: model_class
+    for model_class in (
+        models.Model,
+        models.LangtonModel,
+        models.ColonyModel,
+        models.VotingModel,
+        models.MajorityRuleModel,
+    )
+}
+
+# Model attributes which are not saved. neighbor_counts, active and
+# domain_tracker are rebuilt from the cells when needed.
+SKIP = {
+    "cells",
+    "updated_cells",
+    "neighbor_counts",
+    "active",
+    "domain_tracker",
+}
+
+# zlib compression level. Level 1 is much faster than the default, and
+# compresses typical cell patterns almost as well.
+COMPRESSION = 1
+
+
+def pack_bits(data):
+    """Pack bytes of 0 or 1 into bits, lowest bit first."""
+    if NUMPY:
+        return numpy.packbits(
+            numpy.frombuffer(data, dtype=numpy.uint8), bitorder="little"
+        ).tobytes()
+    packed = bytearray((len(data) + 7) // 8)
+    for index in range(0, len(data), 8):
+        byte = 0
+        for bit, value in enumerate(data[index : index + 8]):
+            byte |= value << bit
+        packed[index >> 3] = byte
+    return bytes(packed)
+
+
+def unpack_bits(packed, count):
+    """Unpack count bytes of 0 or 1 from bits, lowest bit first."""
+    if NUMPY:
+        return numpy.unpackbits(
+            numpy.frombuffer(packed, dtype=numpy.uint8),
+            count=count,
+            bitorder="little",
+        ).tobytes()
+    return bytes(
+        (packed[index >> 3] >> (index & 7)) & 1 for index in range(count)
+    )
+
+
+def snapshot_cells(cells):
+    """
+    Return a quick copy of a cell store, as (header, data).
+
+    The data is one byte per cell, or already bit-packed for a PackedStore.
+    """
+    header = {
+        "store": store_name(cells),
+        "cols": cells.cols,
+        "rows": cells.rows,
+    }
+    if isinstance(cells, hashlife.QuadTreeStore):
+        header["quadtree"] = True
+        return header, cells.to_bytes()
+    if isinstance(cells, cellstore.PackedStore):
+        header["packed"] = True
+        return header, bytes(cells.bits)
+    if isinstance(cells, cellstore.ArrayStore):
+        return header, cells.array.tobytes()
+    if isinstance(cells, cellstore.ChunkedStore):
+        header["background"] = cells.background
+        header["tiles"] = list(cells.tiles)
+        header["stripes"] = [
+            {
+                "x": stripe.x,
+                "y": stripe.y,
+                "dx": stripe.dx,
+                "dy": stripe.dy,
+                "periods": stripe.periods,
+                "visits": [
+                    [ox, oy, count]
+                    for (ox, oy), count in stripe.visits.items()
+                ],
+                "states": stripe.states,
+                "population": stripe.population,
+            }
+            for stripe in cells.stripes
+        ]
+        return header, b"".join(cells.tiles.values())
+    # ListStore
+    return header, b"".join(bytes(column) for column in cells.columns)
+
+
+def store_name(cells):
+    """Return the backend name of a cell store."""
+    for name, store_class in cellstore.STORES.items():
+        if type(cells) is store_class:  # pylint: disable=unidiomatic-typecheck
+            return name
+    raise ValueError("Unknown cell store: " + type(cells).__name__)
+
+
+def restore_cells(header, data):
+    """Return a new cell store from a snapshot_cells() header and data."""
+    cols = header["cols"]
+    rows = header["rows"]
+    cells = cellstore.create_store(header["store"], cols, rows)
+    if header.get("quadtree"):
+        cells.load_bytes(data)
+    elif header.get("packed"):
+        cells.bits[:] = data
+    elif isinstance(cells, cellstore.ArrayStore):
+        cells.array[:] = numpy.frombuffer(data, dtype=numpy.uint8).reshape(
+            cols, rows
+        )
+    elif isinstance(cells, cellstore.ChunkedStore):
+        cells.background = header["background"]
+        size = cellstore.TILE_SIZE * cellstore.TILE_SIZE
+        for index, key in enumerate(header["tiles"]):
+            cells.tiles[tuple(key)] = bytearray(
+                data[index * size : (index + 1) * size]
+            )
+        for values in header["stripes"]:
+            stripe = cellstore.Stripe(
+                values["x"],
+                values["y"],
+                values["dx"],
+                values["dy"],
+                values["periods"],
+                {(ox, oy): count for ox, oy, count in values["visits"]},
+                values["states"],
+            )
+            # Parts of the stripe may already be in the tiles.
+            stripe.population = values["population"]
+            cells.stripes.append(stripe)
+    else:
+        cells.columns = [
+            list(data[x * rows : (x + 1) * rows]) for x in range(cols)
+        ]
+    return cells
+
+
+def tag_tuples(value):
+    """
+    Return a copy of a value, with each tuple in it tagged as {"tuple": ...}.
+
+    JSON has no tuples, so they would otherwise come back as lists.
+    """
+    if isinstance(value, tuple):
+        return {"tuple": [tag_tuples(item) for item in value]}
+    if isinstance(value, list):
+        return [tag_tuples(item) for item in value]
+    if isinstance(value, dict):
+        return {key: tag_tuples(item) for key, item in value.items()}
+    return value
+
+
+def untag_tuples(value):
+    """Return a copy of a value from tag_tuples(), with its tuples back."""
+    if isinstance(value, dict):
+        if list(value) == ["tuple"]:
+            return tuple(untag_tuples(item) for item in value["tuple"])
+        return {key: untag_tuples(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [untag_tuples(item) for item in value]
+    return value
+
+
+def snapshot(model, save_random=True):
+    """
+    Return a quick copy of a model's state, as (header, sections).
+
+    sections is a list of (section header, data) pairs, not yet packed or
+    compressed. The random module's state is included if save_random is
+    True.
+    """
+    attributes = {}
+    sections = []
+    for name, value in vars(model).items():
+        if name in SKIP:
+            continue
+        if isinstance(value, turmites.Rule):
+            attributes[name] = {"rule": value.rule}
+        elif isinstance(value, rng.RandomStream):
+            attributes[name] = {"random_stream": value.getstate()}
+        elif NUMPY and isinstance(value, numpy.ndarray):
+            sections.append(
+                (
+                    {
+                        "kind": "array",
+                        "name": name,
+                        "dtype": value.dtype.str,
+                        "shape": value.shape,
+                    },
+                    value.tobytes(),
+                )
+            )
+        else:
+            # Copy the value through JSON, which also checks that it can be
+            # saved.
+            try:
+                value = json.loads(json.dumps(tag_tuples(value)))
+            except TypeError:
+                raise ValueError(
+                    "Cannot checkpoint the {} attribute of {}".format(
+                        name, type(model).__name__
+                    )
+                ) from None
+            attributes[name] = value
+
+    cells_header, cells_data = snapshot_cells(model.cells)
+    cells_header["kind"] = "cells"
+    sections.append((cells_header, cells_data))
+
+    header = {"model": type(model).__name__, "attributes": attributes}
+    if save_random:
+        header["random"] = random.getstate()
+    return header, sections
+
+
+def encode(header, sections):
+    """Return the bytes of a checkpoint file from a snapshot()."""
+    blobs = []
+    header = dict(header, sections=[])
+    for section_header, data in sections:
+        section_header = dict(section_header)
+        if (
+            section_header["kind"] == "cells"
+            and not section_header.get("packed")
+            and not section_header.get("quadtree")
+            and max(data, default=0) <= 1
+        ):
+            data = pack_bits(data)
+            section_header["packed_bits"] = True
+        blob = zlib.compress(data, COMPRESSION)
+        section_header["length"] = len(blob)
+        header["sections"].append(section_header)
+        blobs.append(blob)
+    header_bytes = json.dumps(header).encode("utf-8")
+    return b"".join(
+        [
+            MAGIC,
+            struct.pack(">HI", VERSION, len(header_bytes)),
+            header_bytes,
+        ]
+        + blobs
+    )
+
+
+def write(path, data):
+    """Write a file, replacing any existing file only once it is complete."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def save(model, path):
+    """Save a checkpoint of a model to a file."""
+    write(path, encode(*snapshot(model)))
+
+
+def load(path, restore_random=True):
+    """
+    Load a model from a checkpoint file.
+
+    The random module's generator is restored to its saved state, unless
+    restore_random is False.
+    """
+    with open(path, "rb") as file:
+        return decode(file.read(), restore_random, path)
+
+
+def decode(data, restore_random=True, name="checkpoint"):
+    """Return a model from the bytes of a checkpoint file. See load()."""
+    if not data.startswith(MAGIC) or len(data) < len(MAGIC) + 6:
+        raise ValueError(name + " is not a checkpoint file")
+    offset = len(MAGIC)
+    version, header_length = struct.unpack_from(">HI", data, offset)
+    if version > VERSION:
+        raise ValueError(
+            "{} is checkpoint version {}, but only versions up to {} can be "
+            "read".format(name, version, VERSION)
+        )
+    offset += struct.calcsize(">HI")
+    header = json.loads(data[offset : offset + header_length])
+    offset += header_length
+
+    if not isinstance(header, dict):
+        raise ValueError(name + " is damaged")
+    for key in ("model", "attributes", "sections"):
+        if key not in header:
+            raise ValueError("{} has no {} in its header".format(name, key))
+    model_class = MODELS.get(header["model"])
+    if model_class is None:
+        raise ValueError(
+            "{} contains unknown model {}".format(name, header["model"])
+        )
+    model = model_class.__new__(model_class)
+    for attribute, value in header["attributes"].items():
+        if isinstance(value, dict) and "rule" in value:
+            value = turmites.Rule(value["rule"])
+        elif isinstance(value, dict) and "random_stream" in value:
+            value = rng.RandomStream.from_state(value["random_stream"])
+        else:
+            value = untag_tuples(value)
+        setattr(model, attribute, value)
+    model.updated_cells = []
+
+    for section in header["sections"]:
+        blob = data[offset : offset + section["length"]]
+        offset += section["length"]
+        try:
+            section_data = zlib.decompress(blob)
+        except zlib.error:
+            raise ValueError(name + " is damaged") from None
+        if section["kind"] == "array":
+            setattr(
+                model,
+                section["name"],
+                numpy.frombuffer(section_data, dtype=section["dtype"])
+                .reshape(section["shape"])
+                .copy(),
+            )
+        else:
+            if section.get("packed_bits"):
+                if "tiles" in section:
+                    count = len(section["tiles"]) * cellstore.TILE_SIZE ** 2
+                else:
+                    count = section["cols"] * section["rows"]
+                section_data = unpack_bits(section_data, count)
+            model.cells = restore_cells(section, section_data)
+
+    if restore_random and "random" in header:
+        version, internal, gauss_next = header["random"]
+        random.setstate((version, tuple(internal), gauss_next))
+    return model
+
+
+class CheckpointWriter:
+    """
+    Save checkpoints on a background thread.
+
+    submit() takes a quick snapshot of the model, and returns straight away.
+    The snapshot is packed, compressed and written by the writer's thread.
+    If a new checkpoint is submitted before the last one has been written,
+    only the newest is kept.
+    """
+
+    def __init__(self):
+        """Start the writer thread."""
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        # The last error raised while writing, if any
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, model, path):
+        """Queue a checkpoint of the model to be written to path."""
+        state = snapshot(model)
+        with self.condition:
+            self.pending = (state, path)
+            self.condition.notify_all()
+
+    def run(self):
+        """Write each submitted checkpoint. Runs on the writer thread."""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                state, path = self.pending
+                self.pending = None
+                self.busy = True
+            try:
+                write(path, encode(*state))
+                self.error = None
+            except OSError as error:
+                self.error = error
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def flush(self):
+        """Wait until every submitted checkpoint has been written."""
+        with self.condition:
+            while self.pending is not None or self.busy:
+                self.condition.wait()
+        if self.error:
+            raise self.error
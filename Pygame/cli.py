@@ -0,0 +1,23 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Command line helpers shared by the benchmark, export and batch tools.
+
+This module does not import Pygame, so the headless tools which use it can
+run on a machine without Pygame installed.
+
+Simulatine, 18 Oct, 2026 - Initial version. parse_size() moved out of
+                           bench.py.
+"""
+import argparse
+
+
+def parse_size(text):
+    """Parse a grid or window size given as COLSxROWS."""
+    try:
+        cols, rows = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Size must be COLSxROWS, not " + text
+        ) from None
+    return cols, rows
@@ -0,0 +1,261 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Coalescing random walk engine for Voting Game consensus statistics.
+
+The Voting Game (models.VotingModel) is dual to coalescing random walks.
+Trace the lineage of every cell back in time: when a generation picks a
+cell, and copies the value of one of its neighbors, the lineage of the cell
+jumps back to that neighbor. Lineages which meet merge, and never part
+again. The value of a cell after t generations is the initial value of the
+cell where its lineage is t generations back, so the grid is in consensus
+after t generations exactly when the lineages still apart after t
+generations back all started on cells of the same value.
+
+The generations are picked independently, so tracing back from generation
+t has the same statistics as tracing forward from generation 0. One trace
+of N = cell_cols x cell_rows walkers until a single walker is left gives
+the chance of consensus at every generation at once:
+
+- From random initial cells, each 1 with the chance density, the chance of
+  consensus after t generations, given K walkers left, is
+  density ** K + (1 - density) ** K.
+- From given initial cells, it is 1 when the K walkers all sit on cells of
+  the same initial value, and otherwise 0.
+
+The final vote is the initial value at the last walker's cell.
+
+Only the jumps of the walkers need to be simulated: the number of
+generations until a walker is picked is drawn from its geometric
+distribution, as in the Voting Game's events mode. A trace takes time in
+proportion to the number of walker jumps, which is far fewer than the
+generations a forward run needs to reach consensus.
+
+Example:
+    python coalescing.py --size 256x256 --trials 20 --density 0.4
+    python coalescing.py --size 5x5 --trials 2000 --validate
+    python coalescing.py --checkpoint "Voting Game_checkpoint.sim"
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Imports parse_size() from cli.py, so it runs
+                           without Pygame.
+"""
+import argparse
+import math
+import statistics
+
+import activeset
+import checkpoint
+import cli
+import models
+import rng
+
+
+def trace(cell_cols, cell_rows, stream, initial=None):
+    """
+    Trace the lineages of every cell back until they have all merged.
+
+    stream is an rng.RandomStream. initial is a list of the initial value
+    of each cell, indexed by x * cell_rows + y, or None.
+
+    Returns (drops, disagreed, final). drops lists the generation, counting
+    back, at which each walker merged into another, in order. disagreed is
+    the number of generations at which the walkers were not all on cells of
+    the same initial value, or None if initial is None. final is the index
+    of the cell of the last walker.
+    """
+    rows = cell_rows
+    cells = cell_cols * cell_rows
+    walkers = activeset.IndexedSet()
+    for index in range(cells):
+        walkers.add(index)
+    # Walkers on cells with an initial value of 1
+    ones = sum(initial) if initial is not None else 0
+    disagreed = 0
+    drops = []
+    generation = 0
+    while len(walkers) > 1:
+        count = len(walkers)
+        # The generations until a cell with a walker is picked
+        chance = count / cells
+        skipped = 0
+        if chance < 1:
+            # 1 - random() is never 0, so its log is finite.
+            skipped = int(
+                math.log(1 - stream.random()) / math.log(1 - chance)
+            )
+        if initial is not None and 0 < ones < count:
+            disagreed += skipped + 1
+        generation += skipped + 1
+
+        # Move the walker to a random neighbor of its cell.
+        index = walkers.choice(stream.random)
+        x, y = divmod(index, rows)
+        dx, dy = models.NEIGHBORS[stream.integer(len(models.NEIGHBORS))]
+        neighbor = (x + dx) % cell_cols * rows + (y + dy) % rows
+        walkers.discard(index)
+        if initial is not None:
+            ones -= initial[index]
+        if neighbor in walkers:
+            drops.append(generation)
+        else:
+            walkers.add(neighbor)
+            if initial is not None:
+                ones += initial[neighbor]
+    return drops, disagreed if initial is not None else None, walkers.items[0]
+
+
+def expected_consensus(drops, cells, density):
+    """
+    Return the expected generation of consensus, given a trace.
+
+    This is for random initial cells, each 1 with the chance density. The
+    consensus generation is the sum over every generation of the chance
+    that the grid is not yet in consensus.
+    """
+    total = 0.0
+    start = 0
+    count = cells
+    for drop in drops:
+        total += (drop - start) * (
+            1 - density ** count - (1 - density) ** count
+        )
+        start = drop
+        count -= 1
+    return total
+
+
+def estimate(
+    cell_cols, cell_rows, trials, density=0.5, initial=None, seed=None
+):
+    """
+    Estimate the consensus generation and final vote from several traces.
+
+    Starts from random initial cells, each 1 with the chance density, or
+    from the given initial cells, as for trace(). Returns a dictionary of
+    the mean generation of consensus and its standard error, and the
+    chance that the final vote is 1.
+    """
+    # pylint: disable=too-many-arguments
+    stream = rng.RandomStream(seed)
+    cells = cell_cols * cell_rows
+    times = []
+    ones = 0.0
+    for _ in range(trials):
+        drops, disagreed, final = trace(cell_cols, cell_rows, stream, initial)
+        if initial is None:
+            times.append(expected_consensus(drops, cells, density))
+            ones += density
+        else:
+            times.append(disagreed)
+            ones += initial[final]
+    return {
+        "trials": trials,
+        "consensus_generation": statistics.mean(times),
+        "standard_error": statistics.stdev(times) / math.sqrt(trials)
+        if trials > 1
+        else None,
+        "final_ones": ones / trials,
+    }
+
+
+def forward(cell_cols, cell_rows, trials, density=0.5, seed=None):
+    """
+    Estimate the same as estimate(), by running VotingModel forward.
+
+    Only practical for small grids. Used to validate the traces.
+    """
+    stream = rng.RandomStream(seed)
+    times = []
+    ones = 0
+    for _ in range(trials):
+        model = models.VotingModel(
+            cell_cols, cell_rows, seed=stream.integer(2 ** 62)
+        )
+        model.fill_random(density)
+        model.check_finished()
+        while not model.finished:
+            model.update_simulation()
+        # Generations are counted from 1.
+        times.append(model.frozen_generation - 1)
+        ones += model.populations[1] > 0
+    return {
+        "trials": trials,
+        "consensus_generation": statistics.mean(times),
+        "standard_error": statistics.stdev(times) / math.sqrt(trials)
+        if trials > 1
+        else None,
+        "final_ones": ones / trials,
+    }
+
+
+def report(name, result):
+    """Print an estimate."""
+    error = result["standard_error"]
+    print(
+        "{:<8} consensus at generation {:.1f}{}, final vote 1 with chance "
+        "{:.3f} ({} trials)".format(
+            name,
+            result["consensus_generation"],
+            " +/- {:.1f}".format(error) if error is not None else "",
+            result["final_ones"],
+            result["trials"],
+        )
+    )
+
+
+def main():
+    """Estimate Voting Game consensus statistics."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=cli.parse_size, default=(64, 64))
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=0.5,
+        help="initial chance of each cell being 1",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="start from the cells of a Voting Game checkpoint instead",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="also run the Voting Game forward; only for small grids",
+    )
+    options = parser.parse_args()
+    if options.validate and options.checkpoint:
+        parser.error("--validate runs from random cells, not a checkpoint")
+
+    initial = None
+    cols, rows = options.size
+    if options.checkpoint:
+        model = checkpoint.load(options.checkpoint, restore_random=False)
+        cols, rows = model.cell_cols, model.cell_rows
+        initial = [
+            model.cells[x, y] for x in range(cols) for y in range(rows)
+        ]
+    report(
+        "Dual",
+        estimate(
+            cols,
+            rows,
+            options.trials,
+            options.density,
+            initial,
+            options.seed,
+        ),
+    )
+    if options.validate:
+        report(
+            "Forward",
+            forward(
+                cols, rows, options.trials, options.density, options.seed
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Langton's Ant Colony Simulation.
+
+Thousands of Langton's ants share one grid, whose edges wrap around. Each ant
+follows the usual rules, and the ants interact through the cells they flip.
+The ants are stepped together by models.ColonyModel, and drawn together as
+renderer markers.
+
+See https://en.wikipedia.org/wiki/Langton%27s_ant
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+# Import Pygame, either standard version or SDL2 version depending on the
+# platform.
+try:
+    import pygame_sdl2  # pylint: disable=import-error
+
+    pygame_sdl2.import_as_pygame()
+    PYGAME_SDL2 = True
+except ModuleNotFoundError:
+    PYGAME_SDL2 = False
+import pygame
+
+import cellstore
+import models
+import sim
+
+
+class Colony(sim.Grid):
+    """Langton's Ant colony simulation."""
+
+    # Number of ants in a new colony
+    ants = 1000
+
+    def create_model(self):
+        """Create the ant colony model to fit the grid."""
+        return models.ColonyModel(
+            *self.grid_size, store=cellstore.ARRAY, ants=self.ants
+        )
+
+    def update_grid(self):
+        """Draw the current state of the main grid."""
+        super().update_grid()
+        # Draw every ant in a single pass.
+        self.renderer.draw_markers(
+            zip(self.model.ant_x.tolist(), self.model.ant_y.tolist()), sim.RED
+        )
+
+    def update_dashboard(self, msg=None):
+        """Update the dashboard display with status for the simulation."""
+        # First, display the standard dashboard items.
+        super().update_dashboard(msg)
+
+        # Display the number of ants
+        self.draw_field(
+            "Ants",
+            "Ants: {:>6}".format(len(self.model.ant_x)),
+            self.dashboard.left + self.dash_pos_x,
+            self.dashboard.top + self.dash_pos_y,
+        )
+
+
+def main():
+    """Initialise the game and call the main game loop."""
+    title = "Langton's Ant Colony"
+    # Initialise logging
+    sim.config_logging(title)
+
+    # Larger screen size
+    display_surface = sim.start_pygame(1024, 768, title)
+
+    run_game(display_surface, title)
+
+
+def run_game(display_surface, title):
+    """
+    Execute the main game loop.
+
+    The game is checkpointed as it runs, and carries on from the last
+    checkpoint, if there is one.
+    """
+    path = sim.checkpoint_file(title)
+    simulation = Colony(
+        display_surface,
+        title,
+        model=sim.resume_model(path),
+        cell_size=4,
+        checkpoint_path=path,
+    )
+    sim.game_loop(simulation)
+
+
+if __name__ == "__main__":
+    main()
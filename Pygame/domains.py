@@ -0,0 +1,232 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Domain and interface statistics for the voting simulations.
+
+DomainTracker class - keeps the number of domains, the size of the largest
+                      domain and the interface length of a grid of 0 and 1
+                      cells, as its cells flip.
+
+A domain is a connected block of cells of the same value, where cells are
+connected to the cells above, below and to each side of them, wrapping
+around the edges of the grid. The interface length is the number of pairs
+of neighboring cells, including diagonal neighbors, with different values.
+
+The interface length is updated from the eight neighbors of each flipped
+cell. The domains are held in a union-find structure, which can join two
+domains cheaply but cannot split one. A flipped cell is given a new node,
+joined to the domains of its new value, and its old node stays behind to
+keep its old domain connected. Whether the old domain has been cut in
+pieces can be ruled out from the eight neighbors in most cases, and
+otherwise a short search around the cut finds any small piece cut off. If
+the search gives up, the structure is marked as stale, and rebuilt from the
+cells only when the statistics are next read.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+
+# Offsets of the four neighbors a domain is connected through
+SIDES = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+# Cells searched through to find whether a flipped cell has cut a domain in
+# pieces, before giving up and rebuilding the domains instead
+SEARCH_LIMIT = 256
+# Offsets of the eight neighbors, in order around the cell starting above
+# it, so that each is a side neighbor of the next
+RING = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+
+
+class DomainTracker:
+    """
+    Domain and interface statistics of a model's cells, kept up to date.
+
+    Call flip() whenever a cell changes. domain_count(), largest_domain()
+    and interface are then correct after every generation.
+    """
+
+    # Stop pylint complaining about the number of attributes:
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, model):
+        """Build the statistics from the cells of a models.VotingModel."""
+        self.cols = model.cell_cols
+        self.rows = model.cell_rows
+        cells = model.cells
+        # The value of each cell, indexed by x * rows + y
+        self.values = bytearray(
+            cells[x, y] for x in range(self.cols) for y in range(self.rows)
+        )
+        # The cells around each cell only form a ring of distinct cells on a
+        # grid at least three cells across.
+        self.small = self.cols < 3 or self.rows < 3
+        self.interface = 0
+        self.parent = []
+        self.node = []
+        self.sizes = {}
+        self.domains = 0
+        self.stale = True
+        self.rebuild()
+        values = self.values
+        for index, value in enumerate(values):
+            # Count each pair once, from one of its cells.
+            for dx, dy in RING[2:6]:
+                if values[self.neighbor(index, dx, dy)] != value:
+                    self.interface += 1
+
+    def neighbor(self, index, dx, dy):
+        """Return the index of the neighbor of a cell."""
+        x, y = divmod(index, self.rows)
+        return (x + dx) % self.cols * self.rows + (y + dy) % self.rows
+
+    def find(self, node):
+        """Return the root node of a node's domain."""
+        parent = self.parent
+        while parent[node] != node:
+            # Halve the path on the way up.
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, first, second):
+        """Join the domains of two nodes."""
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return
+        # Hang the smaller domain from the larger one.
+        if self.sizes[first] < self.sizes[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.sizes[first] += self.sizes.pop(second)
+        self.domains -= 1
+
+    def rebuild(self):
+        """Rebuild the domains from the cells, one node per cell."""
+        cells = self.cols * self.rows
+        self.parent = list(range(cells))
+        self.node = list(range(cells))
+        self.sizes = dict.fromkeys(range(cells), 1)
+        self.domains = cells
+        values = self.values
+        for index in range(cells):
+            for dx, dy in SIDES[1:3]:
+                neighbor = self.neighbor(index, dx, dy)
+                if values[neighbor] == values[index]:
+                    self.union(index, neighbor)
+        self.stale = False
+
+    def flip(self, x, y, value):
+        """Update the statistics for a change to the value of a cell."""
+        index = x * self.rows + y
+        values = self.values
+        old_value = values[index]
+        if value == old_value:
+            return
+        cols = self.cols
+        rows = self.rows
+        ring = [
+            (x + dx) % cols * rows + (y + dy) % rows for dx, dy in RING
+        ]
+        # Pairs with each neighbor of the old value become interface, and
+        # pairs with each neighbor of the new value stop being interface.
+        same = sum(values[neighbor] == old_value for neighbor in ring)
+        self.interface += 2 * same - len(ring)
+        values[index] = value
+        if self.stale:
+            return
+        if self.small:
+            self.stale = True
+            return
+
+        # Take the cell out of its old domain. Its node stays, to keep the
+        # rest of the domain connected.
+        root = self.find(self.node[index])
+        self.sizes[root] -= 1
+        # The first side neighbor of the old value in each run of old value
+        # cells around the ring. The runs are the old domain's only links
+        # through the cell.
+        starts = []
+        linked = False
+        for position, neighbor in enumerate(ring):
+            if values[neighbor] != old_value:
+                linked = False
+            elif position % 2 == 0 and not linked:
+                starts.append(neighbor)
+                linked = True
+        if not starts:
+            # The cell was the whole domain.
+            del self.sizes[root]
+            self.domains -= 1
+        elif len(starts) > 1:
+            # The last run carries on into the first, if they meet at the
+            # start of the ring.
+            if linked and values[ring[0]] == old_value:
+                starts.pop()
+            if len(starts) > 1 and not self.split(root, starts):
+                return
+
+        # Give the cell a node of its own, joined to the side neighbors of
+        # its new value.
+        node = len(self.parent)
+        self.parent.append(node)
+        self.node[index] = node
+        self.sizes[node] = 1
+        self.domains += 1
+        for position in range(0, len(ring), 2):
+            neighbor = ring[position]
+            if values[neighbor] == value:
+                self.union(node, self.node[neighbor])
+        if len(self.parent) > 2 * len(values):
+            # Too many nodes are left behind by flipped cells.
+            self.stale = True
+
+    def split(self, root, starts):
+        """
+        Split a domain which may have been cut in pieces by a flipped cell.
+
+        starts holds a cell from each side of the cut, and root is the root
+        node of the domain. Each start is searched from, cell by cell, until
+        it reaches another start, or runs out of cells, when it was cut off
+        from the rest of the domain and is given a domain of its own. A
+        search stopped after SEARCH_LIMIT cells marks the domains as stale
+        instead, and returns False.
+        """
+        values = self.values
+        value = values[starts[0]]
+        for position, start in enumerate(starts[:-1]):
+            others = set(starts[position + 1 :])
+            seen = {start}
+            queue = [start]
+            for cell in queue:
+                if len(seen) > SEARCH_LIMIT:
+                    self.stale = True
+                    return False
+                for dx, dy in SIDES:
+                    neighbor = self.neighbor(cell, dx, dy)
+                    if values[neighbor] == value and neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+                if not others.isdisjoint(seen):
+                    # The start is still joined to the rest of the domain.
+                    break
+            else:
+                # Give the piece cut off new nodes, under a new root.
+                piece = len(self.parent)
+                for cell in queue:
+                    self.node[cell] = len(self.parent)
+                    self.parent.append(piece)
+                self.sizes[piece] = len(queue)
+                self.sizes[root] -= len(queue)
+                self.domains += 1
+        return True
+
+    def domain_count(self):
+        """Return the number of domains."""
+        if self.stale:
+            self.rebuild()
+        return self.domains
+
+    def largest_domain(self):
+        """Return the number of cells in the largest domain."""
+        if self.stale:
+            self.rebuild()
+        return max(self.sizes.values(), default=0)
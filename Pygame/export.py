@@ -0,0 +1,351 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Headless frame export for the grid simulations.
+
+Runs a simulation (Langton, MajorityRule or VotingGame) under the SDL dummy
+video driver, drawing the grid to an off-screen surface every Nth
+generation, and saves the frames as a numbered PNG sequence or as an
+animated GIF or WebP file:
+
+FrameExporter class - encodes and writes frames on a pool of worker threads.
+
+The simulation thread only copies the pixels of each frame into a bounded
+queue. If the queue is full, the simulation waits for a free slot, or with
+the DROP policy the frame is dropped and counted, so memory use stays
+bounded however long the run is. Animations are written as PNG frames
+first, then joined into one file once the run is complete. Pillow is needed
+for GIF and WebP output, and is used for PNG output when available.
+
+Example:
+    python export.py Langton --generations 20000 --every 100 --output ant.gif
+    python export.py VotingGame --every 1000 --output frames/
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Waits for the queue by default, rather than
+                           dropping frames, and logs any dropped frames.
+                         - The off-screen window is sized to show the whole
+                           model grid, and a --window too small for it is
+                           an error, rather than cropping the frames.
+"""
+import argparse
+import glob
+import logging
+import math
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+
+# Run Pygame without opening a window. This must be set before Pygame is
+# imported.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# pylint: disable=wrong-import-position
+import pygame
+
+import cellstore
+import cli
+import langton
+import majorityrule
+import models
+import renderers
+import voting
+
+# Pillow is optional. It is needed for GIF and WebP output.
+try:
+    from PIL import Image
+
+    PILLOW = True
+except ModuleNotFoundError:
+    PILLOW = False
+
+# Simulations which can be exported: name, view class, model class and
+# default cell store
+SIMULATIONS = {
+    "Langton": (langton.Langton, models.LangtonModel, cellstore.CHUNKED),
+    "MajorityRule": (
+        majorityrule.MajorityRule,
+        models.MajorityRuleModel,
+        cellstore.LIST,
+    ),
+    "VotingGame": (voting.VotingGame, models.VotingModel, cellstore.LIST),
+}
+
+# Output formats, by file extension. Any other output path is a directory
+# for a PNG sequence.
+PNG = "png"
+GIF = "gif"
+WEBP = "webp"
+ANIMATIONS = {".gif": GIF, ".webp": WEBP}
+
+# Policies for frames submitted while the queue is full
+DROP = "drop"
+WAIT = "wait"
+
+# Name of each frame file in a PNG sequence
+FRAME_NAME = "frame_{:06d}.png"
+
+
+class FrameExporter:
+    """
+    Encode and write frames on a pool of worker threads.
+
+    submit() copies a surface's pixels into a queue of at most queue_size
+    frames. If the queue is full, it waits for a free slot, or if policy is
+    DROP, drops the frame and counts it in dropped. close() waits for every
+    queued frame to be written, joins an animation's frames into its output
+    file, and logs the number of frames dropped.
+    """
+
+    # Stop pylint complaining about the number of attributes:
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self, path, workers=2, queue_size=8, policy=WAIT, frame_time=50
+    ):
+        """
+        Start the worker threads.
+
+        path is a .gif or .webp file for an animation, with frame_time
+        milliseconds per frame, or otherwise a directory for a PNG sequence.
+        """
+        # pylint: disable=too-many-arguments
+        self.path = path
+        self.format = ANIMATIONS.get(os.path.splitext(path)[1].lower(), PNG)
+        if self.format != PNG and not PILLOW:
+            raise ValueError("GIF and WebP output needs Pillow")
+        self.policy = policy
+        self.frame_time = frame_time
+        if self.format == PNG:
+            self.directory = path
+            os.makedirs(path, exist_ok=True)
+        else:
+            # Animation frames are written to a temporary directory first.
+            self.directory = tempfile.mkdtemp(prefix="export_")
+
+        self.frames = 0
+        self.dropped = 0
+        # The last error raised by a worker, if any
+        self.error = None
+        self.queue = queue.Queue(queue_size)
+        self.workers = [
+            threading.Thread(target=self.run, daemon=True)
+            for _ in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, surface):
+        """
+        Queue a copy of a surface to be written as the next frame.
+
+        Returns False if the frame was dropped.
+        """
+        frame = (
+            self.frames,
+            surface.get_size(),
+            pygame.image.tostring(surface, "RGB"),
+        )
+        try:
+            self.queue.put(frame, block=self.policy == WAIT)
+        except queue.Full:
+            if not self.dropped:
+                logging.warning(
+                    "Dropping frames from %s: the encoder queue is full",
+                    self.path,
+                )
+            self.dropped += 1
+            return False
+        self.frames += 1
+        return True
+
+    def run(self):
+        """Write queued frames until told to stop. Runs on each worker."""
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                return
+            index, size, pixels = frame
+            path = os.path.join(self.directory, FRAME_NAME.format(index))
+            try:
+                if PILLOW:
+                    Image.frombytes("RGB", size, pixels).save(path)
+                else:
+                    pygame.image.save(
+                        pygame.image.fromstring(pixels, size, "RGB"), path
+                    )
+            except (OSError, ValueError, pygame.error) as error:
+                self.error = error
+                logging.error("Could not write frame %s: %s", index, error)
+
+    def close(self):
+        """Write every queued frame, and finish the output file."""
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        if self.format != PNG:
+            self.join_frames()
+            shutil.rmtree(self.directory)
+        if self.dropped:
+            logging.warning(
+                "%s frames of %s were dropped from %s",
+                self.dropped,
+                self.frames + self.dropped,
+                self.path,
+            )
+        if self.error:
+            raise self.error
+
+    def join_frames(self):
+        """Join the frames in the temporary directory into an animation."""
+        paths = sorted(glob.glob(os.path.join(self.directory, "*.png")))
+        if not paths:
+            return
+        # Load each frame only as it is added.
+        rest = (Image.open(path) for path in paths[1:])
+        with Image.open(paths[0]) as first:
+            first.save(
+                self.path,
+                save_all=True,
+                append_images=rest,
+                duration=self.frame_time,
+                loop=0,
+            )
+
+
+def fit_window(size, cell_size):
+    """
+    Return the smallest window size which shows a whole model grid.
+
+    The grid of a landscape sim.Grid fills 70% of the window width, and the
+    window height less its margins.
+    """
+    cols, rows = size
+    height = math.ceil(rows * cell_size) + 20
+    width = math.ceil(cols * cell_size / 0.7) + 1
+    return max(width, height), height
+
+
+def export(name, options):
+    """
+    Run a simulation, exporting every options.every generations.
+
+    The window is options.window, or by default just big enough to show the
+    whole model grid. Raises ValueError if the window cannot show it all.
+    Returns the FrameExporter, after it is closed.
+    """
+    view_class, model_class, store = SIMULATIONS[name]
+    random.seed(options.seed)
+    model = model_class(*options.size, options.store or store)
+    window = options.window or fit_window(options.size, options.cell_size)
+    # Draw to an off-screen surface, with no window.
+    surface = pygame.Surface(window)
+    view = view_class(
+        surface,
+        name,
+        model=model,
+        renderer=options.renderer,
+        cell_size=options.cell_size,
+    )
+    cols, rows = options.size
+    if view.cell_cols < cols or view.cell_rows < rows:
+        raise ValueError(
+            "A {}x{} window shows only {}x{} of the {}x{} cells at cell size "
+            "{}: use a larger --window, or a smaller --cell-size".format(
+                *window,
+                view.cell_cols,
+                view.cell_rows,
+                *options.size,
+                options.cell_size,
+            )
+        )
+    exporter = FrameExporter(
+        options.output,
+        workers=options.workers,
+        queue_size=options.queue,
+        policy=options.policy,
+        frame_time=options.frame_time,
+    )
+    try:
+        while True:
+            view.full_redraw = True
+            view.update_grid()
+            exporter.submit(surface.subsurface(view.grid))
+            if (
+                model.finished
+                or model.generation - 1 + options.every > options.generations
+            ):
+                break
+            model.run(options.every)
+    finally:
+        exporter.close()
+    return exporter
+
+
+def main():
+    """Export a simulation run."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("simulation", choices=list(SIMULATIONS))
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="a .gif or .webp file, or a directory for PNG frames",
+    )
+    parser.add_argument("--generations", type=int, default=10000)
+    parser.add_argument(
+        "--every", type=int, default=100, help="generations per frame"
+    )
+    parser.add_argument("--size", type=cli.parse_size, default=(128, 96))
+    parser.add_argument(
+        "--window",
+        type=cli.parse_size,
+        help="off-screen window size in pixels, as WIDTHxHEIGHT; by default "
+        "just big enough to show the whole grid",
+    )
+    parser.add_argument("--cell-size", type=float, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--store",
+        choices=list(cellstore.STORES),
+        help="cell store; by default chunked for Langton, otherwise list",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=[renderers.AUTO, renderers.RECT, renderers.SURFARRAY],
+        default=renderers.AUTO,
+    )
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--queue", type=int, default=8, help="most frames waiting to encode"
+    )
+    parser.add_argument(
+        "--policy",
+        choices=[WAIT, DROP],
+        default=WAIT,
+        help="wait, or drop frames, when the queue is full",
+    )
+    parser.add_argument(
+        "--frame-time", type=int, default=50, help="animation ms per frame"
+    )
+    options = parser.parse_args()
+
+    pygame.init()
+    try:
+        exporter = export(options.simulation, options)
+    except ValueError as error:
+        parser.error(str(error))
+    pygame.quit()
+    print(
+        "{} frames written to {}, {} dropped".format(
+            exporter.frames, options.output, exporter.dropped
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,630 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Hashlife: a memoized quadtree engine for deterministic grid rules.
+
+The grid is held as a quadtree of square nodes. Each node is 2 ** level
+cells wide, and is either a level 1 node of four cell values or a join of
+four smaller nodes. Nodes are hash-consed, so every distinct square of cells
+is held once however often it repeats, and the future of each node is
+memoized. A pattern which repeats in space or in time, such as a Langton's
+ant highway, is computed once and reused, so the grid can be run for
+astronomically large numbers of generations.
+
+This needs a deterministic rule, where each cell's next value depends only on
+its own value and those of its four neighbours, and where a cell of value 0
+with neighbours of value 0 stays 0:
+
+QuadTreeStore class - an unbounded cell store, held as a quadtree, which can
+                      be advanced by any number of generations of a rule.
+TurmiteRule class - a turmite (see turmites.py), as a rule for a
+                    QuadTreeStore. The ant is held in the value of the cell
+                    it is on.
+Node class - a node of the quadtree.
+
+The cells can be read and written like any other cellstore store, and
+region() copies a viewport of the quadtree into a NumPy array for rendering.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+import struct
+
+import turmites
+
+# NumPy is optional. It is needed by the region(), to_array() and
+# load_array() methods.
+try:
+    import numpy
+
+    NUMPY = True
+except ModuleNotFoundError:
+    NUMPY = False
+
+# Smallest level of the root node. The root node's children are always
+# nodes, rather than cell values.
+MIN_ROOT_LEVEL = 3
+# The memoized results and unused nodes are dropped once there are more than
+# this many nodes.
+MAX_NODES = 500000
+
+# Direction number of an ant moving into a cell from its north, east, south
+# and west neighbours. Directions are numbered as in models.DIRECTIONS.
+ENTERING = (1, 2, 3, 0)
+
+
+class Node:
+    """
+    A square of 2 ** level cells in a quadtree.
+
+    nw, ne, sw and se are the four quarters of the square, which are cell
+    values in a level 1 node and nodes of level - 1 otherwise. population is
+    the number of non-zero cells, and markers the number of cells with one
+    of the marker values of the store's rule.
+    """
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "markers")
+
+    def __init__(self, nw, ne, sw, se, marks):
+        """Create the node from its four quarters."""
+        # pylint: disable=too-many-arguments
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        if isinstance(nw, Node):
+            self.level = nw.level + 1
+            self.population = (
+                nw.population + ne.population + sw.population + se.population
+            )
+            self.markers = nw.markers + ne.markers + sw.markers + se.markers
+        else:
+            self.level = 1
+            self.population = (nw != 0) + (ne != 0) + (sw != 0) + (se != 0)
+            self.markers = (
+                (nw in marks) + (ne in marks) + (sw in marks) + (se in marks)
+            )
+
+
+class QuadTreeStore:
+    """
+    Unbounded cell storage, as a hash-consed quadtree.
+
+    Any x, y position can be used, including negative ones, and cells which
+    have never been set are 0. cols and rows are the nominal size of the
+    grid, used by to_array() and load_array(). The root node covers a square
+    with its top left cell at origin_x, origin_y, and grows as needed.
+
+    Set a rule with set_rule(), then run it with advance(). A rule has an
+    apply(centre, north, east, south, west) method, which returns the next
+    value of a cell, and a markers set of values. The positions of cells
+    holding marker values, such as a turmite's ant, can be found quickly
+    with find_markers().
+    """
+
+    # Cells can be used at any position
+    bounded = False
+
+    def __init__(self, cols, rows, value=0):
+        """Create the store with every cell set to value."""
+        self.cols = cols
+        self.rows = rows
+        self.rule = None
+        self.marks = frozenset()
+        self.max_nodes = MAX_NODES
+        self.reset()
+        if value:
+            self.fill(value)
+
+    def reset(self):
+        """Drop every node and memoized result, and empty the grid."""
+        # Every node, keyed by its four quarters
+        self.nodes = {}
+        # Memoized results of step(), keyed by (node, power)
+        self.results = {}
+        # Memoized (left, top, right, bottom) extents of populated nodes
+        self.extents = {}
+        # The empty node of each level. Level 0 is the cell value 0.
+        self.empties = [0]
+        self.root = self.empty(MIN_ROOT_LEVEL)
+        self.origin_x = -(1 << (MIN_ROOT_LEVEL - 1))
+        self.origin_y = -(1 << (MIN_ROOT_LEVEL - 1))
+
+    def join(self, nw, ne, sw, se):
+        """Return the unique node made of four quarters."""
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, self.marks)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level):
+        """Return the node of a level with every cell 0."""
+        while len(self.empties) <= level:
+            smaller = self.empties[-1]
+            self.empties.append(self.join(smaller, smaller, smaller, smaller))
+        return self.empties[level]
+
+    def set_rule(self, rule):
+        """Set the rule used by advance()."""
+        self.rule = rule
+        self.results = {}
+        marks = frozenset(rule.markers)
+        if marks != self.marks:
+            # Count the markers of every node again.
+            self.marks = marks
+            self.collect()
+
+    def collect(self):
+        """Drop every memoized result, and every node not in the grid."""
+        root = self.root
+        self.nodes = {}
+        self.results = {}
+        self.extents = {}
+        self.empties = [0]
+        self.root = self.rebuild(root, {})
+
+    def rebuild(self, node, copies):
+        """Return a copy of a node and its quarters, held by this store."""
+        if not isinstance(node, Node):
+            return node
+        copy = copies.get(id(node))
+        if copy is None:
+            copy = self.join(
+                self.rebuild(node.nw, copies),
+                self.rebuild(node.ne, copies),
+                self.rebuild(node.sw, copies),
+                self.rebuild(node.se, copies),
+            )
+            copies[id(node)] = copy
+        return copy
+
+    def expand(self):
+        """Double the size of the root node, keeping its cells centred."""
+        root = self.root
+        empty = self.empty(root.level - 1)
+        self.root = self.join(
+            self.join(empty, empty, empty, root.nw),
+            self.join(empty, empty, root.ne, empty),
+            self.join(empty, root.sw, empty, empty),
+            self.join(root.se, empty, empty, empty),
+        )
+        self.origin_x -= 1 << (root.level - 1)
+        self.origin_y -= 1 << (root.level - 1)
+
+    def padded(self):
+        """
+        Return True if every populated cell is in the centre of the root.
+
+        The centre is the middle quarter of the root node's width and
+        height, so there is a border of empty cells around it, each side
+        three eighths of the root's size.
+        """
+        root = self.root
+        return (
+            root.level > MIN_ROOT_LEVEL
+            and root.nw.population == root.nw.se.se.population
+            and root.ne.population == root.ne.sw.sw.population
+            and root.sw.population == root.sw.ne.ne.population
+            and root.se.population == root.se.nw.nw.population
+        )
+
+    def contains(self, x, y):
+        """Return True if the root node covers the cell at x, y."""
+        size = 1 << self.root.level
+        return (
+            0 <= x - self.origin_x < size and 0 <= y - self.origin_y < size
+        )
+
+    def __getitem__(self, pos):
+        """Return the value of the cell at pos (x, y)."""
+        x, y = pos
+        if not self.contains(x, y):
+            return 0
+        x -= self.origin_x
+        y -= self.origin_y
+        node = self.root
+        for level in range(node.level - 1, -1, -1):
+            half = 1 << level
+            if y < half:
+                node = node.ne if x >= half else node.nw
+            else:
+                node = node.se if x >= half else node.sw
+            x &= half - 1
+            y &= half - 1
+        return node
+
+    def __setitem__(self, pos, value):
+        """Set the value of the cell at pos (x, y)."""
+        x, y = pos
+        while not self.contains(x, y):
+            self.expand()
+        self.root = self.set_cell(
+            self.root, x - self.origin_x, y - self.origin_y, value
+        )
+
+    def set_cell(self, node, x, y, value):
+        """Return a copy of node with the cell at x, y in it set to value."""
+        if not isinstance(node, Node):
+            return value
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self.set_cell(nw, x, y, value)
+            else:
+                ne = self.set_cell(ne, x - half, y, value)
+        elif x < half:
+            sw = self.set_cell(sw, x, y - half, value)
+        else:
+            se = self.set_cell(se, x - half, y - half, value)
+        return self.join(nw, ne, sw, se)
+
+    def fill(self, value):
+        """Set every cell to 0, or every cell within cols x rows to value."""
+        self.reset()
+        if value:
+            self.load_array(
+                numpy.full((self.cols, self.rows), value, dtype=numpy.uint8)
+            )
+
+    def count(self):
+        """Return the number of non-zero cells."""
+        return self.root.population
+
+    def extent(self, node):
+        """
+        Return the (left, top, right, bottom) of the non-zero cells in node.
+
+        The positions are relative to the node's top left cell. Returns None
+        if every cell is 0.
+        """
+        if not isinstance(node, Node):
+            return (0, 0, 0, 0) if node else None
+        if not node.population:
+            return None
+        found = self.extents.get(node)
+        if found is None:
+            half = 1 << (node.level - 1)
+            parts = [
+                (self.extent(quarter), x, y)
+                for quarter, x, y in (
+                    (node.nw, 0, 0),
+                    (node.ne, half, 0),
+                    (node.sw, 0, half),
+                    (node.se, half, half),
+                )
+            ]
+            parts = [
+                (left + x, top + y, right + x, bottom + y)
+                for (left, top, right, bottom), x, y in (
+                    part for part in parts if part[0]
+                )
+            ]
+            found = (
+                min(part[0] for part in parts),
+                min(part[1] for part in parts),
+                max(part[2] for part in parts),
+                max(part[3] for part in parts),
+            )
+            self.extents[node] = found
+        return found
+
+    def bounds(self):
+        """
+        Return an (x, y, cols, rows) rectangle covering every non-zero cell.
+
+        Returns None if every cell is 0.
+        """
+        found = self.extent(self.root)
+        if not found:
+            return None
+        left, top, right, bottom = found
+        return (
+            self.origin_x + left,
+            self.origin_y + top,
+            right - left + 1,
+            bottom - top + 1,
+        )
+
+    def find_markers(self):
+        """Return a list of ((x, y), value) for every cell with a marker."""
+        found = []
+        pending = [(self.root, self.origin_x, self.origin_y)]
+        while pending:
+            node, x, y = pending.pop()
+            if not isinstance(node, Node):
+                if node in self.marks:
+                    found.append(((x, y), node))
+            elif node.markers:
+                half = 1 << (node.level - 1)
+                pending += [
+                    (node.nw, x, y),
+                    (node.ne, x + half, y),
+                    (node.sw, x, y + half),
+                    (node.se, x + half, y + half),
+                ]
+        return found
+
+    def region(self, x, y, cols, rows):
+        """Return a (cols, rows) uint8 NumPy array of cells from x, y."""
+        array = numpy.zeros((cols, rows), dtype=numpy.uint8)
+        pending = [(self.root, self.origin_x, self.origin_y)]
+        while pending:
+            node, left, top = pending.pop()
+            if not isinstance(node, Node):
+                array[left - x, top - y] = node
+                continue
+            size = 1 << node.level
+            if (
+                not node.population
+                or left >= x + cols
+                or top >= y + rows
+                or left + size <= x
+                or top + size <= y
+            ):
+                continue
+            half = size >> 1
+            if node.level == 1:
+                # Only the cells inside the region are added.
+                for quarter, qx, qy in (
+                    (node.nw, left, top),
+                    (node.ne, left + 1, top),
+                    (node.sw, left, top + 1),
+                    (node.se, left + 1, top + 1),
+                ):
+                    if quarter and x <= qx < x + cols and y <= qy < y + rows:
+                        pending.append((quarter, qx, qy))
+            else:
+                pending += [
+                    (node.nw, left, top),
+                    (node.ne, left + half, top),
+                    (node.sw, left, top + half),
+                    (node.se, left + half, top + half),
+                ]
+        return array
+
+    def to_array(self):
+        """Return a copy of the cells as a (cols, rows) uint8 NumPy array."""
+        return self.region(0, 0, self.cols, self.rows)
+
+    def load_array(self, array, x=0, y=0):
+        """
+        Copy the cells from a (cols, rows) NumPy array, with its top left
+        cell at x, y. Every other cell is set to 0.
+        """
+        self.reset()
+        cols, rows = array.shape
+        level = MIN_ROOT_LEVEL
+        while (1 << level) < max(cols, rows):
+            level += 1
+        square = numpy.zeros((1 << level, 1 << level), dtype=array.dtype)
+        square[:cols, :rows] = array
+        self.root = self.build(square.T.tolist(), 0, 0, level)
+        self.origin_x = x
+        self.origin_y = y
+
+    def build(self, lines, x, y, level):
+        """Return the node for a square of a list of lines of cells."""
+        if level == 1:
+            return self.join(
+                int(lines[y][x]),
+                int(lines[y][x + 1]),
+                int(lines[y + 1][x]),
+                int(lines[y + 1][x + 1]),
+            )
+        half = 1 << (level - 1)
+        if not any(
+            any(line[x : x + 2 * half]) for line in lines[y : y + 2 * half]
+        ):
+            return self.empty(level)
+        return self.join(
+            self.build(lines, x, y, level - 1),
+            self.build(lines, x + half, y, level - 1),
+            self.build(lines, x, y + half, level - 1),
+            self.build(lines, x + half, y + half, level - 1),
+        )
+
+    def advance(self, generations):
+        """Run the rule for a number of generations."""
+        if self.rule is None:
+            raise ValueError("A rule must be set before advancing")
+        while generations > 0:
+            # Step by the largest power of 2 generations that fits.
+            power = generations.bit_length() - 1
+            self.step_root(power)
+            generations -= 1 << power
+            if len(self.nodes) > self.max_nodes:
+                self.collect()
+
+    def step_root(self, power):
+        """Run the rule for 2 ** power generations."""
+        # A pattern can grow by at most one cell per generation, so pad the
+        # root with empty cells until the result holds the whole pattern.
+        while self.root.level < power + 3 or not self.padded():
+            self.expand()
+        shift = 1 << (self.root.level - 2)
+        self.root = self.step(self.root, power)
+        self.origin_x += shift
+        self.origin_y += shift
+        while self.root.level < MIN_ROOT_LEVEL:
+            self.expand()
+
+    def step(self, node, power):
+        """
+        Return the centre of a node, 2 ** power generations later.
+
+        The centre is the middle half of the node's width and height, a node
+        of level - 1. power can be at most level - 2, as the cells outside
+        the node can change the centre after that many generations.
+        """
+        if not node.population:
+            return self.empty(node.level - 1)
+        key = (node, power)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self.step_cells(node)
+        else:
+            join = self.join
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # The nine overlapping squares of half the node's size
+            squares = [
+                nw,
+                join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                join(nw.sw, nw.se, sw.nw, sw.ne),
+                join(nw.se, ne.sw, sw.ne, se.nw),
+                join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+            if power == node.level - 2:
+                # Two half steps, each of 2 ** (power - 1) generations
+                parts = [self.step(square, power - 1) for square in squares]
+            else:
+                # One step of 2 ** power generations, then take the centres
+                parts = [self.step(square, power) for square in squares]
+            quarters = [
+                join(parts[0], parts[1], parts[3], parts[4]),
+                join(parts[1], parts[2], parts[4], parts[5]),
+                join(parts[3], parts[4], parts[6], parts[7]),
+                join(parts[4], parts[5], parts[7], parts[8]),
+            ]
+            if power == node.level - 2:
+                quarters = [self.step(part, power - 1) for part in quarters]
+            else:
+                quarters = [self.centre(part) for part in quarters]
+            result = join(*quarters)
+        self.results[key] = result
+        return result
+
+    def centre(self, node):
+        """Return the centre of a node, with no generations run."""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def step_cells(self, node):
+        """Return the centre 2 x 2 cells of a level 2 node, one step later."""
+        apply = self.rule.apply
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        return self.join(
+            apply(nw.se, nw.ne, ne.sw, sw.ne, nw.sw),
+            apply(ne.sw, ne.nw, ne.se, se.nw, nw.se),
+            apply(sw.ne, nw.se, se.nw, sw.se, sw.nw),
+            apply(se.nw, ne.sw, se.ne, se.sw, sw.ne),
+        )
+
+    def to_bytes(self):
+        """
+        Return the quadtree as bytes, for checkpoints.
+
+        Each distinct node is written once: a text line with the root level,
+        origin and node count, then the level of each node, then the four
+        quarters of each node, as cell values for level 1 nodes and as the
+        index of an earlier node otherwise.
+        """
+        order = {}
+        levels = bytearray()
+        quarters = []
+
+        def add(node):
+            """Add a node, after its quarters."""
+            if node in order:
+                return order[node]
+            if node.level == 1:
+                quarters.extend((node.nw, node.ne, node.sw, node.se))
+            else:
+                indexes = [
+                    add(quarter)
+                    for quarter in (node.nw, node.ne, node.sw, node.se)
+                ]
+                quarters.extend(indexes)
+            order[node] = len(order)
+            levels.append(node.level)
+            return order[node]
+
+        add(self.root)
+        header = "{} {} {}\n".format(
+            self.origin_x, self.origin_y, len(levels)
+        ).encode("ascii")
+        return header + bytes(levels) + struct.pack(
+            "<{}Q".format(len(quarters)), *quarters
+        )
+
+    def load_bytes(self, data):
+        """Replace the quadtree with one from to_bytes()."""
+        self.reset()
+        end = data.index(b"\n")
+        origin_x, origin_y, count = (
+            int(value) for value in data[:end].split()
+        )
+        levels = data[end + 1 : end + 1 + count]
+        quarters = struct.unpack_from(
+            "<{}Q".format(4 * count), data, end + 1 + count
+        )
+        nodes = []
+        for index, level in enumerate(levels):
+            parts = quarters[4 * index : 4 * index + 4]
+            if level > 1:
+                parts = [nodes[part] for part in parts]
+            nodes.append(self.join(*parts))
+        self.root = nodes[-1]
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+
+
+class TurmiteRule:
+    """
+    A turmite, as a rule for a QuadTreeStore.
+
+    A cell without the ant holds its color. The cell the ant is on holds
+    encode(color, direction, state). Only one ant is supported, as two ants
+    moving into the same cell would collide.
+    """
+
+    def __init__(self, rule):
+        """Create the rule for a turmites.Rule."""
+        self.rule = rule
+        self.colors = rule.colors
+        self.transitions = rule.transitions
+        # Every value of a cell with the ant on it
+        self.markers = range(
+            self.colors,
+            self.colors * (1 + rule.states * turmites.DIRECTION_COUNT),
+        )
+
+    def encode(self, color, direction, state):
+        """Return the value of a cell with the ant on it."""
+        return self.colors * (
+            1 + state * turmites.DIRECTION_COUNT + direction
+        ) + color
+
+    def decode(self, value):
+        """Return the (color, direction, state) of a cell with the ant."""
+        ant, color = divmod(value, self.colors)
+        state, direction = divmod(ant - 1, turmites.DIRECTION_COUNT)
+        return color, direction, state
+
+    def apply(self, centre, north, east, south, west):
+        """Return the next value of a cell."""
+        # pylint: disable=too-many-arguments
+        colors = self.colors
+        color = centre % colors
+        for value, direction in zip((north, east, south, west), ENTERING):
+            if value >= colors:
+                state, ant_direction = divmod(
+                    value // colors - 1, turmites.DIRECTION_COUNT
+                )
+                if ant_direction == direction:
+                    # The ant moves into this cell.
+                    new_color, direction, state = self.transitions[
+                        (state * colors + color) * turmites.DIRECTION_COUNT
+                        + direction
+                    ]
+                    return self.encode(new_color, direction, state)
+        # Any ant on this cell moves out of it.
+        return color
@@ -25,9 +25,26 @@ Simulatine, 31 May, 2020 - Updates:
                          - Added an icon image for the window title bar.
 Simulatine, 01 Jun, 2020 - Separated Grid class and generic variables into a
                            module sim.py for reuse with other simulations.
+Simulatine, 18 Oct, 2026 - Moved the ant's state and movement rules into
+                           models.LangtonModel.
+                         - Only the changed areas of the display are updated.
+                         - Cells are drawn by the grid's renderer.
+                         - Draws the cells updated by every generation run
+                           in the frame, to support Turbo mode.
+                         - Dashboard fields are only redrawn when changed.
+                         - The ant walks on an unbounded chunked grid, and
+                           the viewport follows it.
+                         - The ant is drawn as a renderer marker.
+                         - The ant can follow any turmites rule, given on the
+                           command line, with a color for each cell state.
+                         - The game is checkpointed every few minutes and
+                           when it ends, and resumes from the checkpoint.
 """
 # Import Pygame, either standard version or SDL2 version depending on the
 # platform.
+import functools
+import sys
+
 try:
     import pygame_sdl2  # pylint: disable=import-error
 
@@ -37,160 +54,102 @@ except ModuleNotFoundError:
     PYGAME_SDL2 = False
 import pygame
 
+import cellstore
+import models
 import sim
+import turmites
 
 
 class Langton(sim.Grid):
-    """Langton's Ant simulation."""
-
-    # Stop pylint complaining about the number of attributes:
-    # pylint: disable=too-many-instance-attributes
-    def __init__(self, win, title):
-        """Initialise the simulation."""
-        # First, call the parent class __init__() method.
-        super().__init__(win, title)
-
-        # Game parameters
-        self.updated_cells = []
-        self.ant_x = int(self.cell_cols / 2)
-        self.ant_y = int(self.cell_rows / 2)
-        self.ant_init_x = self.ant_x
-        self.ant_init_y = self.ant_y
-        self.ant_direction = sim.LEFT
-        self.out_of_bounds = False
-
-        # Ant movement (x and y values for each direction)
-        self.dirs = {
-            sim.LEFT: [-1, 0],
-            sim.RIGHT: [1, 0],
-            sim.UP: [0, -1],
-            sim.DOWN: [0, 1],
-        }
-
-        # Value to increment population in the move_ant() method.
-        # Increase the population by 1 if we switch a cell to True
-        # Decrease the population by 1 if we switch a cell to False
-        self.update_population = {True: +1, False: -1}
-
-    def update(self):
-        """Update the simulation by one generation."""
-        if self.paused:
-            # The simulation is paused. Display an appropriate message.
-            self.update_dashboard("Paused")
-        elif self.out_of_bounds:
-            # The ant has moved off screen. Display an appropriate message.
-            self.update_dashboard("Completed")
-        else:
-            # The simulation is proceeding normally.
-            self.updated_cells = []
-            self.move_ant()
-            if not self.out_of_bounds:
-                self.update_grid()
-                self.update_ant()
-                self.update_dashboard()
-                self.update_langton_dashboard()
-                self.generation += 1
-                # Update the Pygame clock once per game loop.
-                self.clock.tick()
-
-    def move_ant(self):
-        """Update the ant's position."""
-        # Record the current position and its value
-        self.updated_cells.append([self.ant_x, self.ant_y])
-
-        # Move the ant in its current direction
-        self.ant_x += self.dirs[self.ant_direction][0]
-        self.ant_y += self.dirs[self.ant_direction][1]
-
-        # Check whether the new ant position is off screen.
-        if (
-            self.ant_x < 0
-            or self.ant_x >= self.cell_cols
-            or self.ant_y < 0
-            or self.ant_y >= self.cell_rows
-        ):
-            self.out_of_bounds = True
-            return
-
-        # Check the color of the new cell:
-        if self.cells[self.ant_x][self.ant_y]:
-            # Cell is On (True).
-            # Turn counter-clockwise
-            index = sim.DIRECTIONS.index(self.ant_direction)
-            index = (index - 1) % len(sim.DIRECTIONS)
-            self.ant_direction = sim.DIRECTIONS[index]
-        else:
-            # Cell is Off (False).
-            # Turn clockwise
-            index = sim.DIRECTIONS.index(self.ant_direction)
-            index = (index + 1) % len(sim.DIRECTIONS)
-            self.ant_direction = sim.DIRECTIONS[index]
-
-        # Flip the value of the new cell
-        new_cell_value = not self.cells[self.ant_x][self.ant_y]
-        self.cells[self.ant_x][self.ant_y] = new_cell_value
-        self.population += self.update_population[new_cell_value]
-        # Record the new position and its value
-        self.updated_cells.append([self.ant_x, self.ant_y])
+    """
+    Langton's Ant simulation.
+
+    The ant walks on an unbounded grid, starting in the centre of the
+    viewport. While the ant is in view, the viewport follows it. Set rule to
+    use a different turmites rule for new models.
+    """
+
+    # Turmite rule for new models
+    rule = turmites.LANGTON
+    # Set to True when the ant was drawn in the viewport
+    ant_visible = True
+
+    @property
+    def palette(self):
+        """Return the cell colors for the model's rule."""
+        return rule_palette(self.model.rule.colors)
+
+    def create_model(self):
+        """Create the Langton's Ant model to fit the grid."""
+        return models.LangtonModel(
+            *self.grid_size, store=cellstore.CHUNKED, rule=self.rule
+        )
 
     def update_ant(self):
         """Draw the ant on the main grid."""
-        # Make the cell_rect one pixel smaller than the actual grid size in all
-        # directions, to prevent drawing over the grid lines.
-        cell_x = self.margin_x + self.ant_x * self.cell_size + 1
-        cell_y = self.margin_y + self.ant_y * self.cell_size + 1
-        cell_rect = pygame.Rect(
-            cell_x, cell_y, self.cell_size - 1, self.cell_size - 1
+        if self.model.out_of_bounds:
+            # The ant has left the grid, so there is nothing to draw.
+            return
+
+        self.ant_visible = self.is_visible(self.model.ant_x, self.model.ant_y)
+        self.renderer.draw_markers(
+            [[self.model.ant_x, self.model.ant_y]], sim.RED
         )
-        pygame.draw.rect(self.win, sim.RED, cell_rect)
 
     def update_grid(self):
         """Draw the current state of the main grid."""
-        # This version only draws the two changed cells, so is much faster
-        # than iterating across the entire grid.
-        for cell in self.updated_cells:
-            x = cell[0]
-            y = cell[1]
-            value = self.cells[x][y]
-            # Make the cell_rect one pixel smaller than the actual grid
-            # size in all directions, to prevent drawing over the grid
-            # lines.
-            cell_x = self.margin_x + x * self.cell_size + 1
-            cell_y = self.margin_y + y * self.cell_size + 1
-            cell_rect = pygame.Rect(
-                cell_x, cell_y, self.cell_size - 1, self.cell_size - 1
-            )
-            if value:
-                # Cell is On (True).
-                # Fill the cell.
-                pygame.draw.rect(self.win, sim.WHITE, cell_rect)
-            else:
-                # Cell is Off (False).
-                # Leave the cell unfilled.
-                pygame.draw.rect(self.win, sim.BGCOLOR, cell_rect)
-
-    def update_langton_dashboard(self):
+        if (
+            not self.bounded
+            and self.ant_visible
+            and not self.is_visible(self.model.ant_x, self.model.ant_y)
+        ):
+            # The ant has walked out of the viewport, so bring it back into
+            # the centre. If the viewport was panned away from the ant, leave
+            # it where it is.
+            self.centre_on(self.model.ant_x, self.model.ant_y)
+        super().update_grid()
+        self.update_ant()
+
+    def update_dashboard(self, msg=None):
         """Update the dashboard display with status for the simulation."""
+        # First, display the standard dashboard items.
+        super().update_dashboard(msg)
+
         # Display the ant's X position
-        self.draw_text(
-            "Ant X: {:>5}".format(self.ant_x - self.ant_init_x),
-            sim.TEXTCOLOR,
-            sim.BGCOLOR,
+        self.draw_field(
+            "Ant X",
+            "Ant X: {:>5}".format(self.model.ant_x - self.model.ant_init_x),
             self.dashboard.left + self.dash_pos_x,
             self.dashboard.top + self.dash_pos_y,
         )
         # Display the ant's Y position
-        self.draw_text(
-            "Ant Y: {:>5}".format(self.ant_y - self.ant_init_y),
-            sim.TEXTCOLOR,
-            sim.BGCOLOR,
+        self.draw_field(
+            "Ant Y",
+            "Ant Y: {:>5}".format(self.model.ant_y - self.model.ant_init_y),
             self.dashboard.left + self.dash_pos_x + self.dash_offset_x,
             self.dashboard.top + self.dash_pos_y + self.dash_offset_y,
         )
 
 
+@functools.lru_cache()
+def rule_palette(colors):
+    """Return cell colors for a rule: black, white, then a spread of hues."""
+    palette = [sim.BGCOLOR, sim.WHITE]
+    for color in range(2, colors):
+        hue = pygame.Color(0)
+        hue.hsva = (360 * (color - 2) / (colors - 2), 100, 100, 100)
+        palette.append(hue)
+    return palette[:colors]
+
+
 def main():
-    """Initialise the game and call the main game loop."""
+    """
+    Initialise the game and call the main game loop.
+
+    A turmites rule, such as LLRR, can be given on the command line.
+    """
+    if len(sys.argv) > 1:
+        Langton.rule = sys.argv[1]
     title = "Langton's Ant"
     # Initialise logging
     sim.config_logging(title)
@@ -202,36 +161,25 @@ def main():
     # Android tablet screen size
     # display_surface = start_pygame(600, 976, title)
 
-    run_game(display_surface, title)
-
-
-def run_game(display_surface, title):
-    """Execute the main game loop."""
-    simulation = Langton(display_surface, title)
-    simulation.draw_buttons()
-    pygame.display.update()
-    while True:
-        # Handle events
-        action = sim.check_user_input(
-            simulation.buttons, simulation.keyboard_actions
-        )
-        if action:
-            # Process the requested action
-            if action == sim.QUIT:
-                # End the simulation
-                sim.end_pygame()
-            elif action == sim.PAUSE:
-                # Toggled the paused state
-                simulation.paused = not simulation.paused
-            else:
-                # No specific simulation action required for any other input
-                pass
-
-        # Update the game position
-        simulation.update()
-        # Update the display
-        pygame.display.update()
-        # CLOCK.tick(simulation.frames_per_second)
+    # A rule on the command line starts a new game.
+    run_game(display_surface, title, resume=len(sys.argv) <= 1)
+
+
+def run_game(display_surface, title, resume=True):
+    """
+    Execute the main game loop.
+
+    The game is checkpointed as it runs. If resume is True, it carries on
+    from the last checkpoint, if there is one.
+    """
+    path = sim.checkpoint_file(title)
+    simulation = Langton(
+        display_surface,
+        title,
+        model=sim.resume_model(path) if resume else None,
+        checkpoint_path=path,
+    )
+    sim.game_loop(simulation)
 
 
 if __name__ == "__main__":
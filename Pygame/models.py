@@ -0,0 +1,1077 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Simulation models.
+
+Contains the state and update rules of each simulation, with no dependency on
+Pygame. A model can be stepped as fast as Python allows in a batch job, and a
+Pygame sim.Grid view attached to it only when someone is watching:
+
+Model class - a generic grid model, which only counts generations.
+LangtonModel class - Langton's Ant, or any other turmite rule.
+ColonyModel class - a colony of Langton's Ants, stepped together with NumPy.
+MajorityRuleModel class - Majority Rule voting cellular automata.
+VotingModel class - Voting Game cellular automata.
+
+Simulatine, 18 Oct, 2026 - Initial version. Split out of the Grid, Langton,
+                           MajorityRule and VotingGame classes.
+                         - Cells are held in a pluggable cellstore store,
+                           indexed as cells[x, y].
+                         - Langton's ant can walk indefinitely on an
+                           unbounded cellstore.ChunkedStore.
+                         - LangtonModel.run() detects periodic highways, and
+                           jumps ahead by whole periods.
+                         - Added ColonyModel, for thousands of ants.
+                         - LangtonModel runs any turmites rule, from a
+                           precomputed transition table. Directions are
+                           numbered, as indexes into DIRECTIONS.
+                         - LangtonModel.run() uses the memoized macro-steps
+                           of a hashlife.QuadTreeStore.
+                         - VotingModel and MajorityRuleModel have a sweep
+                           mode, which updates a whole sublattice of cells
+                           at a time with NumPy.
+                         - MajorityRuleModel keeps a count of each cell's
+                           neighbors with the value 1, updated when a cell
+                           changes.
+                         - VotingModel and MajorityRuleModel have an events
+                           mode, which picks only from the cells which can
+                           change, and skips the generations between.
+                         - VotingModel and MajorityRuleModel finish, and
+                           record frozen_generation, when no cell can change
+                           any more.
+                         - VotingModel and MajorityRuleModel draw their
+                           random numbers in batches from their own seeded
+                           rng.RandomStream.
+                         - VotingModel and MajorityRuleModel can keep
+                           domain and interface statistics up to date, with
+                           a domains.DomainTracker.
+"""
+import math
+import random
+
+import activeset
+import cellstore
+import domains
+import hashlife
+import rng
+import turmites
+
+# NumPy is optional. It is needed by the ColonyModel, and for sweep mode.
+try:
+    import numpy
+
+    NUMPY = True
+except ModuleNotFoundError:
+    NUMPY = False
+
+# Cardinal directions in clockwise order. These match the user actions of the
+# same name in sim.py.
+UP = "Up"
+DOWN = "Down"
+LEFT = "Left"
+RIGHT = "Right"
+DIRECTIONS = [RIGHT, DOWN, LEFT, UP]
+# Movement (x and y values) for each direction number, an index in DIRECTIONS
+DX = (1, 0, -1, 0)
+DY = (0, 1, 0, -1)
+# The eight neighbors of a cell, as x and y offsets
+NEIGHBORS = [
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+]
+# Majority Rule: a cell's new value for each number of neighbors with the
+# value 1, or None to keep its value on a tie
+MAJORITY = (0, 0, 0, 0, None, 1, 1, 1, 1)
+
+# Langton's ant highway detection. While running, the ant's path is traced
+# for 2 x MAX_PERIOD generations, and checked for a repeating pattern. The
+# first check is after HIGHWAY_CHECK_INTERVAL generations, and the interval
+# doubles after each failed check, up to MAX_CHECK_INTERVAL.
+HIGHWAY_CHECK_INTERVAL = 10000
+MAX_CHECK_INTERVAL = 1000000
+MAX_PERIOD = 2500
+
+
+class Model:
+    """
+    Generic grid model.
+
+    Holds the cells, generation count and population of a simulation. The
+    cells are held in a cellstore store, using the named storage backend, and
+    are indexed as cells[x, y]. After each generation, updated_cells lists
+    the [x, y] positions which need to be redrawn by any attached view.
+    """
+
+    # The generation at which the model reached a state which it can never
+    # leave, such as a consensus or a frozen grid, if it has
+    frozen_generation = None
+
+    def __init__(self, cell_cols, cell_rows, store=cellstore.LIST):
+        """Initialise the model."""
+        self.cell_cols = cell_cols
+        self.cell_rows = cell_rows
+        self.store = store
+
+        self.generation = 1
+        self.population = 0
+        # Set to True once the simulation can make no further progress.
+        self.finished = False
+
+        self.cells = None
+        self.updated_cells = []
+        self.create_cells()
+
+    def create_cells(self):
+        """Create the initial game grid, with every cell Off."""
+        self.cells = cellstore.create_store(
+            self.store, self.cell_cols, self.cell_rows
+        )
+
+    def update_simulation(self):
+        """Update the simulation by one generation.
+
+        This is the default class method and just refreshes the generation
+        count. A more detailed update method should be created in each child
+        class.
+        """
+        self.generation += 1
+
+    def run(self, generations):
+        """
+        Run the simulation for a number of generations, without display.
+
+        Stops early if the simulation finishes, and returns the number of
+        generations actually run.
+        """
+        for count in range(generations):
+            if self.finished:
+                return count
+            self.update_simulation()
+        return generations
+
+
+class LangtonModel(Model):
+    """
+    Langton's Ant simulation.
+
+    The ant can follow any turmites rule, such as a multi-color rule string
+    like "LLRR", or a full turmite state table. See turmites.py. The
+    population is the number of cells with a non-zero color.
+    """
+
+    # Stop pylint complaining about the number of attributes:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self, cell_cols, cell_rows, store=cellstore.LIST, rule=turmites.LANGTON
+    ):
+        """
+        Initialise the simulation.
+
+        The ant starts in the centre of the cell_cols x cell_rows grid. With
+        a bounded store, the simulation is complete once the ant leaves the
+        grid. With an unbounded store, such as cellstore.CHUNKED, the ant
+        can walk indefinitely.
+        """
+        # First, call the parent class __init__() method.
+        super().__init__(cell_cols, cell_rows, store)
+
+        self.rule = turmites.Rule(rule)
+        if self.rule.colors > 2 and store == cellstore.PACKED:
+            raise ValueError("The packed cell store only holds two colors")
+
+        # Game parameters
+        self.ant_x = int(self.cell_cols / 2)
+        self.ant_y = int(self.cell_rows / 2)
+        self.ant_init_x = self.ant_x
+        self.ant_init_y = self.ant_y
+        # The ant's direction number, and its turmite state
+        self.ant_direction = DIRECTIONS.index(LEFT)
+        self.ant_state = 0
+        self.out_of_bounds = False
+
+        # Set to False to stop run() jumping ahead along highways.
+        self.fast_forward = True
+        self.check_interval = HIGHWAY_CHECK_INTERVAL
+        # Once found, the (period, dx, dy) of the ant's highway
+        self.highway = None
+
+    def update_simulation(self):
+        """Update the simulation by one generation."""
+        self.updated_cells = []
+        self.move_ant()
+        if self.out_of_bounds:
+            # The ant has moved off the grid, so the simulation is complete.
+            self.finished = True
+        else:
+            self.generation += 1
+
+    def move_ant(self):
+        """Update the ant's position."""
+        # Record the current position and its value
+        self.updated_cells.append([self.ant_x, self.ant_y])
+
+        # Move the ant in its current direction
+        self.ant_x += DX[self.ant_direction]
+        self.ant_y += DY[self.ant_direction]
+
+        # Check whether the new ant position is off the grid.
+        if self.cells.bounded and (
+            self.ant_x < 0
+            or self.ant_x >= self.cell_cols
+            or self.ant_y < 0
+            or self.ant_y >= self.cell_rows
+        ):
+            self.out_of_bounds = True
+            return
+
+        # Look up the new color, direction and state for the ant's state and
+        # direction, and the color of the new cell.
+        color = self.cells[self.ant_x, self.ant_y]
+        rule = self.rule
+        new_color, self.ant_direction, self.ant_state = rule.transitions[
+            (self.ant_state * rule.colors + color) * turmites.DIRECTION_COUNT
+            + self.ant_direction
+        ]
+        self.cells[self.ant_x, self.ant_y] = new_color
+        self.population += (new_color != 0) - (color != 0)
+        # Record the new position and its value
+        self.updated_cells.append([self.ant_x, self.ant_y])
+
+    def run(self, generations):
+        """
+        Run the simulation for a number of generations, without display.
+
+        On an unbounded store with stripes, such as cellstore.CHUNKED, the
+        ant's path is checked for a repeating highway as it runs. Once one
+        is proven, the ant jumps ahead by as many whole periods as fit in
+        the remaining generations, and the highway is written as a single
+        cellstore.Stripe. This needs a rule string, where each visit adds 1
+        to a cell's color, rather than a turmite state table.
+
+        On a hashlife.QuadTreeStore, any turmite rule is run by the store's
+        memoized macro-steps instead.
+        """
+        if self.fast_forward and hasattr(self.cells, "advance"):
+            return self.run_quadtree(generations)
+        if (
+            not self.fast_forward
+            or not self.rule.cycles
+            or not hasattr(self.cells, "add_stripe")
+        ):
+            return super().run(generations)
+
+        done = 0
+        while done < generations and not self.finished:
+            done += super().run(min(self.check_interval, generations - done))
+            if generations - done > 2 * MAX_PERIOD:
+                path = self.trace(2 * MAX_PERIOD)
+                done += len(path)
+                skipped = self.jump(path, generations - done)
+                if not skipped:
+                    self.check_interval = min(
+                        self.check_interval * 2, MAX_CHECK_INTERVAL
+                    )
+                done += skipped
+        return done
+
+    def run_quadtree(self, generations):
+        """
+        Run a number of generations on a hashlife.QuadTreeStore.
+
+        The ant is written into the cell it is on while the store advances,
+        then read back out of it.
+        """
+        cells = self.cells
+        if cells.rule is None or cells.rule.rule is not self.rule:
+            cells.set_rule(hashlife.TurmiteRule(self.rule))
+        rule = cells.rule
+        cells[self.ant_x, self.ant_y] = rule.encode(
+            cells[self.ant_x, self.ant_y], self.ant_direction, self.ant_state
+        )
+        cells.advance(generations)
+        [((self.ant_x, self.ant_y), value)] = cells.find_markers()
+        color, self.ant_direction, self.ant_state = rule.decode(value)
+        cells[self.ant_x, self.ant_y] = color
+        self.population = cells.count()
+        self.generation += generations
+        self.updated_cells = []
+        return generations
+
+    def trace(self, generations):
+        """
+        Run up to a number of generations, recording the ant's path.
+
+        Returns a list with an (x, y, direction, state, value) tuple for each
+        generation: the cell the ant moved to, the direction it was facing
+        and its state before the move, and the value it found in the cell.
+        """
+        path = []
+        for _ in range(generations):
+            if self.finished:
+                break
+            direction = self.ant_direction
+            x = self.ant_x + DX[direction]
+            y = self.ant_y + DY[direction]
+            path.append((x, y, direction, self.ant_state, self.cells[x, y]))
+            self.update_simulation()
+        return path
+
+    @staticmethod
+    def find_period(path):
+        """
+        Return the (period, dx, dy) of a pattern repeated along the path.
+
+        Every step of the path, after its first period, must repeat the step
+        one period before it, moved by the same non-zero distance dx, dy.
+        Returns None if there is no such period.
+        """
+        end = len(path) - 1
+        for period in range(1, len(path) // 2):
+            dx = path[end][0] - path[end - period][0]
+            dy = path[end][1] - path[end - period][1]
+            if (dx, dy) == (0, 0):
+                continue
+            if all(
+                path[i][2:] == path[i - period][2:]
+                and path[i][0] - path[i - period][0] == dx
+                and path[i][1] - path[i - period][1] == dy
+                for i in range(end, period - 1, -1)
+            ):
+                return period, dx, dy
+        return None
+
+    def jump(self, path, generations):
+        """
+        Jump ahead along a highway at the end of the ant's path.
+
+        Checks that the last period of the path will repeat for as many whole
+        periods as fit in generations, and if so writes them as a stripe and
+        moves the ant to the end of it. Returns the number of generations
+        skipped, which is 0 if the path does not end in a highway.
+        """
+        found = self.find_period(path)
+        if not found:
+            return 0
+        period, dx, dy = found
+        periods = generations // period
+        if not periods:
+            return 0
+
+        # Count the visits to each cell during the last period, and the value
+        # first found in each, relative to the ant's position at its start.
+        start_x, start_y = path[-period - 1][:2]
+        visits = {}
+        first_values = {}
+        for x, y, _, _, value in path[-period:]:
+            offset = (x - start_x, y - start_y)
+            first_values.setdefault(offset, value)
+            visits[offset] = visits.get(offset, 0) + 1
+        if not self.check_highway(dx, dy, periods, visits, first_values):
+            return 0
+
+        population = self.cells.count()
+        self.cells.add_stripe(
+            cellstore.Stripe(
+                self.ant_x,
+                self.ant_y,
+                dx,
+                dy,
+                periods,
+                visits,
+                self.rule.colors,
+            )
+        )
+        self.population += self.cells.count() - population
+        self.ant_x += periods * dx
+        self.ant_y += periods * dy
+        self.generation += periods * period
+        self.updated_cells = []
+        self.highway = found
+        return periods * period
+
+    def check_highway(self, dx, dy, periods, visits, first_values):
+        """
+        Check that the ant will repeat a period of its path.
+
+        The period starts from the ant's current position and direction, and
+        moves dx, dy each time. It repeats as long as the cells it visits hold
+        first_values, relative to the start of each period, when they are
+        first visited. Those cells are either still as they are now, or were
+        last changed by the visits of earlier repeats. Once the repeats are
+        clear of every cell in use, and of the visits of all earlier repeats
+        which overlap them, every further repeat finds the same values, so
+        only the repeats up to that point need to be checked.
+        """
+        # pylint: disable=too-many-arguments, too-many-locals
+        offsets_x = [ox for ox, oy in first_values]
+        offsets_y = [oy for ox, oy in first_values]
+
+        def clear_after(position, low, high, step, used_low, used_high):
+            """Return the first repeat clear of the used cells on one axis."""
+            low += position
+            high += position
+            if step > 0:
+                return max(0, (used_high - low) // step + 1)
+            if step < 0:
+                return max(0, (high - used_low) // -step + 1)
+            if high < used_low or low > used_high:
+                return 0
+            return periods
+
+        used_x, used_y, used_cols, used_rows = self.cells.bounds()
+        clear = min(
+            clear_after(
+                self.ant_x,
+                min(offsets_x),
+                max(offsets_x),
+                dx,
+                used_x,
+                used_x + used_cols - 1,
+            ),
+            clear_after(
+                self.ant_y,
+                min(offsets_y),
+                max(offsets_y),
+                dy,
+                used_y,
+                used_y + used_rows - 1,
+            ),
+        )
+        # The number of earlier repeats whose visits can overlap a repeat
+        span = max(
+            max(offsets_x) - min(offsets_x), max(offsets_y) - min(offsets_y)
+        )
+        overlap = max(
+            n
+            for n in range(span // max(abs(dx), abs(dy)) + 1)
+            if n == 0
+            or any(
+                (ox + n * dx, oy + n * dy) in visits for ox, oy in first_values
+            )
+        )
+
+        for repeat in range(min(periods - 1, max(clear, overlap)) + 1):
+            x = self.ant_x + repeat * dx
+            y = self.ant_y + repeat * dy
+            for (ox, oy), value in first_values.items():
+                earlier_visits = sum(
+                    visits.get((ox + n * dx, oy + n * dy), 0)
+                    for n in range(1, min(repeat, overlap) + 1)
+                )
+                color = self.cells[x + ox, y + oy] + earlier_visits
+                if color % self.rule.colors != value:
+                    return False
+        return True
+
+
+class ColonyModel(Model):
+    """
+    A colony of Langton's Ants.
+
+    Each ant follows the Langton's Ant rules, on a grid whose edges wrap
+    around. The ants' positions and directions are held in NumPy arrays, and
+    every ant is moved in each generation by a few whole-array operations.
+
+    The ants only interact through the cells. Within a generation the ants
+    take turns in index order, so when several ants move onto the same cell,
+    the first ant finds the cell's value from the previous generation, the
+    next ant finds it flipped by the first ant, and so on.
+    """
+
+    def __init__(
+        self, cell_cols, cell_rows, store=cellstore.ARRAY, ants=1000
+    ):
+        """
+        Initialise the simulation.
+
+        The ants start at random positions and in random directions. The
+        store must be cellstore.ARRAY.
+        """
+        if not NUMPY:
+            raise ModuleNotFoundError("The ant colony needs NumPy")
+        if store != cellstore.ARRAY:
+            raise ValueError("The ant colony needs the array cell store")
+        super().__init__(cell_cols, cell_rows, store)
+
+        # Each ant's position, and the index of its direction in DIRECTIONS
+        self.ant_x = numpy.array(
+            [random.randrange(cell_cols) for _ in range(ants)],
+            dtype=numpy.intp,
+        )
+        self.ant_y = numpy.array(
+            [random.randrange(cell_rows) for _ in range(ants)],
+            dtype=numpy.intp,
+        )
+        self.ant_direction = numpy.array(
+            [random.randrange(len(DIRECTIONS)) for _ in range(ants)],
+            dtype=numpy.intp,
+        )
+        self.dx = numpy.array(DX, dtype=numpy.intp)
+        self.dy = numpy.array(DY, dtype=numpy.intp)
+
+    def update_simulation(self):
+        """Update the simulation by one generation."""
+        self.move_ants()
+        self.generation += 1
+
+    def move_ants(self):
+        """Move every ant one step, then turn it and flip its new cell."""
+        old_x = self.ant_x
+        old_y = self.ant_y
+        self.ant_x = (old_x + self.dx[self.ant_direction]) % self.cell_cols
+        self.ant_y = (old_y + self.dy[self.ant_direction]) % self.cell_rows
+
+        # Sort the ants by cell, keeping index order within each cell, and
+        # number the ants on each cell from 0.
+        flat_cells = self.cells.array.reshape(-1)
+        cell_index = self.ant_x * self.cell_rows + self.ant_y
+        order = numpy.argsort(cell_index, kind="stable")
+        sorted_index = cell_index[order]
+        starts = numpy.flatnonzero(
+            numpy.concatenate(([True], sorted_index[1:] != sorted_index[:-1]))
+        )
+        group_sizes = numpy.diff(numpy.append(starts, len(order)))
+        turn = numpy.arange(len(order)) - numpy.repeat(starts, group_sizes)
+
+        # Each ant finds its cell flipped once by each ant before it.
+        values = numpy.empty_like(order)
+        values[order] = flat_cells[sorted_index] ^ (turn & 1)
+        # Turn counter-clockwise on a 1 cell, and clockwise on a 0 cell.
+        self.ant_direction = (self.ant_direction + 1 - 2 * values) % len(
+            DIRECTIONS
+        )
+
+        # Flip each cell once for every ant which moved onto it.
+        cells = sorted_index[starts]
+        flips = group_sizes & 1
+        old_values = flat_cells[cells]
+        flat_cells[cells] = old_values ^ flips
+        self.population += int(
+            numpy.count_nonzero(flat_cells[cells])
+            - numpy.count_nonzero(old_values)
+        )
+
+        # Redraw the cells the ants have left, and the cells they are on.
+        self.updated_cells = list(zip(old_x.tolist(), old_y.tolist()))
+        self.updated_cells += zip(self.ant_x.tolist(), self.ant_y.tolist())
+
+
+class VotingModel(Model):
+    """
+    Voting Game cellular automata.
+
+    All cells in the grid are initially either 0 or 1 at random. In each
+    generation, a cell is selected at random, and takes on the value of one its
+    eight neighbors also selected at random.
+    After time blocks of single colors should start to form. Eventually the
+    entire grid switches to either 0 or 1, and the other value disappears
+    entirely.
+    """
+
+    # Update whole sublattices at a time, rather than one cell
+    sweep = False
+    # Jump straight to the next generation which changes a cell
+    events = False
+    # The number of neighbors of each cell with the value 1, indexed by
+    # x * cell_rows + y. It is rebuilt from the cells when it is None.
+    neighbor_counts = None
+    # In events mode, the activeset.ActiveSet of cells which can change,
+    # indexed like neighbor_counts. It is rebuilt when it is None.
+    active = None
+    # The domains.DomainTracker of the cells, once domain_stats() has been
+    # called. It is rebuilt when it is None.
+    domain_tracker = None
+    # The weight of a cell which is certain to change when it is picked.
+    # A cell's weight in the active set is out of this.
+    certain_weight = len(NEIGHBORS)
+
+    def __init__(
+        self,
+        cell_cols,
+        cell_rows,
+        store=cellstore.LIST,
+        sweep=False,
+        events=False,
+        seed=None,
+    ):
+        """
+        Initialise the simulation.
+
+        If sweep is True, each generation of update_simulation() is a sweep
+        of the whole grid, which needs NumPy and the cellstore.ARRAY store.
+        See sweep_lattice(). If events is True, each generation jumps to the
+        next change to a cell. See update_event().
+
+        The random numbers come from the model's own rng.RandomStream, with
+        the given seed. If seed is None, it is drawn from the random module.
+        """
+        # pylint: disable=too-many-arguments
+        if sweep:
+            if not NUMPY:
+                raise ModuleNotFoundError("Sweep mode needs NumPy")
+            if store != cellstore.ARRAY:
+                raise ValueError("Sweep mode needs the array cell store")
+            if events:
+                raise ValueError("Choose either sweep mode or events mode")
+        # Game parameters
+        self.populations = [0, 0]
+        self.sweep = sweep
+        self.events = events
+        self.rng = rng.RandomStream(seed)
+
+        # Call the parent class __init__() method.
+        super().__init__(cell_cols, cell_rows, store)
+
+    def create_cells(self):
+        """Create the initial game grid, with each cell 0 or 1 at random."""
+        super().create_cells()
+        self.updated_cells = []
+        for x in range(self.cell_cols):
+            for y in range(self.cell_rows):
+                value = self.rng.integer(2)
+                self.cells[x, y] = value
+                self.populations[value] += 1
+                self.updated_cells.append([x, y])
+
+    def fill_random(self, density):
+        """
+        Set each cell to 1 with the chance density, and otherwise to 0.
+
+        Restarts the simulation from the new cells.
+        """
+        self.populations = [0, 0]
+        self.updated_cells = []
+        for x in range(self.cell_cols):
+            for y in range(self.cell_rows):
+                value = int(self.rng.random() < density)
+                self.cells[x, y] = value
+                self.populations[value] += 1
+                self.updated_cells.append([x, y])
+        self.generation = 1
+        self.finished = False
+        self.frozen_generation = None
+        self.neighbor_counts = None
+        self.active = None
+        self.domain_tracker = None
+
+    def update_simulation(self):
+        """
+        Update the simulation by one generation.
+
+        In sweep mode, this runs a whole sweep of cell_cols x cell_rows
+        generations. In events mode, it runs up to and including the next
+        generation which changes a cell.
+        """
+        if self.sweep:
+            self.sweep_lattice()
+            self.generation += self.cell_cols * self.cell_rows
+        elif self.events:
+            self.update_event()
+        else:
+            self.update_cell()
+            self.generation += 1
+        self.check_finished()
+
+    def run(self, generations):
+        """
+        Run the simulation for a number of generations, without display.
+
+        In sweep mode, runs whole sweeps until at least generations have been
+        run, or the simulation finishes. Returns the number of generations
+        actually run. In events mode, runs exactly generations, unless the
+        simulation finishes.
+        """
+        if self.events:
+            end = self.generation + generations
+            start = self.generation
+            while self.generation < end and not self.finished:
+                self.update_event(end)
+                self.check_finished()
+            return self.generation - start
+        if not self.sweep:
+            return super().run(generations)
+        start = self.generation
+        while self.generation - start < generations and not self.finished:
+            # There is no view to redraw the changed cells.
+            self.sweep_lattice(track=False)
+            self.generation += self.cell_cols * self.cell_rows
+            self.check_finished()
+        return self.generation - start
+
+    def check_finished(self):
+        """
+        Finish the simulation if it has reached a state it can never leave.
+
+        That is when either population has reduced to zero, or no cell can
+        change any more. frozen_generation is set to the generation when the
+        state was reached, or in sweep mode to the end of the sweep.
+        """
+        if (
+            self.populations[0] == 0
+            or self.populations[1] == 0
+            or self.changeable() == 0
+        ):
+            self.finished = True
+            self.frozen_generation = self.generation
+
+    def changeable(self):
+        """
+        Return the number of cells which can still change, or None.
+
+        In the Voting Game, any cell next to a cell of the other value can
+        change, so the game only ends when one population reaches zero, and
+        the cells are not counted.
+        """
+        return None
+
+    def domain_stats(self):
+        """
+        Return the number of domains, the size of the largest domain, and
+        the interface length, as a dictionary.
+
+        A domain is a connected block of cells of the same value, and the
+        interface length is the number of neighboring pairs of cells with
+        different values. See domains.DomainTracker. The tracker is created
+        on the first call, and then kept up to date as cells change, so
+        later calls are cheap.
+        """
+        if self.domain_tracker is None:
+            self.domain_tracker = domains.DomainTracker(self)
+        tracker = self.domain_tracker
+        return {
+            "domains": tracker.domain_count(),
+            "largest_domain": tracker.largest_domain(),
+            "interface": tracker.interface,
+        }
+
+    def count_neighbors(self):
+        """Count the neighbors with the value 1 of every cell."""
+        cols = self.cell_cols
+        rows = self.cell_rows
+        cells = self.cells
+        counts = bytearray(cols * rows)
+        for x in range(cols):
+            for y in range(rows):
+                if cells[x, y]:
+                    for dx, dy in NEIGHBORS:
+                        counts[(x + dx) % cols * rows + (y + dy) % rows] += 1
+        self.neighbor_counts = counts
+
+    def set_cell(self, x, y, value):
+        """
+        Change the value of the cell at x, y.
+
+        Keeps the populations and updated_cells up to date, and the neighbor
+        counts, active set and domain statistics, when they are kept.
+        """
+        old_value = self.cells[x, y]
+        self.populations[old_value] -= 1
+        self.populations[value] += 1
+        self.cells[x, y] = value
+        # Note that the cell value has changed
+        self.updated_cells = [[x, y]]
+        if self.domain_tracker is not None:
+            self.domain_tracker.flip(x, y, value)
+        counts = self.neighbor_counts
+        if counts is None:
+            return
+        # Update the counts of the cell's neighbors.
+        cols = self.cell_cols
+        rows = self.cell_rows
+        change = value - old_value
+        active = self.active
+        if active is not None:
+            active.set_weight(x * rows + y, self.cell_weight(x, y))
+        for dx, dy in NEIGHBORS:
+            neighbor_x = (x + dx) % cols
+            neighbor_y = (y + dy) % rows
+            index = neighbor_x * rows + neighbor_y
+            counts[index] += change
+            if active is not None:
+                active.set_weight(
+                    index, self.cell_weight(neighbor_x, neighbor_y)
+                )
+
+    def cell_weight(self, x, y):
+        """
+        Return how likely the cell at x, y is to change when it is picked.
+
+        The chance is the weight out of certain_weight. For the Voting Game,
+        this is the number of neighbors with the other value, out of 8.
+        """
+        count = self.neighbor_counts[x * self.cell_rows + y]
+        return len(NEIGHBORS) - count if self.cells[x, y] else count
+
+    def find_active(self):
+        """Build the active set of every cell which can change."""
+        if self.neighbor_counts is None:
+            self.count_neighbors()
+        active = activeset.ActiveSet()
+        rows = self.cell_rows
+        for x in range(self.cell_cols):
+            for y in range(rows):
+                active.set_weight(x * rows + y, self.cell_weight(x, y))
+        self.active = active
+
+    def update_event(self, end=None):
+        """
+        Run up to and including the next generation which changes a cell.
+
+        Rather than picking cells which will not change, the number of
+        generations before the next change is drawn from its geometric
+        distribution, and the changing cell is chosen from the active set,
+        in proportion to its chance of changing. Each cell's chance comes
+        from its own neighbors, so the generation of the change, and which
+        cell changes, have exactly the distribution of picking cells one
+        generation at a time: the statistics are identical, though runs with
+        the same random seed differ. The order of the active set depends on
+        its history, so a model resumed from a checkpoint, which rebuilds
+        it, carries on with the same statistics but not the same run.
+
+        Stops at generation end, if given and reached first. As the picks
+        which change nothing have no memory, carrying on from there is as
+        good as carrying on with the skipped generations.
+        """
+        if self.active is None:
+            self.find_active()
+        self.updated_cells = []
+        cells = self.cell_cols * self.cell_rows
+        chance = self.active.total / (cells * self.certain_weight)
+        if chance == 0:
+            # No cell can ever change again. See check_finished().
+            return
+        skipped = 0
+        if chance < 1:
+            # 1 - random() is never 0, so its log is finite.
+            skipped = int(
+                math.log(1 - self.rng.random()) / math.log(1 - chance)
+            )
+        if end is not None and self.generation + skipped >= end:
+            self.generation = end
+            return
+        self.generation += skipped + 1
+        x, y = divmod(self.active.choose(self.rng.random), self.cell_rows)
+        # Every change on a grid of two values is a flip.
+        self.set_cell(x, y, 1 - self.cells[x, y])
+
+    def sublattices(self):
+        """
+        Return the sublattices of the grid, as (x slice, y slice) pairs.
+
+        No two cells in the same sublattice are neighbors, even where the
+        grid wraps around. Cells are colored by the parity of x and y, like a
+        checkerboard in each direction, giving four sublattices. When a side
+        of the grid is odd, its last column or row gets a third color, as it
+        wraps around to meet the first.
+        """
+        x_slices = axis_slices(self.cell_cols)
+        y_slices = axis_slices(self.cell_rows)
+        return [
+            (x_slice, y_slice) for x_slice in x_slices for y_slice in y_slices
+        ]
+
+    def sweep_lattice(self, track=True):
+        """
+        Update every cell once, a whole sublattice at a time.
+
+        The sublattices are updated in a random order. The cells of a
+        sublattice do not neighbor each other, so none of them changes a
+        value which another one reads: updating them all at once with NumPy
+        gives exactly the same result as updating them one after another, in
+        any order, with update_cell(). A sweep is therefore a run of
+        cell_cols x cell_rows generations of the random-sequential dynamics,
+        with the same update rule, where each cell is chosen exactly once
+        rather than independently at random. Time is measured the same way
+        (one sweep is one update per cell on average), and the large scale
+        statistics, such as the growth of blocks and the final consensus or
+        frozen pattern, match. Individual runs differ, and sweeps leave no
+        cell unvisited, where random picks miss about a third of the cells
+        in any stretch of cell_cols x cell_rows generations.
+
+        The changed cells are listed in updated_cells if track is True.
+        """
+        array = self.cells.array
+        if track:
+            before = array.copy()
+        # Pad the grid with a copy of the opposite edges, so that no
+        # neighbor of a cell needs to wrap around.
+        padded = numpy.pad(array, 1, mode="wrap")
+        inner = padded[1:-1, 1:-1]
+        order = self.sublattices()
+        self.rng.shuffle(order)
+        for x_slice, y_slice in order:
+            inner[x_slice, y_slice] = self.sweep_values(
+                padded, x_slice, y_slice, self.rng.generator
+            )
+            # Copy the changed cells to the padding.
+            padded[0] = padded[-2]
+            padded[-1] = padded[1]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+        array[:] = inner
+        ones = int(numpy.count_nonzero(array))
+        self.populations = [array.size - ones, ones]
+        # Every cell may have changed, so recount when needed.
+        self.neighbor_counts = None
+        self.active = None
+        self.domain_tracker = None
+        if track:
+            changed_x, changed_y = numpy.nonzero(array != before)
+            self.updated_cells = list(
+                zip(changed_x.tolist(), changed_y.tolist())
+            )
+        else:
+            self.updated_cells = []
+
+    @staticmethod
+    def sweep_values(padded, x_slice, y_slice, rng):
+        """
+        Return the new values of a sublattice of cells, in sweep mode.
+
+        Each cell takes the value of one of its neighbors, chosen at random.
+        padded is the grid with a border of one cell copied from the
+        opposite edges, and the sublattice is given by slices of the grid
+        without the border.
+        """
+        # Index the flattened padded grid, where each neighbor is a fixed
+        # offset from the cell.
+        padded_rows = padded.shape[1]
+        x = numpy.arange(x_slice.start + 1, x_slice.stop + 1, 2)
+        y = numpy.arange(y_slice.start + 1, y_slice.stop + 1, 2)
+        cells = x[:, None] * padded_rows + y
+        offsets = numpy.array(
+            [dx * padded_rows + dy for dx, dy in NEIGHBORS], dtype=numpy.intp
+        )
+        choices = rng.integers(
+            len(NEIGHBORS), size=cells.shape, dtype=numpy.uint8
+        )
+        return padded.reshape(-1)[cells + offsets[choices]]
+
+    def update_cell(self):
+        """Set a random cell to the value of one of its random neighbors."""
+        # Pick a random cell
+        self.updated_cells = []
+        x, y = divmod(
+            self.rng.integer(self.cell_cols * self.cell_rows), self.cell_rows
+        )
+        old_value = self.cells[x, y]
+
+        # Pick a random neighbor of the cell
+        dx, dy = NEIGHBORS[self.rng.integer(len(NEIGHBORS))]
+        neighbor_x = (x + dx) % self.cell_cols
+        neighbor_y = (y + dy) % self.cell_rows
+
+        # Voting game
+        new_value = self.cells[neighbor_x, neighbor_y]
+        # Anti-voting game
+        # new_value = int(not self.cells[neighbor_x, neighbor_y])
+
+        # They may be the same, in which case there is nothing to change.
+        if old_value != new_value:
+            # Assign the value of the neighbor to this cell
+            self.set_cell(x, y, new_value)
+
+
+class MajorityRuleModel(VotingModel):
+    """
+    Majority Rule cellular automata.
+
+    All cells in the grid are initially either 1 or 0 at random. In each
+    generation, a cell is selected at random, and takes on the majority value
+    of its eight neighbors. After time blocks of single colors will form,
+    and start to harden into straight lines.
+
+    The number of neighbors with the value 1 is kept for every cell, and
+    updated only when a cell changes, so picking a cell needs just one
+    lookup.
+    """
+
+    # A cell either changes when it is picked, or does not.
+    certain_weight = 1
+
+    def can_change(self, x, y):
+        """Return True if the cell at x, y would change if it was picked."""
+        if self.neighbor_counts is None:
+            self.count_neighbors()
+        return self.cell_weight(x, y) == 1
+
+    def changeable(self):
+        """
+        Return the number of cells which would change if they were picked.
+
+        The cells are counted in the active set, which is kept up to date as
+        cells change, so this is quick. In sweep mode, they are counted
+        from the whole grid at once with NumPy instead.
+        """
+        if self.sweep:
+            array = self.cells.array
+            total = sum(
+                numpy.roll(array, (dx, dy), axis=(0, 1))
+                for dx, dy in NEIGHBORS
+            )
+            return int(
+                numpy.count_nonzero((total > 4) & (array == 0))
+                + numpy.count_nonzero((total < 4) & (array == 1))
+            )
+        if self.active is None:
+            self.find_active()
+        return len(self.active)
+
+    def cell_weight(self, x, y):
+        """Return 1 if the cell at x, y would change if picked, or 0."""
+        new_value = MAJORITY[self.neighbor_counts[x * self.cell_rows + y]]
+        return int(new_value is not None and new_value != self.cells[x, y])
+
+    def update_cell(self):
+        """Set a random cell to the majority value of its neighbors."""
+        # Pick a random cell
+        self.updated_cells = []
+        index = self.rng.integer(self.cell_cols * self.cell_rows)
+        if self.neighbor_counts is None:
+            self.count_neighbors()
+        new_value = MAJORITY[self.neighbor_counts[index]]
+        # On a tie, the neighbors are evenly split between 0's and 1's.
+        # Make no change.
+        if new_value is not None:
+            x, y = divmod(index, self.cell_rows)
+            if new_value != self.cells[x, y]:
+                self.set_cell(x, y, new_value)
+
+    @staticmethod
+    def sweep_values(padded, x_slice, y_slice, rng):
+        """
+        Return the new values of a sublattice of cells, in sweep mode.
+
+        Each cell takes the majority value of its neighbors, or keeps its
+        value on a tie.
+        """
+        # pylint: disable=unused-argument
+        # Each neighbor of the cells is a strided view of the padded grid.
+        # The total is at most 8, so it cannot overflow the uint8 values.
+        total = sum(
+            padded[
+                x_slice.start + 1 + dx : x_slice.stop + 1 + dx : 2,
+                y_slice.start + 1 + dy : y_slice.stop + 1 + dy : 2,
+            ]
+            for dx, dy in NEIGHBORS
+        )
+        values = padded[
+            x_slice.start + 1 : x_slice.stop + 1 : 2,
+            y_slice.start + 1 : y_slice.stop + 1 : 2,
+        ]
+        return numpy.where(
+            total > 4, 1, numpy.where(total < 4, 0, values)
+        ).astype(numpy.uint8)
+
+
+def axis_slices(size):
+    """
+    Return slices which color the cells along one side of a wrapped grid.
+
+    Cells of the same color are at least two cells apart, even across the
+    wrap: alternate cells, plus the last cell on its own when size is odd.
+    """
+    even = size - size % 2
+    slices = [slice(start, even, 2) for start in range(min(2, even))]
+    if size % 2:
+        slices.append(slice(size - 1, size, 2))
+    return slices
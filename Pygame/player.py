@@ -0,0 +1,139 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Replay player.
+
+Plays back a replay file recorded from any of the simulations (see
+replay.py), without running the simulation again. Give the replay file on
+the command line.
+
+Keys, as well as the standard ones:
+    [ and ] - seek back or forward to the nearest keyframe
+    , and . - halve or double the playback speed
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Seeks to the nearest keyframe, as keyframes are
+                           written every so many records, not generations.
+"""
+import sys
+
+# Import Pygame, either standard version or SDL2 version depending on the
+# platform.
+try:
+    import pygame_sdl2  # pylint: disable=import-error
+
+    pygame_sdl2.import_as_pygame()
+    PYGAME_SDL2 = True
+except ModuleNotFoundError:
+    PYGAME_SDL2 = False
+import pygame
+
+import langton
+import majorityrule
+import replay
+import sim
+import voting
+
+# Player actions
+SEEK_BACK = "Back"
+SEEK_FORWARD = "Forward"
+SLOWER = "Slower"
+FASTER = "Faster"
+
+# Cell colors of the recorded model classes which do not use rule colors
+PALETTES = {
+    "VotingModel": voting.VotingGame.palette,
+    "MajorityRuleModel": majorityrule.MajorityRule.palette,
+}
+
+
+class Player(sim.Grid):
+    """
+    Replay of a recorded simulation run.
+
+    The model is a replay.ReplayModel. Each frame plays speed updates.
+    """
+
+    # Generations played per frame
+    speed = 1
+
+    @property
+    def palette(self):
+        """Return the cell colors of the recorded simulation."""
+        header = self.model.header
+        return PALETTES.get(
+            header["model"], langton.rule_palette(max(header["colors"], 2))
+        )
+
+    def create_keyboard_actions(self):
+        """Add the player keys to the standard keyboard actions."""
+        super().create_keyboard_actions()
+        self.keyboard_actions.update(
+            {
+                pygame.K_LEFTBRACKET: SEEK_BACK,
+                pygame.K_RIGHTBRACKET: SEEK_FORWARD,
+                pygame.K_COMMA: SLOWER,
+                pygame.K_PERIOD: FASTER,
+            }
+        )
+
+    def handle_action(self, action):
+        """Seek, or change the playback speed."""
+        if action in (SEEK_BACK, SEEK_FORWARD):
+            self.model.seek_keyframe(forward=action == SEEK_FORWARD)
+            self.update_grid()
+            self.refresh_dashboard()
+        elif action in (SLOWER, FASTER):
+            if action == FASTER:
+                self.speed *= 2
+            else:
+                self.speed = max(self.speed // 2, 1)
+            self.turbo = self.speed > 1
+            self.steps_per_frame = self.speed
+
+    def toggle_recording(self):
+        """Do nothing, as the replay is already recorded."""
+
+    def update_grid(self):
+        """Draw the grid, redrawing every cell after a seek."""
+        if self.model.redraw:
+            self.model.redraw = False
+            self.full_redraw = True
+        super().update_grid()
+
+    def update_dashboard(self, msg=None):
+        """Update the dashboard display with the playback speed."""
+        super().update_dashboard(msg)
+        self.draw_field(
+            "Speed",
+            "Speed: {:>5}".format(self.speed),
+            self.dashboard.left + self.dash_pos_x,
+            self.dashboard.top + self.dash_pos_y,
+        )
+
+
+def main():
+    """Initialise the player and call the main game loop."""
+    if len(sys.argv) < 2:
+        print("Usage: player.py REPLAY_FILE")
+        sys.exit(1)
+    title = "Replay"
+    # Initialise logging
+    sim.config_logging(title)
+
+    # Larger screen size
+    display_surface = sim.start_pygame(1024, 768, title)
+
+    run_game(display_surface, title, sys.argv[1])
+
+
+def run_game(display_surface, title, path):
+    """Execute the main game loop."""
+    simulation = Player(
+        display_surface, title, model=replay.ReplayModel(path)
+    )
+    sim.game_loop(simulation)
+
+
+if __name__ == "__main__":
+    main()
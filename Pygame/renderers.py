@@ -0,0 +1,338 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Cell renderers for sim.Grid.
+
+A renderer draws the cells of a grid's model onto the screen, using the colors
+in the grid's palette (indexed by cell value). Several backends are available:
+
+RectRenderer class - draws each cell with its own Pygame call. Needs no extra
+                     packages, but a full redraw is O(cols x rows) Python calls.
+SurfarrayRenderer class - maps the cell array into a one pixel per cell
+                          surface with pygame.surfarray, then scale-blits it
+                          onto the grid. Needs NumPy.
+TextureRenderer class - uploads the cells to an SDL2 texture, which is scaled
+                        by the SDL2 renderer. Needs pygame._sdl2, and a grid
+                        drawn on an off-screen surface (the SDL2 renderer opens
+                        its own window).
+create_renderer() - create a renderer by name, or pick the fastest available.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Only the cells in the grid's viewport are drawn.
+                         - Added draw_markers(), to draw sprites such as ants
+                           over many cells in one pass.
+"""
+import logging
+import time
+
+# Import Pygame, either standard version or SDL2 version depending on the
+# platform.
+try:
+    import pygame_sdl2  # pylint: disable=import-error
+
+    pygame_sdl2.import_as_pygame()
+    PYGAME_SDL2 = True
+except ModuleNotFoundError:
+    PYGAME_SDL2 = False
+import pygame
+
+# NumPy is optional. Without it, only the RectRenderer is available.
+try:
+    import numpy
+    import pygame.surfarray
+
+    NUMPY = True
+except ImportError:
+    NUMPY = False
+
+# The SDL2 texture renderer is optional, and only available in Pygame 2.
+try:
+    from pygame._sdl2 import video  # pylint: disable=import-error
+
+    SDL2_VIDEO = True
+except ImportError:
+    SDL2_VIDEO = False
+
+# Renderer names
+AUTO = "auto"
+RECT = "rect"
+SURFARRAY = "surfarray"
+TEXTURE = "texture"
+
+# Color used for the transparent areas of the grid lines overlay.
+COLORKEY = pygame.Color(255, 0, 255)
+
+# Redraw the whole grid, rather than individual cells, once more than this
+# fraction of the cells has changed.
+FULL_REDRAW_FRACTION = 0.1
+
+
+class RectRenderer:
+    """Draw each cell as a separate filled rectangle."""
+
+    name = RECT
+
+    def __init__(self, grid):
+        """Initialise the renderer for a sim.Grid."""
+        self.grid = grid
+        # Marker sprites, by color and size
+        self.markers = {}
+
+    @staticmethod
+    def available(grid):  # pylint: disable=unused-argument
+        """Return True if this renderer can be used with the grid."""
+        return True
+
+    def draw_cells(self, positions):
+        """Draw the visible cells at a list of [x, y] model positions."""
+        grid = self.grid
+        cells = grid.model.cells
+        palette = grid.palette
+        for x, y in positions:
+            if grid.is_visible(x, y):
+                grid.draw_cell(x, y, palette[cells[x, y]])
+
+    def draw_all(self):
+        """Draw every cell in the grid's viewport."""
+        grid = self.grid
+        self.draw_cells(
+            [x, y]
+            for x in range(grid.view_x, grid.view_x + grid.cell_cols)
+            for y in range(grid.view_y, grid.view_y + grid.cell_rows)
+        )
+
+    def draw_markers(self, positions, color):
+        """
+        Draw a marker over the visible cells at a list of [x, y] positions.
+
+        Markers show things on top of the cells, such as ants. They are all
+        drawn with a single blits() call, and stay until the cells under them
+        are next drawn.
+        """
+        grid = self.grid
+        blits = []
+        for x, y in positions:
+            if grid.is_visible(x, y):
+                rect = grid.cell_rect(x, y)
+                blits.append((self.marker(color, rect.size), rect))
+        grid.win.blits(blits, doreturn=False)
+        grid.dirty_rects.extend(rect for marker, rect in blits)
+
+    def marker(self, color, size):
+        """Return a marker sprite of a color and size."""
+        key = (tuple(color), size)
+        try:
+            return self.markers[key]
+        except KeyError:
+            sprite = pygame.Surface(size, 0, self.grid.win)
+            sprite.fill(color)
+            self.markers[key] = sprite
+            return sprite
+
+    def present(self, rects=None):
+        """Copy rects, or the whole display if rects is None, to the screen."""
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+
+class SurfarrayRenderer(RectRenderer):
+    """
+    Draw the whole grid with a handful of surfarray and blit calls.
+
+    The cell values in the viewport are mapped to pixel colors through a
+    lookup table, written into a surface with one pixel per cell, and scaled
+    to the grid size.
+    The grid lines are then drawn on top from a pre-drawn overlay.
+    Small numbers of changed cells are still drawn one at a time.
+    """
+
+    name = SURFARRAY
+
+    def __init__(self, grid):
+        """Initialise the renderer for a sim.Grid."""
+        super().__init__(grid)
+        # Lookup table from cell value to mapped pixel color
+        self.colors = numpy.array(
+            [grid.win.map_rgb(color) for color in grid.palette],
+            dtype=numpy.uint32,
+        )
+        # Surface with one pixel per cell, and the same surface scaled up
+        # to the size of the grid.
+        self.pixels = pygame.Surface(
+            (grid.cell_cols, grid.cell_rows), 0, grid.win
+        )
+        self.scaled = pygame.Surface(grid.grid.size, 0, grid.win)
+        # Overlay of the grid border and lines, drawn with a 1 pixel margin
+        # for the border.
+        self.lines = pygame.Surface(
+            (grid.grid.width + 2, grid.grid.height + 2), 0, grid.win
+        )
+        self.lines.fill(COLORKEY)
+        grid.draw_grid_lines(self.lines, 1, 1)
+        self.lines.set_colorkey(COLORKEY)
+        self.lines_rect = self.lines.get_rect(
+            topleft=(grid.grid.left - 1, grid.grid.top - 1)
+        )
+
+    @staticmethod
+    def available(grid):  # pylint: disable=unused-argument
+        """Return True if this renderer can be used with the grid."""
+        return NUMPY
+
+    def cell_array(self):
+        """Return the cells in the viewport as a (cols, rows) NumPy array."""
+        grid = self.grid
+        return grid.model.cells.region(
+            grid.view_x, grid.view_y, grid.cell_cols, grid.cell_rows
+        )
+
+    def draw_cells(self, positions):
+        """Draw the visible cells at a list of [x, y] model positions."""
+        if len(positions) > FULL_REDRAW_FRACTION * (
+            self.grid.cell_cols * self.grid.cell_rows
+        ):
+            self.draw_all()
+        else:
+            super().draw_cells(positions)
+
+    def draw_all(self):
+        """Draw every cell in the grid's viewport."""
+        pygame.surfarray.blit_array(
+            self.pixels, self.colors[self.cell_array()]
+        )
+        pygame.transform.scale(self.pixels, self.grid.grid.size, self.scaled)
+        self.grid.win.blit(self.scaled, self.grid.grid)
+        self.grid.win.blit(self.lines, self.lines_rect)
+        self.grid.dirty_rects.append(self.lines_rect)
+
+
+class TextureRenderer(SurfarrayRenderer):
+    """
+    Draw the grid through SDL2 textures.
+
+    The one pixel per cell surface is uploaded to a texture, which the SDL2
+    renderer scales to the grid size. The rest of the screen (dashboard and
+    buttons) is drawn as usual onto the grid's off-screen surface, and the
+    changed areas are uploaded to a second texture on each refresh.
+    """
+
+    name = TEXTURE
+
+    def __init__(self, grid):
+        """Initialise the renderer for a sim.Grid."""
+        super().__init__(grid)
+        self.window = video.Window(grid.title, size=grid.win.get_size())
+        self.renderer = video.Renderer(self.window)
+        self.screen = video.Texture(
+            self.renderer, grid.win.get_size(), streaming=True
+        )
+        self.screen.update(grid.win)
+        self.texture = video.Texture(
+            self.renderer, self.pixels.get_size(), streaming=True
+        )
+        self.lines_texture = video.Texture.from_surface(
+            self.renderer, self.lines
+        )
+
+    @staticmethod
+    def available(grid):
+        """Return True if this renderer can be used with the grid."""
+        # The SDL2 renderer cannot share a window with the Pygame display
+        # surface.
+        offscreen = grid.win is not pygame.display.get_surface()
+        return NUMPY and SDL2_VIDEO and offscreen
+
+    def draw_cells(self, positions):
+        """Draw the visible cells at a list of [x, y] model positions."""
+        grid = self.grid
+        if len(positions) > FULL_REDRAW_FRACTION * (
+            grid.cell_cols * grid.cell_rows
+        ):
+            self.draw_all()
+        else:
+            cells = grid.model.cells
+            palette = grid.palette
+            for x, y in positions:
+                if grid.is_visible(x, y):
+                    pos = (x - grid.view_x, y - grid.view_y)
+                    self.pixels.set_at(pos, palette[cells[x, y]])
+            grid.dirty_rects.append(grid.grid)
+
+    def draw_all(self):
+        """Draw every cell in the grid's viewport."""
+        pygame.surfarray.blit_array(
+            self.pixels, self.colors[self.cell_array()]
+        )
+        self.grid.dirty_rects.append(self.grid.grid)
+
+    def draw_markers(self, positions, color):
+        """Draw a marker over the visible cells at a list of positions."""
+        grid = self.grid
+        mapped_color = grid.win.map_rgb(color)
+        pixels = pygame.surfarray.pixels2d(self.pixels)
+        for x, y in positions:
+            if grid.is_visible(x, y):
+                pixels[x - grid.view_x, y - grid.view_y] = mapped_color
+        # Release the lock on the pixels surface.
+        del pixels
+        grid.dirty_rects.append(grid.grid)
+
+    def present(self, rects=None):
+        """Copy rects, or the whole display if rects is None, to the screen."""
+        if rects is None:
+            self.screen.update(self.grid.win)
+        else:
+            screen_rect = self.grid.win.get_rect()
+            for rect in rects:
+                rect = screen_rect.clip(rect)
+                if rect.width and rect.height:
+                    self.screen.update(self.grid.win.subsurface(rect), rect)
+        self.texture.update(self.pixels)
+        self.renderer.clear()
+        self.screen.draw()
+        self.texture.draw(dstrect=self.grid.grid)
+        self.lines_texture.draw(dstrect=self.lines_rect)
+        self.renderer.present()
+
+
+# Available renderers, in order of preference
+RENDERERS = {
+    SURFARRAY: SurfarrayRenderer,
+    RECT: RectRenderer,
+    TEXTURE: TextureRenderer,
+}
+
+
+def create_renderer(grid, name=AUTO):
+    """
+    Create a renderer for a sim.Grid.
+
+    If name is AUTO, each available renderer which draws directly onto the
+    grid's surface is timed drawing the full grid, and the fastest is used.
+    The texture renderer opens its own window, so must be requested by name.
+    """
+    if name != AUTO:
+        try:
+            renderer_class = RENDERERS[name]
+        except KeyError:
+            raise ValueError("Unknown renderer: " + str(name)) from None
+        if not renderer_class.available(grid):
+            raise ValueError("Renderer not available: " + str(name))
+        return renderer_class(grid)
+
+    fastest = None
+    fastest_time = None
+    for renderer_class in (SurfarrayRenderer, RectRenderer):
+        if not renderer_class.available(grid):
+            continue
+        renderer = renderer_class(grid)
+        start = time.perf_counter()
+        renderer.draw_all()
+        elapsed = time.perf_counter() - start
+        logging.debug("Renderer %s: %.6f seconds", renderer.name, elapsed)
+        if fastest is None or elapsed < fastest_time:
+            fastest, fastest_time = renderer, elapsed
+    logging.debug("Using renderer %s", fastest.name)
+    return fastest
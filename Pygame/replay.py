@@ -0,0 +1,422 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Recording and replay of simulation runs.
+
+A Recorder writes the cells changed by each update of a model, taken from
+its updated_cells, to a replay file. An update may run several generations,
+as in the events and sweep modes of models.VotingModel, and its record holds
+the number of generations it ran. Every keyframe_interval records, and
+whenever the model jumps ahead without its updated_cells recording every
+change, as along a highway in models.LangtonModel.run(), the Recorder writes
+a keyframe instead: a full checkpoint of the model (see checkpoint.py). A
+ReplayModel plays the file back as a model, so a sim.Grid view can show it
+without running the original simulation. It can seek to any generation,
+from the nearest keyframe before it.
+
+The file format is:
+
+- MAGIC, then the format VERSION as an unsigned 16 bit big-endian integer.
+- The length of the header as an unsigned 32 bit big-endian integer, then the
+  header as UTF-8 JSON. The header holds the model class, grid size, cell
+  store and number of colors.
+- A sequence of chunks. Each chunk is a one byte kind, the length of the rest
+  of the chunk as an unsigned 32 bit big-endian integer, and a text line of
+  numbers, followed by:
+  - for a KEYFRAME, with a line of its generation: a checkpoint file.
+  - for a DELTAS chunk, with a line of the generation of its first record,
+    the number of records, the x, y starting position and the generation of
+    its last record: zlib compressed records of consecutive updates. Each
+    record is the number of generations since the last record, the change in
+    population and the number of changed cells, then for each cell its x and
+    y distance from the last changed cell, and its new value.
+
+Version 1 files, where every record was one generation, can still be read.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - Records hold the number of generations they ran,
+                           so models which run several generations per
+                           update are recorded as deltas, not keyframes.
+                           The keyframe interval is counted in records.
+"""
+import bisect
+import json
+import struct
+import zlib
+
+import checkpoint
+import models
+
+MAGIC = b"SIMREPLY"
+VERSION = 2
+
+# Chunk kinds
+KEYFRAME = b"K"
+DELTAS = b"D"
+
+# Records between keyframes
+KEYFRAME_INTERVAL = 1000
+
+# Packed formats of a delta record, by file version, and of each changed
+# cell in it
+RECORDS = {1: struct.Struct("<qI"), 2: struct.Struct("<qqI")}
+RECORD = RECORDS[VERSION]
+CELL = struct.Struct("<qqB")
+
+
+class Recorder:
+    """
+    Record the generations of a model to a replay file.
+
+    Call record() after each update of the model, and close() at the end of
+    the run.
+    """
+
+    def __init__(self, model, path, keyframe_interval=KEYFRAME_INTERVAL):
+        """Create the replay file, and write the first keyframe."""
+        self.model = model
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        # Records since the last keyframe, and the generation of the last
+        # record
+        self.since_keyframe = 0
+        self.generation = None
+        # Records not yet written, the generation of the first of them, and
+        # the position of the last changed cell
+        self.records = []
+        self.first_generation = None
+        self.start = (0, 0)
+        self.last = (0, 0)
+        # Population at the last record
+        self.population = model.population
+
+        rule = getattr(model, "rule", None)
+        header = json.dumps(
+            {
+                "model": type(model).__name__,
+                "cols": model.cell_cols,
+                "rows": model.cell_rows,
+                "store": model.store,
+                "colors": rule.colors if rule else 2,
+                "keyframe_interval": keyframe_interval,
+            }
+        ).encode("utf-8")
+        self.file = open(path, "wb")  # pylint: disable=consider-using-with
+        self.file.write(
+            MAGIC + struct.pack(">HI", VERSION, len(header)) + header
+        )
+        self.write_keyframe()
+
+    def write_chunk(self, kind, line, body):
+        """Write a chunk to the file."""
+        line = " ".join(str(value) for value in line).encode("ascii") + b"\n"
+        self.file.write(kind + struct.pack(">I", len(line) + len(body)))
+        self.file.write(line + body)
+
+    def write_keyframe(self):
+        """Write any pending records, then a keyframe of the model."""
+        self.flush()
+        generation = self.model.generation
+        self.write_chunk(
+            KEYFRAME,
+            [generation],
+            checkpoint.encode(
+                *checkpoint.snapshot(self.model, save_random=False)
+            ),
+        )
+        self.since_keyframe = 0
+        self.generation = generation
+
+    def record(self, jumped=False):
+        """
+        Record the latest update of the model.
+
+        jumped should be True if the model has changed since the last record
+        in ways its updated_cells do not show, as after a run() which jumps
+        along a highway. A keyframe is then written.
+        """
+        model = self.model
+        if model.generation == self.generation:
+            # No generation has been run since the last record.
+            return
+        if (
+            jumped
+            or model.generation < self.generation
+            or self.since_keyframe >= self.keyframe_interval
+        ):
+            self.write_keyframe()
+            return
+
+        if not self.records:
+            self.first_generation = model.generation
+            self.start = self.last
+        cells = model.cells
+        changed = {(x, y) for x, y in model.updated_cells}
+        record = [
+            RECORD.pack(
+                model.generation - self.generation,
+                model.population - self.population,
+                len(changed),
+            )
+        ]
+        last_x, last_y = self.last
+        for x, y in changed:
+            record.append(CELL.pack(x - last_x, y - last_y, cells[x, y]))
+            last_x, last_y = x, y
+        self.last = (last_x, last_y)
+        self.records.append(b"".join(record))
+        self.population = model.population
+        self.generation = model.generation
+        self.since_keyframe += 1
+
+    def flush(self):
+        """Write any pending records to the file."""
+        if self.records:
+            self.write_chunk(
+                DELTAS,
+                [
+                    self.first_generation,
+                    len(self.records),
+                    *self.start,
+                    self.generation,
+                ],
+                zlib.compress(b"".join(self.records)),
+            )
+            self.records = []
+        self.population = self.model.population
+        self.file.flush()
+
+    def close(self):
+        """Write any pending records, and close the file."""
+        self.flush()
+        self.file.close()
+
+
+def record(model, path, generations, keyframe_interval=KEYFRAME_INTERVAL):
+    """
+    Run a model for a number of updates, recording it to a replay file.
+
+    Returns the number of updates run.
+    """
+    recorder = Recorder(model, path, keyframe_interval)
+    count = 0
+    try:
+        while count < generations and not model.finished:
+            model.update_simulation()
+            recorder.record()
+            count += 1
+    finally:
+        recorder.close()
+    return count
+
+
+class ReplayModel(models.Model):
+    """
+    A model which plays back a replay file.
+
+    Each generation applies the recorded changes, and sets updated_cells, so
+    a view draws it like the original model. seek() moves to any recorded
+    generation. redraw is set to True when every cell may have changed, as
+    after a seek.
+    """
+
+    def __init__(self, path):
+        """Load the replay file, and start at its first generation."""
+        with open(path, "rb") as file:
+            self.data = file.read()
+        if not self.data.startswith(MAGIC):
+            raise ValueError(path + " is not a replay file")
+        offset = len(MAGIC)
+        version, header_length = struct.unpack_from(">HI", self.data, offset)
+        if version > VERSION:
+            raise ValueError(
+                "{} is replay version {}, but only versions up to {} can be "
+                "read".format(path, version, VERSION)
+            )
+        offset += struct.calcsize(">HI")
+        self.header = json.loads(self.data[offset : offset + header_length])
+        offset += header_length
+        self.record_format = RECORDS[version]
+        super().__init__(
+            self.header["cols"], self.header["rows"], self.header["store"]
+        )
+
+        # The generation and chunk position of each keyframe, and the
+        # generations of the first and last records, number of records and
+        # chunk position of each block of delta records
+        self.keyframes = []
+        self.keyframe_offsets = []
+        self.blocks = []
+        self.block_ends = []
+        self.block_offsets = []
+        while offset < len(self.data):
+            kind = self.data[offset : offset + 1]
+            (length,) = struct.unpack_from(">I", self.data, offset + 1)
+            offset += 5
+            line = self.data[offset : self.data.index(b"\n", offset)]
+            numbers = [int(value) for value in line.split()]
+            if kind == KEYFRAME:
+                self.keyframes.append(numbers[0])
+                self.keyframe_offsets.append(offset)
+            elif kind == DELTAS:
+                self.blocks.append(numbers[0])
+                self.block_offsets.append((offset, numbers[1]))
+                # Version 1 records were each one generation.
+                self.block_ends.append(
+                    numbers[4]
+                    if len(numbers) > 4
+                    else numbers[0] + numbers[1] - 1
+                )
+            offset += length
+        if not self.keyframes:
+            raise ValueError(path + " has no keyframes")
+        self.first_generation = self.keyframes[0]
+        self.last_generation = max([self.keyframes[-1]] + self.block_ends)
+
+        # The decoded records of the last block used, their generations, and
+        # the index of the block
+        self.block = None
+        self.block_generations = None
+        self.block_index = None
+        self.redraw = True
+        self.seek(self.first_generation)
+
+    def chunk_body(self, offset):
+        """Return the numbers line and the body of a chunk."""
+        end = self.data.index(b"\n", offset)
+        (length,) = struct.unpack_from(">I", self.data, offset - 4)
+        line = [int(value) for value in self.data[offset:end].split()]
+        return line, self.data[end + 1 : offset + length]
+
+    def load_block(self, index):
+        """Decode a block of delta records."""
+        line, body = self.chunk_body(self.block_offsets[index][0])
+        first, count, last_x, last_y = line[:4]
+        body = zlib.decompress(body)
+        record_format = self.record_format
+        records = []
+        generations = []
+        generation = first
+        position = 0
+        for number in range(count):
+            if record_format.size == RECORDS[1].size:
+                step = 1
+                change, cell_count = record_format.unpack_from(body, position)
+            else:
+                step, change, cell_count = record_format.unpack_from(
+                    body, position
+                )
+            position += record_format.size
+            # The generation of the first record is on the chunk's line.
+            if number:
+                generation += step
+            cells = []
+            for dx, dy, value in CELL.iter_unpack(
+                body[position : position + cell_count * CELL.size]
+            ):
+                last_x += dx
+                last_y += dy
+                cells.append((last_x, last_y, value))
+            position += cell_count * CELL.size
+            records.append((change, cells))
+            generations.append(generation)
+        self.block = records
+        self.block_generations = generations
+        self.block_index = index
+
+    def find_block(self, generation):
+        """Return the first block with a record after a generation, or None."""
+        index = bisect.bisect_right(self.block_ends, generation)
+        if index == len(self.blocks):
+            return None
+        return index
+
+    def next_record(self):
+        """
+        Return the position in the loaded block of the next record after
+        the current generation, loading its block if needed, or None.
+        """
+        index = self.find_block(self.generation)
+        if index is None:
+            return None
+        if index != self.block_index:
+            self.load_block(index)
+        return bisect.bisect_right(self.block_generations, self.generation)
+
+    def seek(self, generation):
+        """
+        Move to a generation, from the nearest keyframe before it.
+
+        If the generation falls inside an update which ran several
+        generations, or a jump, moves to the last generation recorded before
+        it.
+        """
+        generation = min(
+            max(generation, self.first_generation), self.last_generation
+        )
+        index = bisect.bisect_right(self.keyframes, generation) - 1
+        self.load_keyframe(index)
+        while True:
+            position = self.next_record()
+            if (
+                position is None
+                or self.block_generations[position] > generation
+            ):
+                break
+            self.apply_record(position)
+        self.updated_cells = []
+        self.redraw = True
+        self.finished = self.generation >= self.last_generation
+
+    def seek_keyframe(self, forward=True):
+        """
+        Move to the next keyframe, or back to the one before.
+
+        Stays put if there is no keyframe that way.
+        """
+        if forward:
+            index = bisect.bisect_right(self.keyframes, self.generation)
+        else:
+            index = bisect.bisect_left(self.keyframes, self.generation) - 1
+        if 0 <= index < len(self.keyframes):
+            self.seek(self.keyframes[index])
+
+    def load_keyframe(self, index):
+        """Set the cells and generation from a keyframe."""
+        _, body = self.chunk_body(self.keyframe_offsets[index])
+        model = checkpoint.decode(body, restore_random=False)
+        self.cells = model.cells
+        self.population = model.population
+        self.generation = model.generation
+
+    def apply_record(self, position):
+        """Apply the changes of a record in the loaded block."""
+        change, cells = self.block[position]
+        for x, y, value in cells:
+            self.cells[x, y] = value
+        self.population += change
+        self.generation = self.block_generations[position]
+        self.updated_cells = [[x, y] for x, y, _ in cells]
+
+    def apply_next(self):
+        """Move to the next recorded update, or the next keyframe."""
+        position = self.next_record()
+        keyframe = bisect.bisect_right(self.keyframes, self.generation)
+        if keyframe < len(self.keyframes) and (
+            position is None
+            or self.keyframes[keyframe] <= self.block_generations[position]
+        ):
+            # The model jumped ahead, or reached a keyframe interval.
+            self.seek(self.keyframes[keyframe])
+            return
+        if position is not None:
+            self.apply_record(position)
+
+    def update_simulation(self):
+        """Play the next recorded generation."""
+        self.updated_cells = []
+        if self.generation >= self.last_generation:
+            self.finished = True
+            return
+        self.apply_next()
+        self.finished = self.generation >= self.last_generation
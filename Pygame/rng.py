@@ -0,0 +1,148 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Seeded random number streams for the stochastic simulations.
+
+RandomStream class - a random number generator for one simulation, which
+                     draws its numbers in large batches.
+
+Each simulation has its own stream, so its runs can be repeated from their
+seed whatever else uses the random module. Drawing one number at a time
+from the random module costs a Python call or more per number: a stream
+draws a whole batch of each kind of number at once, with NumPy when it is
+available, and then hands them out from a list until it runs out.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+import random
+
+# NumPy is optional. Without it, the batches are drawn from a random.Random
+# generator.
+try:
+    import numpy
+
+    NUMPY = True
+except ModuleNotFoundError:
+    NUMPY = False
+
+# Numbers drawn in each batch
+BATCH = 1024
+
+# Buffer key for floats, rather than integers below a bound
+FLOAT = "float"
+
+
+class RandomStream:
+    """
+    A seeded random number generator, which draws numbers in batches.
+
+    There is a buffer of numbers for each kind of number drawn: integers
+    below each bound, and floats. The state, from getstate(), is the state
+    of the generator before each buffer was drawn, and the number of values
+    used from it, so it stays small however big the batches are.
+    """
+
+    def __init__(self, seed=None, batch=BATCH):
+        """
+        Create the stream.
+
+        If seed is None, the seed is drawn from the random module, so that
+        seeding the random module still makes runs repeatable.
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.batch = batch
+        # Whether the generator is a NumPy one, or a random.Random
+        self.numpy = NUMPY
+        if NUMPY:
+            self.generator = numpy.random.default_rng(seed)
+        else:
+            self.generator = random.Random(seed)
+        # For each kind of number, the numbers not yet used, last first, and
+        # the generator state they were drawn from
+        self.buffers = {}
+
+    def generator_state(self):
+        """Return the state of the underlying generator."""
+        if self.numpy:
+            return self.generator.bit_generator.state
+        return self.generator.getstate()
+
+    def set_generator_state(self, state):
+        """Set the state of the underlying generator."""
+        if self.numpy:
+            self.generator.bit_generator.state = state
+        else:
+            version, internal, gauss_next = state
+            self.generator.setstate((version, tuple(internal), gauss_next))
+
+    def draw(self, key):
+        """Draw a new buffer of numbers of one kind, and return it."""
+        state = self.generator_state()
+        generator = self.generator
+        if self.numpy:
+            if key == FLOAT:
+                values = generator.random(self.batch).tolist()
+            else:
+                values = generator.integers(key, size=self.batch).tolist()
+        elif key == FLOAT:
+            values = [generator.random() for _ in range(self.batch)]
+        else:
+            values = [generator.randrange(key) for _ in range(self.batch)]
+        # Hand the numbers out from the end of the list.
+        values.reverse()
+        self.buffers[key] = (values, state)
+        return values
+
+    def integer(self, bound):
+        """Return a random integer from 0 up to, but not including, bound."""
+        buffer = self.buffers.get(bound)
+        if buffer is None or not buffer[0]:
+            return self.draw(bound).pop()
+        return buffer[0].pop()
+
+    def random(self):
+        """Return a random float from 0 up to, but not including, 1."""
+        buffer = self.buffers.get(FLOAT)
+        if buffer is None or not buffer[0]:
+            return self.draw(FLOAT).pop()
+        return buffer[0].pop()
+
+    def shuffle(self, items):
+        """Shuffle a list in place."""
+        self.generator.shuffle(items)
+
+    def getstate(self):
+        """Return the state of the stream, which can be saved as JSON."""
+        return {
+            "numpy": self.numpy,
+            "batch": self.batch,
+            "generator": self.generator_state(),
+            "buffers": [
+                [key, state, self.batch - len(values)]
+                for key, (values, state) in self.buffers.items()
+            ],
+        }
+
+    def setstate(self, state):
+        """Restore the state of the stream from getstate()."""
+        if state["numpy"] != self.numpy:
+            raise ValueError(
+                "The random stream was saved {} NumPy".format(
+                    "with" if state["numpy"] else "without"
+                )
+            )
+        self.batch = state["batch"]
+        self.buffers = {}
+        # Draw each buffer again, and drop the numbers already used.
+        for key, buffer_state, used in state["buffers"]:
+            self.set_generator_state(buffer_state)
+            del self.draw(key)[self.batch - used :]
+        self.set_generator_state(state["generator"])
+
+    @classmethod
+    def from_state(cls, state):
+        """Return a new stream with the state from getstate()."""
+        stream = cls(0)
+        stream.setstate(state)
+        return stream
@@ -30,12 +30,47 @@ Simulatine, 31 May, 2020 - Updates:
                          - Added an icon image for the window title bar.
 Simulatine, 01 Jun, 2020 - Separated Grid class and generic variables into a
                            module sim.py for reuse with other simulations.
-
+Simulatine, 18 Oct, 2026 - Moved the simulation state and update rules into
+                           models.py. Grid is now a view of a models.Model,
+                           so simulations can also be run without a display.
+                         - Grid records the screen areas it draws to, and
+                           refresh_display() updates only those areas.
+                         - Added game_loop(), shared by all the simulations.
+                         - Cells are drawn by a pluggable renderer (see
+                           renderers.py), using the colors in Grid.palette.
+                         - Added a Turbo mode, which runs many generations
+                           per frame, and a steps per second dashboard item.
+                         - Dashboard text is drawn from cached glyphs, and
+                           each dashboard field is only redrawn when its value
+                           changes, at most dashboard_rate times a second.
+                         - Added per-phase frame timings, written to the log
+                           and shown on the dashboard with the I key.
+                         - The cell size, model grid size and window size
+                           are now independent. The grid shows a viewport of
+                           the model, which can be panned with the arrow keys
+                           and zoomed with the + and - keys.
+                         - Unbounded models can be panned in any direction.
+                         - The model can be checkpointed to a file every
+                           checkpoint_interval seconds and when the game
+                           ends, and resumed with resume_model().
+                         - Runs can be recorded to a replay file with the R
+                           key (see replay.py), and simulations can handle
+                           their own actions with handle_action().
+                         - The game loop sleeps while the game is paused or
+                           finished, and shows the generation at which a
+                           model froze.
+                         - resume_model() starts a new game, rather than
+                           resuming one which had already finished.
+                         - The frame timings are drawn under the other
+                           dashboard fields, clear of the buttons, with a
+                           row for each phase.
 """
+import bisect
 import datetime
 import logging
 import os
 import sys
+import time
 
 # Import Pygame, either standard version or SDL2 version depending on the
 # platform.
@@ -48,6 +83,13 @@ except ModuleNotFoundError:
     PYGAME_SDL2 = False
 import pygame
 
+import checkpoint
+import models
+import renderers
+import replay
+import textcache
+import timing
+
 # Define some colors to use in the game
 WHITE = pygame.Color(255, 255, 255)
 BLACK = pygame.Color(0, 0, 0)
@@ -70,6 +112,11 @@ LEFT = "Left"
 RIGHT = "Right"
 QUIT = "Quit"
 PAUSE = "Pause"
+TURBO = "Turbo"
+TIMINGS = "Timings"
+RECORD = "Record"
+ZOOM_IN = "Zoom In"
+ZOOM_OUT = "Zoom Out"
 
 # Cardinal directions in clockwise order
 DIRECTIONS = [RIGHT, DOWN, LEFT, UP]
@@ -78,20 +125,74 @@ DIRECTIONS = [RIGHT, DOWN, LEFT, UP]
 LANDSCAPE = "Landscape"
 PORTRAIT = "Portrait"
 
+# Available cell sizes in pixels, from the most zoomed out to the most zoomed
+# in. Sizes below 1 show several cells per pixel.
+ZOOM_LEVELS = [0.125, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 45, 64]
+# Grid lines are only drawn between cells of at least this size
+MIN_GRID_LINES_CELL_SIZE = 4
+
+# Seconds between checkpoints of a running simulation
+CHECKPOINT_INTERVAL = 300
+# Viewport movement (x and y values) for each pan action
+PAN_ACTIONS = {LEFT: (-1, 0), RIGHT: (1, 0), UP: (0, -1), DOWN: (0, 1)}
+
 
 class Grid:
-    """Create and update the grid simulation."""
+    """
+    Create and update the grid simulation.
+
+    The grid is a Pygame view of a models.Model, which holds the cells and
+    steps the simulation. Pass an existing model to attach the view to it,
+    otherwise a new model of grid_size (cols, rows) is created by
+    create_model(). By default the model fills the display at the starting
+    cell_size.
+
+    Only a viewport of the model is shown, cell_cols x cell_rows cells in size
+    with its top left cell at view_x, view_y. It can be panned with pan() and
+    zoomed with zoom(), and only the visible cells are drawn. If the model's
+    cell store is unbounded, the viewport can move beyond grid_size.
+
+    Cells are drawn by the named renderer (see renderers.py), in the palette
+    color for their value. By default the fastest available renderer is used.
+
+    If checkpoint_path is given, the model is saved there in the background
+    every checkpoint_interval seconds while it runs (see checkpoint.py).
+    """
 
     # Stop pylint complaining about the number of attributes:
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, display_surface, title):
+    # Cell colors, indexed by cell value
+    palette = [BGCOLOR, WHITE]
+
+    def __init__(
+        self,
+        display_surface,
+        title,
+        model=None,
+        renderer=renderers.AUTO,
+        cell_size=45,
+        grid_size=None,
+        checkpoint_path=None,
+    ):
         """Initialise the grid."""
+        # pylint: disable=too-many-arguments
         # Main display surface
         self.win = display_surface
+        self.title = title
 
-        # Grid position on screen
+        # Grid position on screen, and the largest area it may fill
         self.grid = None
+        self.grid_area = None
+        # Size of each cell on screen in pixels
+        self.cell_size = cell_size
+        # Model position of the top left cell in the viewport
+        self.view_x = 0
+        self.view_y = 0
+        # Set to redraw every visible cell on the next update_grid()
+        self.full_redraw = True
+        # Set to False if the viewport can move beyond grid_size
+        self.bounded = True
 
         # Dashboard position on screen
         self.dashboard = None
@@ -100,17 +201,66 @@ class Grid:
         self.dash_offset_x = 0
         self.dash_offset_y = 0
 
-        self.generation = 1
-        self.population = 0
         self.paused = False
+        # Frame rate while paused or finished, so that the game loop does not
+        # keep the CPU busy while nothing changes
+        self.idle_fps = 10
+        # Set once the end of the simulation has been logged
+        self.finish_logged = False
+
+        # In Turbo mode, each frame runs steps_per_frame generations, or if
+        # that is None, as many generations as fit in frame_budget seconds.
+        self.turbo = False
+        self.steps_per_frame = None
+        self.frame_budget = 1 / 30
+        # Positions of the cells updated during the last frame
+        self.updated_cells = []
+        # Generations run and time taken since steps_per_second was last
+        # calculated
+        self.steps_per_second = 0
+        self.step_count = 0
+        self.step_time = time.perf_counter()
+
+        # The dashboard fields are refreshed at most dashboard_rate times per
+        # second. dashboard_fields holds the text and screen area of each
+        # field, so that it is only redrawn when its text changes.
+        self.dashboard_rate = 10
+        self.dashboard_time = 0
+        self.dashboard_msg = None
+        self.dashboard_fields = {}
+
+        # Per-phase frame timings, shown on the dashboard if show_timings is
+        # True.
+        self.profiler = timing.FrameProfiler()
+        self.show_timings = False
+
+        # Screen areas drawn to since the last display refresh. If more than
+        # full_update_fraction of the display has changed, the whole display
+        # is refreshed instead.
+        self.dirty_rects = []
+        self.full_update_fraction = 0.5
+
+        # Checkpoint file, the time of the last checkpoint, and the writer
+        # which saves checkpoints in the background
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = CHECKPOINT_INTERVAL
+        self.checkpoint_time = time.perf_counter()
+        self.checkpoint_writer = None
+        # Set to a replay.Recorder while the run is being recorded
+        self.recorder = None
 
         self.buttons = {}
-        self.cells = []
-        self.set_display_parameters()
+        if model:
+            # Size the grid to fit the existing model
+            grid_size = (model.cell_cols, model.cell_rows)
+        self.set_display_parameters(grid_size)
+        self.model = model if model else self.create_model()
+        self.bounded = self.model.cells.bounded
         self.create_fonts()
         self.create_grid()
         self.create_dashboard(title)
-        self.create_cells()
+        self.updated_cells = self.model.updated_cells
+        self.renderer = renderers.create_renderer(self, renderer)
         self.create_buttons()
         self.create_keyboard_actions()
 
@@ -122,39 +272,128 @@ class Grid:
         self.font_size = 20
         self.font = pygame.font.SysFont("Courier", 20)
         self.bold_font = pygame.font.SysFont("Courier", 20, bold=True)
+        # Cached glyphs for drawing dashboard fields
+        self.text_cache = textcache.TextCache(self.font, TEXTCOLOR, BGCOLOR)
+        self.bold_text_cache = textcache.TextCache(
+            self.bold_font, TEXTCOLOR, BGCOLOR
+        )
 
-    def set_display_parameters(self):
-        """Set the overall display parameters based on the display size."""
+    def set_display_parameters(self, grid_size=None):
+        """
+        Set the overall display parameters based on the display size.
+
+        The grid area is sized to hold as many cells as fit at the starting
+        cell size. By default the model grid is the same size. Pass grid_size
+        (cols, rows) to use a different model grid size.
+        """
         # Check the actual display size
         # On a desktop running standard Pygame, the width and height used in
         # start_pygame() function will be used. On an Android device running
         # Pydroid3 and pygame_sdl2, the requested values are ignored and the
         # full device screen size is used instead, so we need to recheck
         # the actual display size here.
-        self.display_width = pygame.display.Info().current_w
-        self.display_height = pygame.display.Info().current_h
+        self.display_width, self.display_height = self.win.get_size()
 
         self.margin_x = 10
         self.margin_y = 10
-        self.cell_size = 45
         if self.display_width >= self.display_height:
             self.layout = LANDSCAPE
             # Make the main grid 70% of the window width
-            self.cell_cols = int((self.display_width * 0.7) / self.cell_size)
+            cols = int((self.display_width * 0.7) / self.cell_size)
             # Make the main grid fill the entire window height, allowing for
             # top and bottom margins
-            self.cell_rows = int(
+            rows = int(
                 (self.display_height - self.margin_y * 2) / self.cell_size
             )
         elif self.display_height > self.display_width:
             self.layout = PORTRAIT
             # Make the main grid fill the entire window width, allowing for
             # left and right margins
-            self.cell_cols = int(
+            cols = int(
                 (self.display_width - self.margin_x * 2) / self.cell_size
             )
             # Make the main grid 80% of the window height
-            self.cell_rows = int((self.display_height * 0.8) / self.cell_size)
+            rows = int((self.display_height * 0.8) / self.cell_size)
+
+        self.grid_area = pygame.Rect(
+            self.margin_x,
+            self.margin_y,
+            int(cols * self.cell_size),
+            int(rows * self.cell_size),
+        )
+        self.grid_size = grid_size if grid_size else (cols, rows)
+        self.set_viewport()
+
+    def set_viewport(self):
+        """Fit the viewport to the grid area, at the current cell size."""
+        self.cell_cols = int(self.grid_area.width / self.cell_size)
+        self.cell_rows = int(self.grid_area.height / self.cell_size)
+        if self.bounded:
+            # Keep the viewport within the model grid
+            cols, rows = self.grid_size
+            self.cell_cols = min(cols, self.cell_cols)
+            self.cell_rows = min(rows, self.cell_rows)
+            self.view_x = max(0, min(self.view_x, cols - self.cell_cols))
+            self.view_y = max(0, min(self.view_y, rows - self.cell_rows))
+
+        self.grid = pygame.Rect(
+            self.grid_area.left,
+            self.grid_area.top,
+            int(self.cell_cols * self.cell_size),
+            int(self.cell_rows * self.cell_size),
+        )
+        self.grid_lines = self.cell_size >= MIN_GRID_LINES_CELL_SIZE
+
+    def is_visible(self, x, y):
+        """Return True if the model cell at x, y is in the viewport."""
+        return (
+            self.view_x <= x < self.view_x + self.cell_cols
+            and self.view_y <= y < self.view_y + self.cell_rows
+        )
+
+    def pan(self, dx, dy):
+        """Move the viewport by a quarter of its size in direction dx, dy."""
+        old_view = (self.view_x, self.view_y)
+        self.view_x += dx * max(1, self.cell_cols // 4)
+        self.view_y += dy * max(1, self.cell_rows // 4)
+        self.set_viewport()
+        if (self.view_x, self.view_y) != old_view:
+            self.full_redraw = True
+            self.update_grid()
+
+    def centre_on(self, x, y):
+        """Move the viewport to put the model cell at x, y in the centre."""
+        self.view_x = x - self.cell_cols // 2
+        self.view_y = y - self.cell_rows // 2
+        self.set_viewport()
+        self.full_redraw = True
+
+    def zoom(self, steps):
+        """
+        Zoom the viewport in (steps > 0) or out (steps < 0).
+
+        Each step moves to the next size in ZOOM_LEVELS, keeping the cell at
+        the centre of the viewport in place. Cell sizes below one pixel need
+        a renderer which can scale the whole grid.
+        """
+        levels = ZOOM_LEVELS
+        if self.renderer.name == renderers.RECT:
+            levels = [size for size in ZOOM_LEVELS if size >= 1]
+        index = bisect.bisect_left(levels, self.cell_size) + steps
+        cell_size = levels[max(0, min(len(levels) - 1, index))]
+        if cell_size == self.cell_size:
+            return
+
+        centre_x = self.view_x + self.cell_cols / 2
+        centre_y = self.view_y + self.cell_rows / 2
+        self.cell_size = cell_size
+        self.set_viewport()
+        self.view_x = int(centre_x - self.cell_cols / 2)
+        self.view_y = int(centre_y - self.cell_rows / 2)
+        self.create_grid()
+        # The renderer's surfaces depend on the viewport size, so recreate it.
+        self.renderer = renderers.create_renderer(self, self.renderer.name)
+        self.update_grid()
 
     def create_buttons(self):
         """
@@ -163,7 +402,7 @@ class Grid:
         On screen buttons are required on tablet devices as keyboard control
         is not available.
 
-        This function defines a Quit and Pause buttons. Child classes may
+        This function defines Quit, Pause and Turbo buttons. Child classes may
         want to add additional buttons.
         """
         # This size is sufficient for buttons up to 4-5 characters.
@@ -200,6 +439,12 @@ class Grid:
             PAUSE, TEXTCOLOR, DARKGRAY, pos, size
         )
 
+        # Create a Turbo button
+        pos = (x + dx * 2, y + dy * 2)
+        self.buttons[TURBO] = self.create_button(
+            TURBO, TEXTCOLOR, DARKGRAY, pos, size
+        )
+
     def create_button(self, text, color, bgcolor, pos, size):
         """Create Surface and Rect objects for an on screen button."""
         width, height = size[0], size[1]
@@ -227,33 +472,31 @@ class Grid:
         button_surface.blit(text_surface, (text_x, text_y))
         return (button_surface, button_rect)
 
-    def create_cells(self):
-        """Create the initial game grid."""
-        # Stop pylint complaining about unused x and y variables:
-        # pylint: disable=unused-variable
+    def create_model(self):
+        """
+        Create the simulation model to fit the grid.
 
-        for x in range(self.cell_cols):
-            column = []
-            for y in range(self.cell_rows):
-                column.append(False)
-            self.cells.append(column)
+        This is the default class method and creates a generic model, which
+        does nothing. Child classes should create their own model.
+        """
+        return models.Model(*self.grid_size)
 
     def create_dashboard(self, title):
         """Create a dashboard to the side of, or below, the main grid."""
         if self.layout == LANDSCAPE:
             # Place the dashboard to the right of the main grid
-            left = self.grid.right + self.margin_x
+            left = self.grid_area.right + self.margin_x
             width = self.display_width - self.margin_x - left
             top = self.margin_y
-            height = self.grid.bottom - self.margin_y
+            height = self.grid_area.bottom - self.margin_y
             # Offset for each subsequent dashboard item
             self.dash_offset_x = 0
             self.dash_offset_y = 20
         else:
             # Place the dashboard below the main grid
             left = self.margin_x
-            width = self.grid.right - self.margin_x
-            top = self.grid.bottom + self.margin_y
+            width = self.grid_area.right - self.margin_x
+            top = self.grid_area.bottom + self.margin_y
             height = self.display_height - self.margin_y - top
             self.dash_offset_x = 0
             self.dash_offset_y = 20
@@ -274,24 +517,33 @@ class Grid:
 
     def create_grid(self):
         """Draw the main grid."""
-        left = self.margin_x
-        width = self.cell_cols * self.cell_size
-        top = self.margin_y
-        height = self.cell_rows * self.cell_size
-
-        self.grid = pygame.Rect(left, top, width, height)
+        self.set_viewport()
+        # Clear the grid area, including the border, then draw the grid.
+        area = self.grid_area.inflate(4, 4)
+        self.win.fill(BGCOLOR, area)
+        self.draw_grid_lines(self.win, self.grid.left, self.grid.top)
+        self.dirty_rects.append(area)
+        self.full_redraw = True
+
+    def draw_grid_lines(self, surface, left, top):
+        """Draw the grid border and lines, with the top left at left, top."""
+        width = self.grid.width
+        height = self.grid.height
 
         # Draw a border around the entire grid
         pygame.draw.rect(
-            self.win, BLUE, (left - 1, top - 1, width + 1, height + 1), 2,
+            surface, BLUE, (left - 1, top - 1, width + 1, height + 1), 2,
         )
+        if not self.grid_lines:
+            # The cells are too small to show lines between them.
+            return
 
         # Draw vertical lines
-        for x in range(left, left + width, self.cell_size):
-            pygame.draw.line(self.win, LIGHTBLUE, (x, top), (x, top + height))
+        for x in range(left, left + width, int(self.cell_size)):
+            pygame.draw.line(surface, LIGHTBLUE, (x, top), (x, top + height))
         # Draw horizontal lines
-        for y in range(top, top + height, self.cell_size):
-            pygame.draw.line(self.win, LIGHTBLUE, (left, y), (left + width, y))
+        for y in range(top, top + height, int(self.cell_size)):
+            pygame.draw.line(surface, LIGHTBLUE, (left, y), (left + width, y))
 
     def create_keyboard_actions(self):
         """Create a dictionary of standard keyboard actions."""
@@ -309,6 +561,18 @@ class Grid:
             # Pause (Space or P key)
             pygame.K_SPACE: PAUSE,
             pygame.K_p: PAUSE,
+            # Turbo (T key)
+            pygame.K_t: TURBO,
+            # Show or hide frame timings (I key)
+            pygame.K_i: TIMINGS,
+            # Start or stop recording a replay (R key)
+            pygame.K_r: RECORD,
+            # Zoom in (+ key) and out (- key)
+            pygame.K_EQUALS: ZOOM_IN,
+            pygame.K_PLUS: ZOOM_IN,
+            pygame.K_KP_PLUS: ZOOM_IN,
+            pygame.K_MINUS: ZOOM_OUT,
+            pygame.K_KP_MINUS: ZOOM_OUT,
             # Quit (ESC or Q key)
             pygame.K_ESCAPE: QUIT,
             pygame.K_q: QUIT,
@@ -319,19 +583,239 @@ class Grid:
         for button in self.buttons:
             surface, rect = self.buttons[button][0], self.buttons[button][1]
             self.win.blit(surface, rect)
+            self.dirty_rects.append(rect)
+
+    def draw_cell(self, x, y, color):
+        """Fill the model cell at x, y with color, if it is visible."""
+        if not self.is_visible(x, y):
+            return
+        cell_rect = self.cell_rect(x, y)
+        pygame.draw.rect(self.win, color, cell_rect)
+        self.dirty_rects.append(cell_rect)
+
+    def cell_rect(self, x, y):
+        """Return the screen Rect of the visible model cell at x, y."""
+        x -= self.view_x
+        y -= self.view_y
+        cell_x = self.grid.left + int(x * self.cell_size)
+        cell_y = self.grid.top + int(y * self.cell_size)
+        right = self.grid.left + int((x + 1) * self.cell_size)
+        bottom = self.grid.top + int((y + 1) * self.cell_size)
+        width = max(1, right - cell_x)
+        height = max(1, bottom - cell_y)
+        if self.grid_lines:
+            # Make the cell rect one pixel smaller than the actual grid size in
+            # all directions, to prevent drawing over the grid lines.
+            return pygame.Rect(cell_x + 1, cell_y + 1, width - 1, height - 1)
+        return pygame.Rect(cell_x, cell_y, width, height)
+
+    def refresh_display(self, full=False):
+        """
+        Copy the areas drawn since the last refresh to the screen.
+
+        Updating only the changed areas is much faster than updating the whole
+        display when just a few cells have changed. Fall back to a full update
+        when requested, or when a large share of the display has changed.
+        """
+        if full:
+            self.renderer.present()
+        elif self.dirty_rects:
+            changed_area = sum(rect.w * rect.h for rect in self.dirty_rects)
+            if changed_area > self.full_update_fraction * (
+                self.display_width * self.display_height
+            ):
+                self.renderer.present()
+            else:
+                self.renderer.present(self.dirty_rects)
+        self.dirty_rects = []
 
     def update(self):
         """Update the simulation and update the grid and dashboard."""
-        if not self.paused:
-            self.update_simulation()
-            self.update_grid()
-            self.update_dashboard()
-            self.generation += 1
+        if self.paused:
+            # The simulation is paused. Display an appropriate message.
+            self.refresh_dashboard("Paused")
+            self.clock.tick(self.idle_fps)
+        elif self.model.finished:
+            # The simulation can make no further progress. Display an
+            # appropriate message.
+            frozen = self.model.frozen_generation
+            if not self.finish_logged:
+                self.finish_logged = True
+                if frozen is None:
+                    logging.info(
+                        "Completed at generation %s", self.model.generation
+                    )
+                else:
+                    logging.info("Frozen at generation %s", frozen)
+            if frozen is None:
+                self.refresh_dashboard("Completed")
+            else:
+                self.refresh_dashboard("Frozen at {}".format(frozen))
+            self.clock.tick(self.idle_fps)
+        else:
+            # The simulation is proceeding normally.
+            with self.profiler.phase(timing.STEP):
+                self.advance()
+            with self.profiler.phase(timing.GRID):
+                self.update_grid()
+            with self.profiler.phase(timing.DASHBOARD):
+                self.refresh_dashboard()
             # Update the Pygame clock once per game loop.
             self.clock.tick()
+
+    def refresh_dashboard(self, msg=None):
+        """
+        Update the dashboard, if it is due to be refreshed.
+
+        The dashboard is updated at most dashboard_rate times per second, or
+        straight away if the status message has changed.
+        """
+        now = time.perf_counter()
+        if (
+            msg != self.dashboard_msg
+            or now - self.dashboard_time >= 1 / self.dashboard_rate
+        ):
+            self.dashboard_msg = msg
+            self.dashboard_time = now
+            self.update_dashboard(msg)
+            self.update_timings()
+
+    def update_timings(self):
+        """
+        Display the frame timings on the dashboard, if requested.
+
+        The timings are drawn under the other dashboard fields: a heading
+        row, then a row for each phase, which is blank until the phase has
+        been timed. Rows which would run into a button, or off the bottom of
+        the dashboard, are left out, and each row is cut to fit the width of
+        the dashboard.
+        """
+        left = self.dashboard.left + 10
+        width = self.dashboard.right - 5 - left
+        top = self.dashboard.top + 40
+        for name, (_, rect) in self.dashboard_fields.items():
+            if not name.startswith("Timing ") and rect:
+                top = max(top, rect.top + self.dash_offset_y)
+        names = ["Timings"] + self.profiler.phases
+        # Draw each row, clearing any rows no longer shown.
+        for row, name in enumerate(names):
+            text = ""
+            if self.show_timings:
+                if row:
+                    text = self.profiler.summary_line(name) or ""
+                else:
+                    text = self.profiler.header()
+            y = top + self.dash_offset_y * row
+            area = pygame.Rect(left, y, width, self.text_cache.height)
+            if area.bottom > self.dashboard.bottom or any(
+                area.colliderect(button[1])
+                for button in self.buttons.values()
+            ):
+                text = ""
+            while self.text_cache.size(text)[0] > width:
+                text = text[:-1]
+            self.draw_field(
+                "Timing " + name,
+                text,
+                left + self.dash_offset_x * row,
+                y,
+            )
+
+    def advance(self):
+        """
+        Advance the simulation by one frame.
+
+        Normally this runs a single generation. In Turbo mode, it runs
+        steps_per_frame generations, or as many as fit in frame_budget
+        seconds, and merges the updated cells of every generation so that
+        they are drawn just once.
+        """
+        model = self.model
+        recorder = self.recorder
+        if not self.turbo:
+            model.update_simulation()
+            if recorder:
+                recorder.record()
+            self.updated_cells = model.updated_cells
+            steps = 1
         else:
-            # The simulation is paused. Display an appropriate message.
-            self.update_dashboard("Paused")
+            updated_cells = set()
+            steps = 0
+            deadline = time.perf_counter() + self.frame_budget
+            while not model.finished:
+                model.update_simulation()
+                if recorder:
+                    recorder.record()
+                steps += 1
+                for x, y in model.updated_cells:
+                    updated_cells.add((x, y))
+                if self.steps_per_frame:
+                    if steps >= self.steps_per_frame:
+                        break
+                elif time.perf_counter() >= deadline:
+                    break
+            self.updated_cells = list(updated_cells)
+
+        # Recalculate the number of generations per second twice a second
+        self.step_count += steps
+        now = time.perf_counter()
+        if now - self.step_time >= 0.5:
+            self.steps_per_second = self.step_count / (now - self.step_time)
+            self.step_count = 0
+            self.step_time = now
+
+    def handle_action(self, action):
+        """
+        Handle a user action not handled by game_loop().
+
+        This is the default class method, and does nothing. Child classes
+        can add their own actions to keyboard_actions and handle them here.
+        """
+
+    def toggle_recording(self):
+        """Start recording the run to a replay file, or stop recording."""
+        if self.recorder:
+            self.recorder.close()
+            logging.info("Stopped recording to %s", self.recorder.path)
+            self.recorder = None
+        else:
+            self.recorder = replay.Recorder(
+                self.model, replay_file(self.title)
+            )
+            logging.info("Recording to %s", self.recorder.path)
+
+    def autosave(self):
+        """Save a checkpoint, if one is due."""
+        if (
+            self.checkpoint_path
+            and time.perf_counter() - self.checkpoint_time
+            >= self.checkpoint_interval
+        ):
+            self.save_checkpoint()
+
+    def save_checkpoint(self, wait=False):
+        """
+        Save a checkpoint of the model to checkpoint_path, if it is set.
+
+        The checkpoint is written in the background, so the simulation keeps
+        running. If wait is True, returns once it has been written.
+        """
+        if not self.checkpoint_path:
+            return
+        if not self.checkpoint_writer:
+            self.checkpoint_writer = checkpoint.CheckpointWriter()
+        self.checkpoint_time = time.perf_counter()
+        self.checkpoint_writer.submit(self.model, self.checkpoint_path)
+        logging.info(
+            "Checkpoint of generation %s saved to %s",
+            self.model.generation,
+            self.checkpoint_path,
+        )
+        if wait:
+            try:
+                self.checkpoint_writer.flush()
+            except OSError as error:
+                logging.error("Checkpoint failed: %s", error)
 
     def draw_text(self, text, color, bgcolor, top, left, bold=False):
         """Create Surface and Rect objects for on screen text."""
@@ -342,36 +826,38 @@ class Grid:
         text_rect = text_surface.get_rect()
         text_rect.topleft = (top, left)
         self.win.blit(text_surface, (top, left))
+        self.dirty_rects.append(text_rect)
 
-    def update_simulation(self):
-        """Update the simulation by one generation.
+    def draw_field(self, name, text, left, top, bold=False):
+        """
+        Draw the text of a named dashboard field, if it has changed.
 
-        This is the default class method and just refreshes the generation
-        count. A more detailed update method should be created in each child
-        function.
+        The text is drawn from cached glyphs, after clearing the area used by
+        the previous text of the field.
         """
-        self.generation += 1
+        old_text, old_rect = self.dashboard_fields.get(name, (None, None))
+        if text == old_text:
+            return
+        if old_rect:
+            self.win.fill(BGCOLOR, old_rect)
+            self.dirty_rects.append(old_rect)
+        cache = self.bold_text_cache if bold else self.text_cache
+        rect = cache.draw(self.win, text, (left, top))
+        self.dirty_rects.append(rect)
+        self.dashboard_fields[name] = (text, rect)
 
     def update_grid(self):
-        """Draw the current state of the main grid."""
-        for x in range(self.cell_cols):
-            for y in range(self.cell_rows):
-                # Make the cell_rect one pixel smaller than the actual grid
-                # size in all directions, to prevent drawing over the grid
-                # lines.
-                cell_x = self.margin_x + x * self.cell_size + 1
-                cell_y = self.margin_y + y * self.cell_size + 1
-                cell_rect = pygame.Rect(
-                    cell_x, cell_y, self.cell_size - 1, self.cell_size - 1
-                )
-                if self.cells[x][y]:
-                    # Cell is On (True).
-                    # Fill the cell.
-                    pygame.draw.rect(self.win, WHITE, cell_rect)
-                else:
-                    # Cell is Off (False).
-                    # Leave the cell unfilled.
-                    pygame.draw.rect(self.win, BGCOLOR, cell_rect)
+        """
+        Draw the current state of the main grid.
+
+        Only the cells updated during the last frame are drawn, unless a full
+        redraw is due, for example after the viewport has moved.
+        """
+        if self.full_redraw:
+            self.renderer.draw_all()
+            self.full_redraw = False
+        else:
+            self.renderer.draw_cells(self.updated_cells)
 
     def update_dashboard(self, msg=None):
         """Update the dashboard display.
@@ -384,56 +870,144 @@ class Grid:
         x = 10
         y = 40
 
-        if msg:
-            # Display any status message
-            self.draw_text(
-                msg,
-                TEXTCOLOR,
-                BGCOLOR,
-                self.dashboard.left + x,
-                self.dashboard.top + y,
-                bold=True,
-            )
-        else:
-            # Clear the status message area
-            self.draw_text(
-                "        ",
-                TEXTCOLOR,
-                BGCOLOR,
-                self.dashboard.left + x,
-                self.dashboard.top + y,
-                bold=True,
-            )
-
+        # Display any status message, or clear the status message area
+        self.draw_field(
+            "Status",
+            msg if msg else "",
+            self.dashboard.left + x,
+            self.dashboard.top + y,
+            bold=True,
+        )
         # Display the current generation number
-        self.draw_text(
-            "Gen: {:>7}".format(self.generation),
-            TEXTCOLOR,
-            BGCOLOR,
+        self.draw_field(
+            "Gen",
+            "Gen: {:>7}".format(self.model.generation),
             self.dashboard.left + x + self.dash_offset_x,
             self.dashboard.top + y + self.dash_offset_y,
         )
         # Display the current population
-        self.draw_text(
-            "Pop: {:>7}".format(self.population),
-            TEXTCOLOR,
-            BGCOLOR,
+        self.draw_field(
+            "Pop",
+            "Pop: {:>7}".format(self.model.population),
             self.dashboard.left + x + self.dash_offset_x * 2,
             self.dashboard.top + y + self.dash_offset_y * 2,
         )
-        # Display the current simulation update rate in frames per second
-        self.draw_text(
-            "FPS: {:>7}".format(int(self.clock.get_fps())),
-            TEXTCOLOR,
-            BGCOLOR,
+        # Display the current simulation update rate in frames per second.
+        # The clock only has millisecond resolution, so get_fps() returns
+        # infinity for very fast frames: cap it to fit the display.
+        self.draw_field(
+            "FPS",
+            "FPS: {:>7}".format(int(min(self.clock.get_fps(), 9999999))),
             self.dashboard.left + x + self.dash_offset_x * 3,
             self.dashboard.top + y + self.dash_offset_y * 3,
         )
+        # Display the achieved simulation rate in generations per second
+        self.draw_field(
+            "SPS",
+            "SPS: {:>7}".format(int(self.steps_per_second)),
+            self.dashboard.left + x + self.dash_offset_x * 4,
+            self.dashboard.top + y + self.dash_offset_y * 4,
+        )
         # Set the position on the dashboard for any subsequent messages.
         # This can be used by any further dashboard updates in a
         # child class.
-        self.dash_pos_x = x + self.dash_offset_x * 4
-        self.dash_pos_y = y + self.dash_offset_y * 4
+        self.dash_pos_x = x + self.dash_offset_x * 5
+        self.dash_pos_y = y + self.dash_offset_y * 5
+
+
+def game_loop(simulation):
+    """
+    Execute the main game loop for a simulation.
+
+    Handles the standard Quit, Pause, Turbo, Timings, Record, pan and zoom
+    actions, and passes any other action to the simulation's handle_action().
+    Updates only the changed areas of the display on each pass. Each phase of
+    the frame is timed by the simulation's profiler.
+    """
+    simulation.draw_buttons()
+    simulation.update_grid()
+    simulation.refresh_display(full=True)
+    while True:
+        # Handle events
+        with simulation.profiler.phase(timing.EVENTS):
+            action = check_user_input(
+                simulation.buttons, simulation.keyboard_actions
+            )
+        if action:
+            # Process the requested action
+            if action == QUIT:
+                # Save the simulation, and end it
+                simulation.save_checkpoint(wait=True)
+                if simulation.recorder:
+                    simulation.toggle_recording()
+                end_pygame()
+            elif action == PAUSE:
+                # Toggled the paused state
+                simulation.paused = not simulation.paused
+            elif action == TURBO:
+                # Toggle Turbo mode
+                simulation.turbo = not simulation.turbo
+            elif action == TIMINGS:
+                # Show or hide the frame timings
+                simulation.show_timings = not simulation.show_timings
+            elif action == RECORD:
+                simulation.toggle_recording()
+            elif action in PAN_ACTIONS:
+                # Move the viewport
+                simulation.pan(*PAN_ACTIONS[action])
+            elif action == ZOOM_IN:
+                simulation.zoom(1)
+            elif action == ZOOM_OUT:
+                simulation.zoom(-1)
+            else:
+                # Any other action is specific to the simulation.
+                simulation.handle_action(action)
+
+        # Update the game position
+        simulation.update()
+        simulation.autosave()
+        # Update the changed areas of the display
+        with simulation.profiler.phase(timing.DISPLAY):
+            simulation.refresh_display()
+        simulation.profiler.end_frame()
+
+
+def checkpoint_file(title):
+    """Return the name of the checkpoint file for a game title."""
+    return os.path.expanduser(title + "_checkpoint.sim")
+
+
+def replay_file(title):
+    """Return the name of the replay file for a game title."""
+    return os.path.expanduser(title + "_replay.simrec")
+
+
+def resume_model(path):
+    """
+    Load the model saved in a checkpoint file.
+
+    Returns None if the file does not exist or cannot be read, or if the
+    saved model had already finished, so a new model should be created.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        model = checkpoint.load(path)
+    except (OSError, ValueError) as error:
+        logging.error("Could not resume from %s: %s", path, error)
+        return None
+    if model.finished:
+        logging.info(
+            "The game in %s had finished at generation %s, so starting a "
+            "new game",
+            path,
+            model.generation,
+        )
+        return None
+    logging.info(
+        "Resumed from %s at generation %s", path, model.generation
+    )
+    return model
 
 
 def check_user_input(buttons, keyboard_actions):
@@ -478,8 +1052,14 @@ def check_keyboard_press(key, keyboard_actions):
     return action
 
 
-def start_pygame(width, height, title):
-    """Start Pygame and create the Pygame window."""
+def start_pygame(width, height, title, offscreen=False):
+    """
+    Start Pygame and create the Pygame window.
+
+    If offscreen is True, no Pygame display window is opened, and an
+    off-screen surface of the requested size is returned instead. This can be
+    used with the texture renderer, which opens its own window.
+    """
     # Initialise the Pygame display window
     pygame.init()
 
@@ -490,6 +1070,9 @@ def start_pygame(width, height, title):
     icon = pygame.image.load("langton_icon.png")
     pygame.display.set_icon(icon)
 
+    if offscreen:
+        return pygame.Surface((width, height))
+
     # Create the Pygame window with the requested width and height.
     # Note that on Android devices running Pydroid3 and pygame_sdl2, the
     # requested values are ignored and the full device screen size is used.
@@ -547,7 +1130,7 @@ def main():
     # Note that the default Grid class does nothing.
     simulation = Grid(display_surface, title)
     simulation.draw_buttons()
-    pygame.display.update()
+    simulation.refresh_display(full=True)
 
     # Wait for one second
     pygame.time.wait(1000)
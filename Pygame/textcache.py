@@ -0,0 +1,73 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Cached text rendering for Pygame dashboards.
+
+Rendering text with a Pygame font is slow compared to blitting a surface, and
+dashboards redraw the same few characters (digits and short labels) over and
+over. TextCache renders each character once, then draws any text by blitting
+the cached character surfaces.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+"""
+import string
+
+# Import Pygame, either standard version or SDL2 version depending on the
+# platform.
+try:
+    import pygame_sdl2  # pylint: disable=import-error
+
+    pygame_sdl2.import_as_pygame()
+    PYGAME_SDL2 = True
+except ModuleNotFoundError:
+    PYGAME_SDL2 = False
+import pygame
+
+# Characters rendered up front, when the cache is created. Any other
+# characters are rendered and cached the first time they are drawn.
+PRELOAD = string.digits + string.ascii_letters + " :.-%/"
+
+
+class TextCache:
+    """Pre-rendered character surfaces for one font, color and background."""
+
+    def __init__(self, font, color, bgcolor):
+        """Create the cache, and render the common characters."""
+        self.font = font
+        self.color = color
+        self.bgcolor = bgcolor
+        self.height = font.get_linesize()
+        self.glyphs = {}
+        for char in PRELOAD:
+            self.glyph(char)
+
+    def glyph(self, char):
+        """Return the surface for a single character, rendering it if needed."""
+        try:
+            return self.glyphs[char]
+        except KeyError:
+            surface = self.font.render(char, True, self.color, self.bgcolor)
+            self.glyphs[char] = surface
+            return surface
+
+    def size(self, text):
+        """Return the (width, height) of text drawn from the cache."""
+        return (
+            sum(self.glyph(char).get_width() for char in text),
+            self.height,
+        )
+
+    def draw(self, surface, text, pos):
+        """
+        Draw text onto surface with its top left corner at pos.
+
+        Returns the Rect of the area drawn.
+        """
+        x, y = pos
+        blits = []
+        for char in text:
+            glyph = self.glyph(char)
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(pos[0], pos[1], x - pos[0], self.height)
@@ -0,0 +1,108 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Frame timing instrumentation.
+
+FrameProfiler times each phase of a game loop frame, and keeps a rolling
+window of the durations of each phase so that percentiles (p50, p95, p99) can
+be shown on the dashboard and written to the log:
+
+with profiler.phase(timing.STEP):
+    ...
+profiler.end_frame()
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - summary_line() returns the report line of one
+                           phase.
+"""
+import collections
+import contextlib
+import logging
+import time
+
+# Standard phases of a sim.game_loop() frame, in the order they run
+EVENTS = "Event"
+STEP = "Step"
+GRID = "Grid"
+DASHBOARD = "Dash"
+DISPLAY = "Disp"
+PHASES = [EVENTS, STEP, GRID, DASHBOARD, DISPLAY]
+
+# Percentiles reported for each phase
+PERCENTILES = [50, 95, 99]
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings."""
+
+    def __init__(self, phases=None, window=600, log_interval=10):
+        """
+        Initialise the profiler.
+
+        Keeps the last window durations of each phase, and writes a summary
+        to the log every log_interval seconds. Set log_interval to None to
+        disable logging.
+        """
+        self.phases = list(phases if phases else PHASES)
+        self.samples = {
+            name: collections.deque(maxlen=window) for name in self.phases
+        }
+        self.log_interval = log_interval
+        self.log_time = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one sample of the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+
+    def percentiles(self, name):
+        """
+        Return the PERCENTILES of a phase's durations, in milliseconds.
+
+        Uses the nearest-rank method. Returns None if there are no samples.
+        """
+        samples = sorted(self.samples[name])
+        if not samples:
+            return None
+        return [
+            samples[min(len(samples) - 1, len(samples) * pct // 100)] * 1000
+            for pct in PERCENTILES
+        ]
+
+    @staticmethod
+    def header():
+        """Return a heading line for the summary() report lines."""
+        return "{:<5}".format("ms") + "".join(
+            "{:>6}".format("p{}".format(pct)) for pct in PERCENTILES
+        )
+
+    def summary_line(self, name):
+        """Return the report line of a phase, or None if it has no samples."""
+        values = self.percentiles(name)
+        if not values:
+            return None
+        return "{:<5}".format(name) + "".join(
+            "{:>6.2f}".format(value) for value in values
+        )
+
+    def summary(self):
+        """Return a list of report lines, one per phase with samples."""
+        lines = [self.summary_line(name) for name in self.phases]
+        return [line for line in lines if line]
+
+    def end_frame(self):
+        """Mark the end of a frame, and write a log summary if one is due."""
+        if self.log_interval is None:
+            return
+        now = time.perf_counter()
+        if now - self.log_time >= self.log_interval:
+            self.log_time = now
+            logging.info(
+                "Frame timings in ms (%s): %s",
+                " ".join("p{}".format(pct) for pct in PERCENTILES),
+                "; ".join(self.summary()),
+            )
@@ -0,0 +1,144 @@
+#!python3
+# -*- coding: utf-8 -*-
+"""
+Turmite rules.
+
+A turmite is an ant with an internal state. On each step it moves forward one
+cell, then looks up its state and the color of the new cell in a table,
+which gives the color to write, how to turn, and its next state. Langton's
+Ant is the simplest turmite, with one state and two colors.
+
+Rules can be given as:
+
+- a rule string, with one turn letter per color, such as "RL" for Langton's
+  Ant or "LLRR". The ant has one state, and adds 1 to the color of each cell
+  it visits, wrapping round after the last color.
+- a state table, as a list with one entry per state, each a list with one
+  (color to write, turn, next state) entry per color. Turns are letters, or
+  the numbers used by Ed Pegg Jr.'s turmite tables (1 no turn, 2 right,
+  4 u-turn, 8 left). The table can also be given as a string in Ed Pegg Jr.'s
+  notation, such as "{{{1, 2, 0}, {0, 8, 0}}}" for Langton's Ant.
+
+Rule class - a rule, compiled into a transition table.
+
+Simulatine, 18 Oct, 2026 - Initial version.
+                         - A Rule can be created from another Rule.
+"""
+import ast
+
+# Turn letters, as a number of clockwise quarter turns. Directions are
+# numbered clockwise, in the order of models.DIRECTIONS, so turning adds
+# these values to the direction number.
+TURNS = {"N": 0, "R": 1, "U": 2, "L": 3}
+# Turn values in Ed Pegg Jr.'s turmite tables
+TABLE_TURNS = {1: 0, 2: 1, 4: 2, 8: 3}
+# Number of directions
+DIRECTION_COUNT = 4
+
+# Langton's Ant
+LANGTON = "RL"
+
+
+class Rule:
+    """
+    A turmite rule, compiled into a transition table.
+
+    transitions holds a (color, direction, state) tuple for every possible
+    (state, cell color, direction), at index key(state, color, direction),
+    so each step of the turmite needs a single list lookup however complex
+    the rule is.
+    """
+
+    def __init__(self, rule=LANGTON):
+        """
+        Compile a rule string or state table.
+
+        A Rule is copied, rather than compiled again.
+        """
+        if isinstance(rule, Rule):
+            vars(self).update(vars(rule))
+            self.transitions = list(rule.transitions)
+            return
+        self.rule = rule
+        if isinstance(rule, str) and rule.lstrip().startswith("{"):
+            # A table in Ed Pegg Jr.'s notation
+            try:
+                rule = ast.literal_eval(
+                    rule.replace("{", "[").replace("}", "]")
+                )
+            except (SyntaxError, ValueError):
+                raise ValueError("Invalid turmite table: " + rule) from None
+
+        # Set to True if each visit adds 1 to a cell's color
+        self.cycles = isinstance(rule, str)
+        if self.cycles:
+            table = [self.parse_rule_string(rule)]
+        else:
+            table = [list(state) for state in rule]
+        self.states = len(table)
+        self.colors = len(table[0]) if table else 0
+        if not self.states or not self.colors:
+            raise ValueError("Empty turmite rule")
+
+        self.transitions = [None] * (
+            self.states * self.colors * DIRECTION_COUNT
+        )
+        for state, entries in enumerate(table):
+            if len(entries) != self.colors:
+                raise ValueError(
+                    "Every state needs an entry for each of the {} "
+                    "colors".format(self.colors)
+                )
+            for color, entry in enumerate(entries):
+                new_color, turn, new_state = self.parse_entry(entry)
+                for direction in range(DIRECTION_COUNT):
+                    self.transitions[self.key(state, color, direction)] = (
+                        new_color,
+                        (direction + turn) % DIRECTION_COUNT,
+                        new_state,
+                    )
+
+    @staticmethod
+    def parse_rule_string(rule):
+        """Return the state table entries of a rule string."""
+        rule = rule.upper()
+        if not rule or set(rule) - set(TURNS):
+            raise ValueError(
+                "Rule strings can only contain the turns "
+                + ", ".join(TURNS)
+                + ", not "
+                + rule
+            )
+        return [
+            ((color + 1) % len(rule), letter, 0)
+            for color, letter in enumerate(rule)
+        ]
+
+    def parse_entry(self, entry):
+        """Return the (color, turn, state) of a state table entry."""
+        try:
+            new_color, turn, new_state = entry
+        except (TypeError, ValueError):
+            raise ValueError(
+                "Turmite table entries must be (color, turn, state), not "
+                + str(entry)
+            ) from None
+        if isinstance(turn, str):
+            turn = TURNS.get(turn.upper())
+        else:
+            turn = TABLE_TURNS.get(turn)
+        if (
+            turn is None
+            or not 0 <= new_color < self.colors
+            or not 0 <= new_state < self.states
+        ):
+            raise ValueError("Invalid turmite table entry: " + str(entry))
+        return new_color, turn, new_state
+
+    def key(self, state, color, direction):
+        """Return the index of a transition in the transitions table."""
+        return (state * self.colors + color) * DIRECTION_COUNT + direction
+
+    def __str__(self):
+        """Return the rule as it was given."""
+        return str(self.rule)